@@ -6,25 +6,47 @@ import sys
 # Agregar el directorio raíz al path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from backend.cache import init_cache
+from backend.compression import init_compression
 from backend.config import config
+from backend.database import init_database
+from backend.metrics import init_metrics
 from backend.models.category import db
 from backend.models.product import Product
+from backend.models.schema import upgrade_schema
+from backend.serialization import init_json
+from backend.slow_queries import init_slow_query_log
+from backend.write_queue import init_write_queue
+from backend.controllers.admin_controller import admin_bp
+from backend.controllers.autocomplete_controller import autocomplete_bp
 from backend.controllers.category_controller import category_bp
 from backend.controllers.product_controller import product_bp
+from backend.controllers.stats_controller import stats_bp
 
 
-def create_app(config_name='default'):
+def create_app(config_name='default', overrides=None):
     """Factory para crear la aplicación Flask"""
     app = Flask(__name__)
 
     app.config.from_object(config[config_name])
+    if overrides:
+        app.config.update(overrides)
 
+    init_json(app)
     CORS(app)
 
-    db.init_app(app)
+    init_database(app)
+    init_metrics(app)
+    init_slow_query_log(app)
+    init_cache(app)
+    init_compression(app)
+    init_write_queue(app)
 
     app.register_blueprint(category_bp)
     app.register_blueprint(product_bp)
+    app.register_blueprint(stats_bp)
+    app.register_blueprint(autocomplete_bp)
+    app.register_blueprint(admin_bp)
 
     @app.route('/')
     def index():
@@ -33,7 +55,10 @@ def create_app(config_name='default'):
             'version': '1.0',
             'endpoints': {
                 'categories': '/api/categories',
-                'products': '/api/products'
+                'products': '/api/products',
+                'stats': '/api/stats',
+                'autocomplete': '/api/autocomplete',
+                'metrics': '/metrics'
             }
         }
 
@@ -43,6 +68,9 @@ def create_app(config_name='default'):
 
     with app.app_context():
         db.create_all()
+        created_indexes = upgrade_schema(db.engine)
+        if created_indexes:
+            app.logger.info("Índices creados: %s", ', '.join(created_indexes))
 
     return app
 
@@ -50,4 +78,5 @@ def create_app(config_name='default'):
 if __name__ == '__main__':
     env = os.getenv('FLASK_ENV', 'development')
     app = create_app(env)
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    # Servidor de desarrollo; en producción usar run_project.py serve
+    app.run(host='0.0.0.0', port=5000, debug=app.debug)
\ No newline at end of file
@@ -0,0 +1,307 @@
+"""Aplicación ASGI: lecturas asíncronas y el resto de rutas vía WSGI
+
+Los listados, la búsqueda y la exportación se atienden con corrutinas sobre
+aiosqlite, de modo que los clientes lentos y las descargas largas no ocupan
+un hilo cada uno. Las demás rutas se delegan en la aplicación Flask, que se
+ejecuta en un pool de WEB_THREADS hilos por proceso.
+
+    uvicorn --factory backend.asgi:create_asgi_app
+"""
+import asyncio
+import inspect
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl
+
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgiInstance
+from flask import g
+from werkzeug.datastructures import MultiDict
+from werkzeug.http import parse_accept_header, parse_etags, quote_etag
+from werkzeug.utils import get_content_type
+
+from backend.app import create_app
+from backend.async_database import init_async_database
+from backend.compression import available_encodings, compression_levels
+from backend.controllers.conditional import etag_for, matching_etag
+from backend.metrics import server_timing, start_request_metrics, \
+    track_queries
+from backend.serialization import rows_to_dicts
+from backend.services.async_read_service import AsyncReadService
+from backend.services.category_service import CATEGORY_FIELDS
+from backend.services.fieldsets import resolve_fields
+from backend.services.product_service import PRODUCT_FIELDS
+from backend.slow_queries import watch_engine
+
+
+async def products_page(args, config):
+    """Página de productos (GET /api/products)"""
+    fields = resolve_fields(args.get('fields'), PRODUCT_FIELDS)
+    rows, next_cursor = await AsyncReadService.get_products_page(
+        limit=args.get('limit'),
+        after=args.get('after'),
+        category_id=args.get('category_id', type=int),
+        min_price=args.get('min_price'),
+        max_price=args.get('max_price'),
+        min_stock=args.get('min_stock'),
+        max_stock=args.get('max_stock'),
+        name=args.get('name'),
+        sort=args.get('sort'),
+        fields=fields
+    )
+    return {'items': rows_to_dicts(rows, fields), 'next_cursor': next_cursor}, \
+        'application/json', {}
+
+
+async def search_products(args, config):
+    """Búsqueda de productos (GET /api/products/search)"""
+    fields = resolve_fields(args.get('fields'), PRODUCT_FIELDS)
+    rows, next_cursor = await AsyncReadService.search_products(
+        query=args.get('q'),
+        limit=args.get('limit'),
+        after=args.get('after'),
+        fields=fields
+    )
+    # Sin fields, solo los campos públicos: la fila trae también rank
+    return {'items': rows_to_dicts(rows, fields or PRODUCT_FIELDS),
+            'next_cursor': next_cursor}, 'application/json', {}
+
+
+async def export_products(args, config):
+    """Exportación del catálogo (GET /api/products/export)"""
+    chunks, mimetype = AsyncReadService.export_products(
+        export_format=args.get('format'),
+        batch_size=config['EXPORT_BATCH_SIZE'],
+        category_id=args.get('category_id', type=int)
+    )
+    extension = 'csv' if mimetype == 'text/csv' else 'ndjson'
+    return chunks, mimetype, {
+        'Content-Disposition': f'attachment; filename=products.{extension}'
+    }
+
+
+async def categories_page(args, config):
+    """Página de categorías (GET /api/categories)"""
+    fields = resolve_fields(args.get('fields'), CATEGORY_FIELDS)
+    rows, next_cursor = await AsyncReadService.get_categories_page(
+        limit=args.get('limit'),
+        after=args.get('after'),
+        fields=fields
+    )
+    return {'items': rows_to_dicts(rows, fields), 'next_cursor': next_cursor}, \
+        'application/json', {}
+
+
+# Rutas GET atendidas de forma asíncrona: ruta -> (tablas del ETag, vista)
+ASYNC_ROUTES = {
+    '/api/products': (('products', 'categories'), products_page),
+    '/api/products/search': (('products', 'categories'), search_products),
+    '/api/products/export': (('products', 'categories'), export_products),
+    '/api/categories': (('categories',), categories_page),
+}
+
+
+class PooledWsgiInstance(WsgiToAsgiInstance):
+    """WsgiToAsgiInstance que ejecuta la aplicación WSGI en un pool propio
+
+    asgiref usa sync_to_async con thread_sensitive=False, que atiende todas
+    las peticiones de un proceso en un único hilo compartido.
+    """
+
+    # La función sin decorar de asgiref (recibe el cuerpo ya leído)
+    _run_wsgi_app = staticmethod(
+        inspect.unwrap(WsgiToAsgiInstance.run_wsgi_app))
+
+    def __init__(self, wsgi_application, executor):
+        super().__init__(wsgi_application)
+        self.executor = executor
+
+    async def run_wsgi_app(self, body):
+        await sync_to_async(self._run_wsgi_app, thread_sensitive=False,
+                            executor=self.executor)(self, body)
+
+
+class AsyncApp:
+    """Atiende ASYNC_ROUTES con corrutinas y delega el resto en Flask
+
+    Las respuestas son las mismas que las de los controladores: el mismo
+    JSON, ETag (intercambiable entre ambos modos), compresión y CORS.
+    """
+
+    def __init__(self, flask_app, threads=None):
+        self.flask_app = flask_app
+        self.executor = ThreadPoolExecutor(
+            max_workers=threads or flask_app.config['WEB_THREADS'],
+            thread_name_prefix='wsgi'
+        )
+        self.encodings = available_encodings()
+        self.levels = compression_levels(flask_app.config)
+        self.mimetypes = set(flask_app.config['COMPRESS_MIMETYPES'])
+        self.min_size = flask_app.config['COMPRESS_MIN_SIZE']
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self._lifespan(receive, send)
+
+        route = None
+        if scope['type'] == 'http' and scope['method'] == 'GET':
+            route = ASYNC_ROUTES.get(scope['path'])
+        if route is None:
+            return await PooledWsgiInstance(self.flask_app, self.executor)(
+                scope, receive, send
+            )
+
+        with self.flask_app.app_context():
+            await self._handle(scope, receive, send, *route)
+
+    async def _lifespan(self, receive, send):
+        """Cierra las conexiones del motor asíncrono y el pool de hilos al
+        apagar el servidor"""
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.flask_app.extensions['async_engine'].dispose()
+                self.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _handle(self, scope, receive, send, tables, view):
+        """Responde una ruta asíncrona con la semántica de conditional()"""
+        path = scope['path']
+        # Las mismas métricas y la misma ruta en el log de consultas lentas
+        # que en Flask; g es del contexto de aplicación de esta petición
+        g.request_endpoint = f'GET {path}'
+        metrics = self.flask_app.extensions.get('metrics')
+        if metrics is not None:
+            start_request_metrics()
+
+        headers = {
+            name.decode('latin1').lower(): value.decode('latin1')
+            for name, value in scope['headers']
+        }
+        query_string = scope['query_string'].decode()
+        args = MultiDict(parse_qsl(query_string, keep_blank_values=True))
+
+        response_headers = {}
+        if 'origin' in headers:
+            response_headers['Access-Control-Allow-Origin'] = '*'
+
+        try:
+            etag = etag_for(f"{path}?{query_string}",
+                            await AsyncReadService.get_versions(tables),
+                            tables)
+            matched = matching_etag(etag,
+                                    parse_etags(headers.get('if-none-match')))
+            if matched:
+                response_headers['ETag'] = quote_etag(matched)
+                response_headers['Cache-Control'] = 'no-cache'
+                self._observe(metrics, path, 304, response_headers)
+                return await self._send(send, 304, response_headers, b'')
+
+            body, mimetype, extra_headers = await view(
+                args, self.flask_app.config
+            )
+            status = 200
+            response_headers.update(extra_headers)
+        except ValueError as e:
+            body, mimetype, status = {'error': str(e)}, 'application/json', 400
+        except Exception as e:
+            body, mimetype, status = {'error': str(e)}, 'application/json', 500
+
+        if isinstance(body, dict):
+            body = self.flask_app.json.dumps(body).encode('utf-8')
+        response_headers['Content-Type'] = get_content_type(mimetype,
+                                                            'utf-8')
+
+        stream = None
+        if mimetype in self.mimetypes:
+            response_headers['Vary'] = 'Accept-Encoding'
+            encoding = parse_accept_header(
+                headers.get('accept-encoding')
+            ).best_match(list(self.encodings))
+            # Igual que init_compression: los flujos se comprimen siempre
+            if encoding and (not isinstance(body, bytes)
+                             or len(body) >= self.min_size):
+                stream = self.encodings[encoding](self.levels[encoding])
+                response_headers['Content-Encoding'] = encoding
+                etag = f'{etag}-{encoding}'
+
+        if status == 200:
+            response_headers['ETag'] = quote_etag(etag)
+            response_headers['Cache-Control'] = 'no-cache'
+
+        self._observe(metrics, path, status, response_headers)
+        if isinstance(body, bytes):
+            if stream:
+                body = stream.finish(body)
+            return await self._send(send, status, response_headers, body)
+        await self._stream(receive, send, response_headers, body, stream)
+
+    @staticmethod
+    def _observe(metrics, path, status, response_headers):
+        """Registra la petición en /metrics al enviar los encabezados, como
+        after_request en Flask"""
+        if metrics is None:
+            return
+        duration = time.perf_counter() - g.metrics_start
+        response_headers['Server-Timing'] = server_timing(duration)
+        metrics.observe_request('GET', path, status, duration,
+                                g.metrics_queries, g.metrics_db_time)
+
+    async def _send(self, send, status, headers, body):
+        """Envía una respuesta completa"""
+        headers['Content-Length'] = str(len(body))
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': _encode_headers(headers)})
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def _stream(self, receive, send, headers, chunks, stream):
+        """Envía un generador asíncrono por bloques hasta que termine o el
+        cliente se desconecte"""
+        disconnected = asyncio.Event()
+
+        async def watch_disconnect():
+            while (await receive())['type'] != 'http.disconnect':
+                pass
+            disconnected.set()
+
+        watcher = asyncio.ensure_future(watch_disconnect())
+        try:
+            await send({'type': 'http.response.start', 'status': 200,
+                        'headers': _encode_headers(headers)})
+            async for chunk in chunks:
+                if disconnected.is_set():
+                    return
+                chunk = chunk.encode('utf-8')
+                if stream:
+                    chunk = stream.compress(chunk)
+                if chunk:
+                    await send({'type': 'http.response.body', 'body': chunk,
+                                'more_body': True})
+            await send({'type': 'http.response.body',
+                        'body': stream.finish() if stream else b''})
+        finally:
+            watcher.cancel()
+            await chunks.aclose()
+
+
+def _encode_headers(headers):
+    """Encabezados en el formato de ASGI"""
+    return [(name.lower().encode('latin1'), value.encode('latin1'))
+            for name, value in headers.items()]
+
+
+def create_asgi_app(config_name=None, overrides=None):
+    """Factory de la aplicación ASGI"""
+    flask_app = create_app(config_name or os.getenv('FLASK_ENV', 'production'),
+                           overrides)
+    engine = init_async_database(flask_app).sync_engine
+    if 'metrics' in flask_app.extensions:
+        track_queries(engine)
+    if 'slow_queries' in flask_app.extensions:
+        watch_engine(engine, flask_app.extensions['slow_queries'],
+                     flask_app.config['SLOW_QUERY_THRESHOLD_MS'] / 1000)
+    return AsyncApp(flask_app)
@@ -0,0 +1,38 @@
+"""Motor asíncrono (aiosqlite) para las rutas de lectura del modo ASGI"""
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from backend.database import apply_pragmas, pool_options, \
+    validate_pragmas
+from backend.models.category import db
+
+
+def init_async_database(app):
+    """Crea un motor asíncrono sobre la misma base que el motor síncrono"""
+    with app.app_context():
+        url = db.engine.url
+    if url.get_backend_name() != 'sqlite':
+        raise ValueError("El modo asíncrono solo soporta SQLite")
+
+    # aiosqlite usa NullPool por defecto: abriría una conexión (y su hilo)
+    # por consulta y repetiría los pragmas cada vez
+    engine = create_async_engine(
+        url.set(drivername='sqlite+aiosqlite'),
+        poolclass=AsyncAdaptedQueuePool,
+        **pool_options(url, app.config)
+    )
+    pragmas = validate_pragmas(app.config['SQLITE_PRAGMAS'])
+
+    @event.listens_for(engine.sync_engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        apply_pragmas(dbapi_connection, pragmas)
+
+    app.extensions['async_engine'] = engine
+    return engine
+
+
+def async_engine():
+    """Motor asíncrono de la aplicación actual"""
+    return current_app.extensions['async_engine']
@@ -0,0 +1,186 @@
+"""Cachés en memoria del proceso"""
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from collections import OrderedDict
+
+from flask import current_app
+
+
+class LRUCache:
+    """Caché LRU acotada en tamaño y con expiración opcional por entrada"""
+
+    def __init__(self, max_size, ttl=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Retorna el valor vigente o default si no está o expiró"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """Guarda un valor y descarta el menos usado si se supera el tamaño"""
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        """Invalida una entrada"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Invalida todas las entradas"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+def normalize_name(name):
+    """Minúsculas, sin tildes y con los espacios colapsados"""
+    if not name.isascii():
+        decomposed = unicodedata.normalize('NFKD', name)
+        name = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return ' '.join(name.casefold().split())
+
+
+class PrefixIndex:
+    """Lista ordenada de (nombre normalizado, id, nombre) consultada con bisect
+
+    Se carga de forma diferida, se actualiza con cada escritura y se vuelve a
+    cargar al vencer el ttl para recoger cambios hechos por otros procesos.
+    Nunca guarda más de max_entries nombres.
+    """
+
+    def __init__(self, max_entries, ttl=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = []
+        self._by_id = {}
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def stale(self):
+        """Indica si hay que (re)cargar el índice antes de consultarlo"""
+        loaded_at = self._loaded_at
+        if loaded_at is None:
+            return True
+        return bool(self.ttl) and loaded_at + self.ttl < time.monotonic()
+
+    def load(self, rows):
+        """Reemplaza el contenido con los pares (id, nombre) recibidos"""
+        entries = sorted(
+            (normalize_name(name), item_id, name) for item_id, name in rows
+        )[:self.max_entries]
+        with self._lock:
+            self._entries = entries
+            self._by_id = {entry[1]: entry for entry in entries}
+            self._loaded_at = time.monotonic()
+
+    def search(self, prefix, limit):
+        """Retorna hasta limit nombres distintos que empiezan por prefix"""
+        key = normalize_name(prefix)
+        results = []
+        with self._lock:
+            position = bisect_left(self._entries, (key,))
+            last_key = None
+            while position < len(self._entries) and len(results) < limit:
+                entry_key, item_id, name = self._entries[position]
+                if not entry_key.startswith(key):
+                    break
+                if entry_key != last_key:
+                    results.append({'id': item_id, 'name': name})
+                    last_key = entry_key
+                position += 1
+        return results
+
+    def add(self, item_id, name):
+        """Agrega o renombra un elemento si el índice ya está cargado"""
+        self.add_many([(item_id, name)])
+
+    def add_many(self, rows):
+        """Agrega o renombra varios elementos en una sola pasada"""
+        if self._loaded_at is None:
+            return
+        names = dict(rows)
+        entries = sorted((normalize_name(name), item_id, name)
+                         for item_id, name in names.items())
+        with self._lock:
+            self._discard(set(names))
+            entries = entries[:max(self.max_entries - len(self._entries), 0)]
+            if len(entries) == 1:
+                insort(self._entries, entries[0])
+            elif entries:
+                # Timsort combina las dos secuencias ordenadas en O(n)
+                self._entries.extend(entries)
+                self._entries.sort()
+            self._by_id.update((entry[1], entry) for entry in entries)
+
+    def remove(self, item_id):
+        """Quita un elemento del índice"""
+        self.remove_many([item_id])
+
+    def remove_many(self, item_ids):
+        """Quita varios elementos del índice"""
+        with self._lock:
+            self._discard(set(item_ids))
+
+    def invalidate(self):
+        """Fuerza la recarga en la próxima consulta"""
+        with self._lock:
+            self._loaded_at = None
+
+    def _discard(self, item_ids):
+        """Elimina las entradas de los IDs dados (requiere el lock)"""
+        present = [self._by_id.pop(i) for i in item_ids if i in self._by_id]
+        if len(present) == 1:
+            entry = present[0]
+            del self._entries[bisect_left(self._entries, entry)]
+        elif present:
+            self._entries = [e for e in self._entries if e[1] not in item_ids]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def init_cache(app):
+    """Registra las cachés de la aplicación"""
+    app.extensions['category_cache'] = LRUCache(
+        max_size=app.config['CATEGORY_CACHE_SIZE'],
+        ttl=app.config['CATEGORY_CACHE_TTL']
+    )
+    app.extensions['autocomplete'] = {
+        kind: PrefixIndex(
+            max_entries=app.config['AUTOCOMPLETE_MAX_ENTRIES'],
+            ttl=app.config['AUTOCOMPLETE_TTL']
+        )
+        for kind in ('products', 'categories')
+    }
+
+
+def category_cache():
+    """Caché id -> nombre de categoría de la aplicación actual"""
+    return current_app.extensions['category_cache']
+
+
+def autocomplete_index(kind):
+    """Índice de prefijos ('products' o 'categories') de la aplicación"""
+    return current_app.extensions['autocomplete'][kind]
@@ -0,0 +1,110 @@
+"""Compresión de respuestas negociada con Accept-Encoding"""
+import zlib
+
+from flask import request
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depende del entorno
+    zstandard = None
+
+
+class GzipStream:
+    """Compresor gzip incremental"""
+
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        """Comprime un bloque y lo vacía para que el cliente lo reciba ya"""
+        return (self._compressor.compress(data)
+                + self._compressor.flush(zlib.Z_SYNC_FLUSH))
+
+    def finish(self, data=b''):
+        """Comprime el resto y cierra el flujo"""
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class ZstdStream:
+    """Compresor zstd incremental"""
+
+    def __init__(self, level):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        """Comprime un bloque y lo vacía para que el cliente lo reciba ya"""
+        return (self._compressor.compress(data)
+                + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK))
+
+    def finish(self, data=b''):
+        """Comprime el resto y cierra el flujo"""
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+def available_encodings():
+    """Codificaciones soportadas en este entorno, por orden de preferencia"""
+    encodings = {'gzip': GzipStream}
+    if zstandard is not None:
+        encodings = {'zstd': ZstdStream, **encodings}
+    return encodings
+
+
+def compression_levels(config):
+    """Nivel configurado para cada codificación"""
+    return {'gzip': config['COMPRESS_LEVEL'],
+            'zstd': config['COMPRESS_ZSTD_LEVEL']}
+
+
+def init_compression(app):
+    """Comprime las respuestas que superan el umbral configurado"""
+    encodings = available_encodings()
+    levels = compression_levels(app.config)
+    mimetypes = set(app.config['COMPRESS_MIMETYPES'])
+    min_size = app.config['COMPRESS_MIN_SIZE']
+
+    @app.after_request
+    def compress_response(response):
+        if (response.mimetype not in mimetypes
+                or response.status_code < 200
+                or response.status_code in (204, 304)
+                or response.direct_passthrough
+                or 'Content-Encoding' in response.headers
+                or response.cache_control.no_transform):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = request.accept_encodings.best_match(list(encodings))
+        if encoding is None:
+            return response
+
+        stream = encodings[encoding](levels[encoding])
+        if response.is_streamed:
+            # El tamaño no se conoce de antemano: se comprime siempre
+            response.response = compress_chunks(response.response, stream)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < min_size:
+                return response
+            response.set_data(stream.finish(data))
+
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag:
+            # Cada codificación es una representación distinta
+            response.set_etag(f'{etag}-{encoding}', weak)
+        return response
+
+
+def compress_chunks(chunks, stream):
+    """Comprime un iterable de bloques a medida que se consume"""
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            if chunk:
+                yield stream.compress(chunk)
+        yield stream.finish()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
@@ -6,12 +6,141 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Serializador JSON: auto (orjson si está instalado), orjson o std
+    JSON_BACKEND = os.environ.get('JSON_BACKEND', 'auto')
+
+    # Compresión de respuestas: tamaño mínimo (bytes), niveles y tipos
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', 6))
+    COMPRESS_ZSTD_LEVEL = int(os.environ.get('COMPRESS_ZSTD_LEVEL', 3))
+    COMPRESS_MIMETYPES = os.environ.get(
+        'COMPRESS_MIMETYPES',
+        'application/json,application/x-ndjson,text/csv,text/html,'
+        'text/css,text/javascript,application/javascript'
+    ).split(',')
+
+    # Métricas de peticiones y SQL expuestas en /metrics
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() \
+        != 'false'
+
+    # Con varios workers cada proceso vuelca sus métricas en METRICS_DIR cada
+    # METRICS_FLUSH_INTERVAL segundos y /metrics responde la suma de todos.
+    # Vacío = solo las del proceso (un único proceso); gunicorn.conf.py usa
+    # instance/metrics. Solo en POSIX
+    METRICS_DIR = os.environ.get('METRICS_DIR', '')
+    METRICS_FLUSH_INTERVAL = float(
+        os.environ.get('METRICS_FLUSH_INTERVAL', 1))
+
+    # Registro de consultas lentas (archivo vacío = instance/slow_queries.log).
+    # Cada proceso escribe en su propio archivo (slow_queries.<pid>.log) y
+    # /admin/slow-queries muestra las SLOW_QUERY_RECENT más nuevas de todos.
+    # De los procesos ya terminados se conservan los KEEP_EXITED más
+    # recientes (sin sus archivos rotados)
+    SLOW_QUERY_LOG_ENABLED = os.environ.get(
+        'SLOW_QUERY_LOG_ENABLED', 'true').lower() != 'false'
+    SLOW_QUERY_THRESHOLD_MS = float(
+        os.environ.get('SLOW_QUERY_THRESHOLD_MS', 100))
+    SLOW_QUERY_LOG = os.environ.get('SLOW_QUERY_LOG', '')
+    SLOW_QUERY_LOG_MAX_BYTES = int(
+        os.environ.get('SLOW_QUERY_LOG_MAX_BYTES', 10 * 1024 * 1024))
+    SLOW_QUERY_LOG_BACKUPS = int(os.environ.get('SLOW_QUERY_LOG_BACKUPS', 5))
+    SLOW_QUERY_RECENT = int(os.environ.get('SLOW_QUERY_RECENT', 200))
+    SLOW_QUERY_LOG_KEEP_EXITED = int(
+        os.environ.get('SLOW_QUERY_LOG_KEEP_EXITED', 4))
+
+    # Hilos por proceso: los de gunicorn (gthread) y, en el modo asíncrono,
+    # el pool en el que se ejecutan las rutas delegadas en Flask
+    WEB_THREADS = int(os.environ.get('WEB_THREADS', 4))
+
+    # Token para los endpoints /admin. Sin token responden 403, salvo que
+    # ADMIN_REQUIRE_TOKEN esté desactivado (por defecto en desarrollo y
+    # pruebas): las consultas lentas incluyen datos del catálogo
+    ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN', '')
+    ADMIN_REQUIRE_TOKEN = os.environ.get(
+        'ADMIN_REQUIRE_TOKEN', 'true').lower() != 'false'
+
+    # Pool de conexiones del motor. Solo se aplica a las bases que usan
+    # QueuePool (archivos); SQLite en memoria usa un pool de una conexión
+    DB_POOL_OPTIONS = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', -1)),
+    }
+
+    # Pragmas aplicados a cada conexión SQLite nueva. WAL permite que las
+    # lecturas no esperen a las escrituras; cache_size negativo es en KiB y
+    # foreign_keys hace que SQLite valide las referencias a categorías
+    SQLITE_PRAGMAS = {
+        'foreign_keys': os.environ.get('SQLITE_FOREIGN_KEYS', 'ON'),
+        'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+        'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        'cache_size': int(os.environ.get('SQLITE_CACHE_SIZE', -64000)),
+        'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 268435456)),
+        'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000)),
+        'temp_store': os.environ.get('SQLITE_TEMP_STORE', 'MEMORY'),
+    }
+
+    # Commit agrupado de las escrituras individuales (crear, actualizar,
+    # eliminar y ajustar stock): un hilo escritor por proceso confirma hasta
+    # MAX_BATCH operaciones por transacción, esperando como mucho
+    # MAX_DELAY_MS (0 = solo lo ya encolado). Los lotes crecen con las
+    # peticiones simultáneas de cada proceso (WEB_THREADS)
+    WRITE_QUEUE_ENABLED = os.environ.get(
+        'WRITE_QUEUE_ENABLED', 'false').lower() == 'true'
+    WRITE_QUEUE_MAX_BATCH = int(os.environ.get('WRITE_QUEUE_MAX_BATCH', 100))
+    WRITE_QUEUE_MAX_DELAY_MS = float(
+        os.environ.get('WRITE_QUEUE_MAX_DELAY_MS', 1))
+
+    # Idempotency-Key en las escrituras: segundos que se guarda la respuesta,
+    # segundos tras los que una petición en curso se considera abandonada y
+    # cada cuánto se purgan las claves vencidas
+    IDEMPOTENCY_TTL = int(os.environ.get('IDEMPOTENCY_TTL', 86400))
+    IDEMPOTENCY_LOCK_TIMEOUT = int(
+        os.environ.get('IDEMPOTENCY_LOCK_TIMEOUT', 60))
+    IDEMPOTENCY_PURGE_INTERVAL = int(
+        os.environ.get('IDEMPOTENCY_PURGE_INTERVAL', 300))
+
+    # Umbrales de stock y tamaño de la lista de recientes del panel
+    LOW_STOCK_THRESHOLD = int(os.environ.get('LOW_STOCK_THRESHOLD', 5))
+    MEDIUM_STOCK_THRESHOLD = int(os.environ.get('MEDIUM_STOCK_THRESHOLD', 20))
+    RECENT_PRODUCTS_LIMIT = int(os.environ.get('RECENT_PRODUCTS_LIMIT', 5))
+
+    # Paginación por cursor de los listados
+    PAGE_SIZE_DEFAULT = int(os.environ.get('PAGE_SIZE_DEFAULT', 50))
+    PAGE_SIZE_MAX = int(os.environ.get('PAGE_SIZE_MAX', 500))
+
+    # Operaciones en bloque: máximo por petición y filas por commit
+    # (0 = todo el lote en una única transacción)
+    BULK_MAX_ITEMS = int(os.environ.get('BULK_MAX_ITEMS', 100000))
+    BULK_CHUNK_SIZE = int(os.environ.get('BULK_CHUNK_SIZE', 0))
+
+    # Filas leídas por consulta al exportar el catálogo
+    EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', 1000))
+
+    # Importación: filas por commit y errores detallados en la respuesta
+    IMPORT_CHUNK_SIZE = int(os.environ.get('IMPORT_CHUNK_SIZE', 1000))
+    IMPORT_MAX_ERRORS = int(os.environ.get('IMPORT_MAX_ERRORS', 1000))
+
+    # Caché id -> nombre de categorías (segundos de vigencia por entrada)
+    CATEGORY_CACHE_SIZE = int(os.environ.get('CATEGORY_CACHE_SIZE', 10000))
+    CATEGORY_CACHE_TTL = int(os.environ.get('CATEGORY_CACHE_TTL', 60))
+
+    # Autocompletado en memoria: nombres por índice, segundos entre recargas
+    # completas (0 = solo actualizaciones incrementales) y sugerencias
+    AUTOCOMPLETE_MAX_ENTRIES = int(
+        os.environ.get('AUTOCOMPLETE_MAX_ENTRIES', 500000))
+    AUTOCOMPLETE_TTL = int(os.environ.get('AUTOCOMPLETE_TTL', 300))
+    AUTOCOMPLETE_LIMIT = int(os.environ.get('AUTOCOMPLETE_LIMIT', 10))
+
 
 class DevelopmentConfig(Config):
     """Configuración para desarrollo"""
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
         'sqlite:///inventory_dev.db'
+    ADMIN_REQUIRE_TOKEN = os.environ.get(
+        'ADMIN_REQUIRE_TOKEN', 'false').lower() == 'true'
 
 
 class TestingConfig(Config):
@@ -19,6 +148,7 @@ class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///inventory_test.db'
     WTF_CSRF_ENABLED = False
+    ADMIN_REQUIRE_TOKEN = False
 
 
 class ProductionConfig(Config):
@@ -1,5 +1,9 @@
 """Controladores de la API REST"""
+from backend.controllers.admin_controller import admin_bp
+from backend.controllers.autocomplete_controller import autocomplete_bp
 from backend.controllers.category_controller import category_bp
 from backend.controllers.product_controller import product_bp
+from backend.controllers.stats_controller import stats_bp
 
-__all__ = ['category_bp', 'product_bp']
\ No newline at end of file
+__all__ = ['admin_bp', 'autocomplete_bp', 'category_bp', 'product_bp',
+           'stats_bp']
\ No newline at end of file
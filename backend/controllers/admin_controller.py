@@ -0,0 +1,37 @@
+import hmac
+
+from flask import Blueprint, current_app, request, jsonify
+
+admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
+
+
+@admin_bp.before_request
+def require_admin_token():
+    """Exige X-Admin-Token; sin ADMIN_TOKEN los endpoints solo se abren si
+    ADMIN_REQUIRE_TOKEN está desactivado (desarrollo y pruebas)"""
+    token = current_app.config['ADMIN_TOKEN']
+    if not token:
+        if current_app.config['ADMIN_REQUIRE_TOKEN']:
+            return jsonify({'error': 'Los endpoints de administración '
+                                     'requieren configurar ADMIN_TOKEN'}), 403
+        return None
+
+    # Comparación en tiempo constante para no filtrar el token por tiempos
+    provided = request.headers.get('X-Admin-Token', '')
+    if not hmac.compare_digest(provided.encode('utf-8'),
+                               token.encode('utf-8')):
+        return jsonify({'error': 'No autorizado'}), 401
+
+
+@admin_bp.route('/slow-queries', methods=['GET'])
+def get_slow_queries():
+    """Lista las consultas lentas recientes, la más nueva primero"""
+    slow_log = current_app.extensions.get('slow_queries')
+    if slow_log is None:
+        return jsonify({'error': 'El registro de consultas lentas está '
+                                 'desactivado'}), 404
+
+    items = slow_log.recent()
+    if request.args.get('full_scan', '').lower() == 'true':
+        items = [item for item in items if item['full_scans']]
+    return jsonify({'items': items}), 200
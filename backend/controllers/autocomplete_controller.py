@@ -0,0 +1,21 @@
+from flask import Blueprint, request, jsonify
+from backend.services.autocomplete_service import AutocompleteService
+
+autocomplete_bp = Blueprint('autocomplete', __name__,
+                            url_prefix='/api/autocomplete')
+
+
+@autocomplete_bp.route('', methods=['GET'])
+def autocomplete():
+    """Sugiere nombres de productos o categorías por prefijo"""
+    try:
+        items = AutocompleteService.suggest(
+            prefix=request.args.get('q'),
+            kind=request.args.get('type', 'products'),
+            limit=request.args.get('limit')
+        )
+        return jsonify({'items': items}), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -1,23 +1,48 @@
 from flask import Blueprint, request, jsonify
-from backend.services.category_service import CategoryService
+from backend.controllers.conditional import conditional
+from backend.controllers.idempotency import idempotent
+from backend.serialization import rows_to_dicts
+from backend.services.category_service import CATEGORY_FIELDS, \
+    CategoryService
+from backend.services.fieldsets import resolve_fields
 
 category_bp = Blueprint('categories', __name__, url_prefix='/api/categories')
 
 
 @category_bp.route('', methods=['GET'])
+@conditional('categories')
 def get_categories():
-    """Obtiene todas las categorías"""
+    """Obtiene una página de categorías"""
     try:
-        categories = CategoryService.get_all_categories()
-        return jsonify([cat.to_dict() for cat in categories]), 200
+        fields = resolve_fields(request.args.get('fields'), CATEGORY_FIELDS)
+        rows, next_cursor = CategoryService.get_categories_page(
+            limit=request.args.get('limit'),
+            after=request.args.get('after'),
+            fields=fields
+        )
+        return jsonify({
+            'items': rows_to_dicts(rows, fields),
+            'next_cursor': next_cursor
+        }), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
 @category_bp.route('/<int:category_id>', methods=['GET'])
+@conditional('categories')
 def get_category(category_id):
     """Obtiene una categoría por ID"""
     try:
+        fields = resolve_fields(request.args.get('fields'), CATEGORY_FIELDS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        if fields:
+            row = CategoryService.get_category_fields(category_id, fields)
+            return jsonify(rows_to_dicts([row], fields)[0]), 200
         category = CategoryService.get_category_by_id(category_id)
         return jsonify(category.to_dict()), 200
     except ValueError as e:
@@ -27,6 +52,7 @@ def get_category(category_id):
 
 
 @category_bp.route('', methods=['POST'])
+@idempotent
 def create_category():
     """Crea una nueva categoría"""
     try:
@@ -44,6 +70,7 @@ def create_category():
 
 
 @category_bp.route('/<int:category_id>', methods=['PUT'])
+@idempotent
 def update_category(category_id):
     """Actualiza una categoría"""
     try:
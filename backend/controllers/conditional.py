@@ -0,0 +1,63 @@
+import hashlib
+from functools import wraps
+
+from flask import make_response, request
+
+from backend import __version__
+from backend.compression import available_encodings
+from backend.services.version_service import VersionService
+
+
+def current_etag(tables):
+    """Calcula el ETag de la petición según las versiones de las tablas"""
+    return etag_for(request.full_path, VersionService.get_versions(tables),
+                    tables)
+
+
+def etag_for(full_path, versions, tables):
+    """ETag de una ruta con su query string dadas las versiones leídas"""
+    key = '|'.join([__version__, full_path] + [
+        f'{table}:{versions.get(table, 0)}' for table in tables
+    ])
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def matching_etag(etag, if_none_match):
+    """Variante del ETag (sin o con codificación) que el cliente ya tiene"""
+    # La compresión agrega la codificación al ETag enviado
+    return next((
+        tag for tag in [etag] + [
+            f'{etag}-{encoding}' for encoding in available_encodings()
+        ]
+        if if_none_match.contains_weak(tag)
+    ), None)
+
+
+def conditional(*tables):
+    """Responde 304 sin ejecutar la vista si el ETag del cliente coincide
+
+    La versión se lee antes de ejecutar la vista: si otra escritura ocurre
+    mientras tanto, el ETag queda desactualizado (y el cliente recibirá la
+    respuesta completa en la siguiente consulta) en lugar de asociar datos
+    viejos a una versión nueva.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = current_etag(tables)
+            matched = matching_etag(etag, request.if_none_match)
+
+            if matched:
+                response = make_response('', 304)
+                etag = matched
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            # Los navegadores guardan la respuesta pero siempre revalidan
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
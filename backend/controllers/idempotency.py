@@ -0,0 +1,72 @@
+import hashlib
+from functools import wraps
+
+from flask import g, jsonify, make_response, request
+
+from backend.services.idempotency_service import IdempotencyService
+
+
+def request_fingerprint():
+    """Hash del método, la ruta con su query string y el cuerpo"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f'{request.method} {request.full_path}\n'.encode('utf-8'))
+    digest.update(request.get_data())
+    return digest.hexdigest()
+
+
+def idempotent(view):
+    """Repite la respuesta guardada si la petición trae una Idempotency-Key
+    ya usada, sin volver a ejecutar la escritura
+
+    La reserva se escribe en la misma transacción que la escritura de la
+    vista; si otra petición con la misma clave confirmó primero, se revierte
+    y se responde como un reintento. Se guardan las respuestas 2xx y 4xx;
+    ante un error 5xx se libera la clave para que el reintento se ejecute de
+    nuevo.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get('Idempotency-Key')
+        if key is None:
+            return view(*args, **kwargs)
+
+        fingerprint = request_fingerprint()
+        try:
+            existing = IdempotencyService.reserve(key, fingerprint)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        if existing is not None:
+            return replay(existing, fingerprint)
+
+        try:
+            response = make_response(view(*args, **kwargs))
+        except Exception:
+            IdempotencyService.release()
+            raise
+
+        if g.idempotency.conflict:
+            existing = IdempotencyService.find(key)
+            if existing is not None:
+                return replay(existing, fingerprint)
+        if response.status_code >= 500:
+            IdempotencyService.release()
+        else:
+            IdempotencyService.save_response(response.status_code,
+                                             response.get_data())
+        return response
+    return wrapper
+
+
+def replay(existing, fingerprint):
+    """Respuesta ante una clave que ya usó otra petición"""
+    if existing.fingerprint != fingerprint:
+        return jsonify({'error': 'La Idempotency-Key ya se usó '
+                                 'con otra petición'}), 422
+    if existing.status_code is None:
+        return jsonify({'error': 'La petición original con esta '
+                                 'Idempotency-Key sigue en curso'}), 409
+    response = make_response(existing.body, existing.status_code)
+    response.mimetype = 'application/json'
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response
@@ -1,29 +1,129 @@
-from flask import Blueprint, request, jsonify
-from backend.services.product_service import ProductService
+from flask import Blueprint, Response, current_app, request, jsonify, \
+    stream_with_context
+from backend.controllers.conditional import conditional
+from backend.controllers.idempotency import idempotent
+from backend.serialization import rows_to_dicts
+from backend.services.errors import NotFoundError
+from backend.services.export_service import ExportService
+from backend.services.fieldsets import resolve_fields
+from backend.services.import_service import ImportService
+from backend.services.product_service import PRODUCT_FIELDS, ProductService
 
 product_bp = Blueprint('products', __name__, url_prefix='/api/products')
 
 
 @product_bp.route('', methods=['GET'])
+@conditional('products', 'categories')
 def get_products():
-    """Obtiene todos los productos"""
+    """Obtiene una página de productos"""
     try:
-        category_id = request.args.get('category_id', type=int)
-        if category_id:
-            products = ProductService.get_products_by_category(category_id)
-        else:
-            products = ProductService.get_all_products()
-        return jsonify([prod.to_dict() for prod in products]), 200
+        fields = resolve_fields(request.args.get('fields'), PRODUCT_FIELDS)
+        rows, next_cursor = ProductService.get_products_page(
+            limit=request.args.get('limit'),
+            after=request.args.get('after'),
+            category_id=request.args.get('category_id', type=int),
+            min_price=request.args.get('min_price'),
+            max_price=request.args.get('max_price'),
+            min_stock=request.args.get('min_stock'),
+            max_stock=request.args.get('max_stock'),
+            name=request.args.get('name'),
+            sort=request.args.get('sort'),
+            fields=fields
+        )
+        return jsonify({
+            'items': rows_to_dicts(rows, fields),
+            'next_cursor': next_cursor
+        }), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@product_bp.route('/search', methods=['GET'])
+@conditional('products', 'categories')
+def search_products():
+    """Busca productos por texto en nombre y descripción"""
+    try:
+        fields = resolve_fields(request.args.get('fields'), PRODUCT_FIELDS)
+        rows, next_cursor = ProductService.search_products(
+            query=request.args.get('q'),
+            limit=request.args.get('limit'),
+            after=request.args.get('after'),
+            fields=fields
+        )
+        # Sin fields, solo los campos públicos: la fila trae también rank
+        return jsonify({
+            'items': rows_to_dicts(rows, fields or PRODUCT_FIELDS),
+            'next_cursor': next_cursor
+        }), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@product_bp.route('/export', methods=['GET'])
+@conditional('products', 'categories')
+def export_products():
+    """Exporta el catálogo de productos en NDJSON o CSV"""
+    try:
+        chunks, mimetype = ExportService.export_products(
+            export_format=request.args.get('format'),
+            batch_size=current_app.config['EXPORT_BATCH_SIZE'],
+            category_id=request.args.get('category_id', type=int)
+        )
+        extension = 'csv' if mimetype == 'text/csv' else 'ndjson'
+        response = Response(stream_with_context(chunks), mimetype=mimetype)
+        response.headers['Content-Disposition'] = (
+            f'attachment; filename=products.{extension}'
+        )
+        return response
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@product_bp.route('/import', methods=['POST'])
+def import_products():
+    """Importa productos desde un archivo CSV o NDJSON"""
+    try:
+        upload = request.files.get('file')
+        stream = upload.stream if upload else request.stream
+        import_format = request.args.get('format')
+        if not import_format and upload and upload.filename:
+            import_format = upload.filename.rsplit('.', 1)[-1]
+
+        records = ImportService.iter_records(stream,
+                                             (import_format or '').lower())
+        result = ImportService.import_products(
+            records,
+            chunk_size=current_app.config['IMPORT_CHUNK_SIZE'],
+            resume_from=request.args.get('resume_from', 0, type=int),
+            create_categories=request.args.get(
+                'create_categories', 'true').lower() != 'false',
+            max_errors=current_app.config['IMPORT_MAX_ERRORS']
+        )
+        return jsonify(result), 500 if 'interrupted' in result else 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
 @product_bp.route('/<int:product_id>', methods=['GET'])
+@conditional('products', 'categories')
 def get_product(product_id):
     """Obtiene un producto por ID"""
     try:
-        product = ProductService.get_product_by_id(product_id)
-        return jsonify(product.to_dict()), 200
+        fields = resolve_fields(request.args.get('fields'), PRODUCT_FIELDS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        row = ProductService.get_product_fields(product_id, fields)
+        return jsonify(rows_to_dicts([row], fields)[0]), 200
     except ValueError as e:
         return jsonify({'error': str(e)}), 404
     except Exception as e:
@@ -31,6 +131,7 @@ def get_product(product_id):
 
 
 @product_bp.route('', methods=['POST'])
+@idempotent
 def create_product():
     """Crea un nuevo producto"""
     try:
@@ -53,6 +154,7 @@ def create_product():
 
 
 @product_bp.route('/<int:product_id>', methods=['PUT'])
+@idempotent
 def update_product(product_id):
     """Actualiza un producto"""
     try:
@@ -83,5 +185,106 @@ def delete_product(product_id):
         return jsonify({'message': 'Producto eliminado exitosamente'}), 200
     except ValueError as e:
         return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@product_bp.route('/<int:product_id>/stock', methods=['POST'])
+@idempotent
+def adjust_stock(product_id):
+    """Ajusta el stock de un producto sumando un delta con signo"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'No se recibieron datos'}), 400
+
+        stock = ProductService.adjust_stock(product_id, data.get('delta'))
+        return jsonify({'id': product_id, 'stock': stock}), 200
+    except NotFoundError as e:
+        return jsonify({'error': str(e)}), 404
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@product_bp.route('/stock', methods=['POST'])
+@idempotent
+def bulk_adjust_stock():
+    """Ajusta el stock de varios productos en una sola transacción"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'No se recibieron datos'}), 400
+
+        result = ProductService.bulk_adjust_stock(
+            _bulk_payload(data, 'items')
+        )
+        return jsonify(result), 400 if result['errors'] else 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+def _bulk_payload(data, key):
+    """Extrae la lista de un lote enviado como objeto o como lista"""
+    if isinstance(data, dict):
+        return data.get(key)
+    return data
+
+
+@product_bp.route('/bulk', methods=['POST'])
+@idempotent
+def bulk_create_products():
+    """Crea productos en bloque"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'No se recibieron datos'}), 400
+
+        result = ProductService.bulk_create_products(
+            _bulk_payload(data, 'items')
+        )
+        return jsonify(result), 400 if result['errors'] else 201
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@product_bp.route('/bulk', methods=['PUT'])
+@idempotent
+def bulk_update_products():
+    """Actualiza productos en bloque"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'No se recibieron datos'}), 400
+
+        result = ProductService.bulk_update_products(
+            _bulk_payload(data, 'items')
+        )
+        return jsonify(result), 400 if result['errors'] else 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@product_bp.route('/bulk', methods=['DELETE'])
+def bulk_delete_products():
+    """Elimina productos en bloque"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'No se recibieron datos'}), 400
+
+        result = ProductService.bulk_delete_products(
+            _bulk_payload(data, 'ids')
+        )
+        return jsonify(result), 400 if result['errors'] else 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
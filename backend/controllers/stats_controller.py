@@ -0,0 +1,26 @@
+from flask import Blueprint, current_app, request, jsonify
+from backend.controllers.conditional import conditional
+from backend.services.stats_service import StatsService
+
+stats_bp = Blueprint('stats', __name__, url_prefix='/api/stats')
+
+
+@stats_bp.route('', methods=['GET'])
+@conditional('products', 'categories')
+def get_stats():
+    """Obtiene las estadísticas del panel de control"""
+    try:
+        config = current_app.config
+        stats = StatsService.get_dashboard_stats(
+            low_threshold=request.args.get(
+                'low', config['LOW_STOCK_THRESHOLD']),
+            medium_threshold=request.args.get(
+                'medium', config['MEDIUM_STOCK_THRESHOLD']),
+            recent_limit=request.args.get(
+                'recent', config['RECENT_PRODUCTS_LIMIT'])
+        )
+        return jsonify(stats), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,71 @@
+"""Configuración del motor de base de datos"""
+import re
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+from backend.models.category import db
+
+# Pragmas que se aceptan desde la configuración
+SQLITE_PRAGMAS = ('foreign_keys', 'journal_mode', 'synchronous',
+                  'cache_size', 'mmap_size', 'busy_timeout', 'temp_store')
+PRAGMA_VALUE = re.compile(r'^-?\w+$')
+
+
+def init_database(app):
+    """Inicializa SQLAlchemy y aplica los pragmas a cada conexión nueva"""
+    # Las opciones explícitas de SQLALCHEMY_ENGINE_OPTIONS tienen prioridad
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        **pool_options(app.config['SQLALCHEMY_DATABASE_URI'], app.config),
+        **app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}),
+    }
+    db.init_app(app)
+
+    with app.app_context():
+        engine = db.engine
+        if engine.dialect.name != 'sqlite':
+            return
+
+        pragmas = validate_pragmas(app.config['SQLITE_PRAGMAS'])
+
+        @event.listens_for(engine, 'connect')
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            apply_pragmas(dbapi_connection, pragmas)
+
+
+def pool_options(url, config):
+    """Opciones de DB_POOL_OPTIONS si la URL usa QueuePool
+
+    SQLite en memoria usa un pool de una sola conexión, que no acepta
+    pool_size, max_overflow ni pool_timeout.
+    """
+    url = make_url(url)
+    if url.get_backend_name() == 'sqlite' and (
+            url.database in (None, '', ':memory:')
+            or url.query.get('mode') == 'memory'):
+        return {}
+    return dict(config['DB_POOL_OPTIONS'])
+
+
+def validate_pragmas(pragmas):
+    """Descarta valores vacíos y rechaza pragmas o valores no permitidos"""
+    valid = {}
+    for name, value in pragmas.items():
+        if value is None or value == '':
+            continue
+        if name not in SQLITE_PRAGMAS:
+            raise ValueError(f"Pragma de SQLite no soportado: {name}")
+        if not PRAGMA_VALUE.match(str(value)):
+            raise ValueError(f"Valor inválido para el pragma {name}")
+        valid[name] = value
+    return valid
+
+
+def apply_pragmas(dbapi_connection, pragmas):
+    """Ejecuta los pragmas sobre una conexión DB-API recién abierta"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cursor.close()
@@ -0,0 +1,377 @@
+"""Métricas de peticiones y SQL en formato de texto de Prometheus"""
+import atexit
+import json
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from flask import Response, current_app, g, has_app_context, request
+from sqlalchemy import event
+
+from backend.models.category import db
+from backend.slow_queries import process_alive
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+COUNTERS = ('requests', 'queries')
+HISTOGRAMS = ('latency', 'db_time', 'query_count')
+
+
+class Histogram:
+    """Histograma acumulativo con los límites dados"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        """Registra una observación"""
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Métricas del proceso actual
+
+    Con `shared` (varios workers) cada observación se vuelca también al
+    directorio compartido y /metrics expone la suma de todos los procesos.
+    """
+
+    def __init__(self, shared=None):
+        self.shared = shared
+        self._lock = threading.Lock()
+        self.requests = defaultdict(int)
+        self.queries = defaultdict(int)
+        self.latency = defaultdict(lambda: Histogram(LATENCY_BUCKETS))
+        self.db_time = defaultdict(lambda: Histogram(LATENCY_BUCKETS))
+        self.query_count = defaultdict(
+            lambda: Histogram(QUERY_COUNT_BUCKETS)
+        )
+
+    def observe_request(self, method, endpoint, status, duration,
+                        query_count, db_time):
+        """Registra una petición atendida"""
+        labels = (('method', method), ('endpoint', endpoint))
+        with self._lock:
+            self.requests[labels + (('status', str(status)),)] += 1
+            self.queries[labels] += query_count
+            self.latency[labels].observe(duration)
+            self.db_time[labels].observe(db_time)
+            self.query_count[labels].observe(query_count)
+        if self.shared is not None:
+            self.shared.changed(self)
+
+    def snapshot(self):
+        """Valores actuales serializables en JSON"""
+        with self._lock:
+            snapshot = {
+                name: [[labels, value]
+                       for labels, value in getattr(self, name).items()]
+                for name in COUNTERS
+            }
+            snapshot.update({
+                name: [[labels, histogram.counts, histogram.sum,
+                        histogram.count]
+                       for labels, histogram in getattr(self, name).items()]
+                for name in HISTOGRAMS
+            })
+        return snapshot
+
+    def merge(self, snapshot):
+        """Suma a este registro los valores de un snapshot()"""
+        with self._lock:
+            for name in COUNTERS:
+                values = getattr(self, name)
+                for labels, value in snapshot.get(name, ()):
+                    values[_label_key(labels)] += value
+            for name in HISTOGRAMS:
+                histograms = getattr(self, name)
+                for labels, counts, total, count in snapshot.get(name, ()):
+                    histogram = histograms[_label_key(labels)]
+                    histogram.counts = [a + b for a, b
+                                        in zip(histogram.counts, counts)]
+                    histogram.sum += total
+                    histogram.count += count
+
+    def render(self):
+        """Texto en el formato de exposición de Prometheus"""
+        lines = []
+        with self._lock:
+            _counter(lines, 'http_requests_total',
+                     'Peticiones HTTP atendidas', self.requests)
+            _histogram(lines, 'http_request_duration_seconds',
+                       'Duración de las peticiones HTTP', self.latency)
+            _counter(lines, 'db_queries_total',
+                     'Sentencias SQL ejecutadas', self.queries)
+            _histogram(lines, 'db_queries_per_request',
+                       'Sentencias SQL por petición', self.query_count)
+            _histogram(lines, 'db_duration_seconds_per_request',
+                       'Tiempo total en la base por petición', self.db_time)
+        return '\n'.join(lines) + '\n'
+
+
+def _label_key(labels):
+    """Etiquetas leídas de JSON (listas) como clave del registro"""
+    return tuple(tuple(pair) for pair in labels)
+
+
+class SharedMetrics:
+    """Suma las métricas de todos los workers en un directorio compartido
+
+    Con varios workers detrás de un mismo socket cada scrape llega a un
+    proceso distinto. Cada proceso vuelca su registro en metrics.<pid>.json
+    cada `interval` segundos (un hilo propio, arrancado tras el fork) y al
+    salir; collect() suma el registro propio y los archivos de los demás.
+    Los archivos de los procesos terminados se acumulan en
+    metrics.exited.json para que los contadores no retrocedan al reciclar
+    workers. Requiere fcntl (POSIX) para bloquear el directorio.
+    """
+
+    EXITED = 'metrics.exited.json'
+    PATTERN = re.compile(r'metrics\.(\d+)\.json$')
+
+    def __init__(self, directory, interval):
+        self.directory = directory
+        self.interval = interval
+        self._pid = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def changed(self, registry):
+        """Marca el registro del proceso para el próximo volcado"""
+        self.start(registry)
+        self._dirty = True
+
+    def start(self, registry):
+        """Arranca el volcado del proceso actual (una vez por pid)"""
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            # Un archivo con este pid es de un proceso anterior ya terminado
+            with self._locked(exclusive=True):
+                self._fold_exited(pid)
+            self._pid = pid
+            threading.Thread(target=self._run, args=(registry,),
+                             name='metrics-flush', daemon=True).start()
+            atexit.register(self._flush_at_exit, registry)
+
+    def _run(self, registry):
+        """Vuelca el registro cada `interval` segundos si cambió"""
+        while True:
+            time.sleep(self.interval)
+            if self._dirty:
+                self._dirty = False
+                self.flush(registry)
+
+    def flush(self, registry):
+        """Escribe el registro del proceso en su archivo"""
+        _write_json(self._path(os.getpid()), registry.snapshot())
+
+    def _flush_at_exit(self, registry):
+        """Último volcado al terminar el proceso"""
+        try:
+            self.flush(registry)
+        except OSError:
+            # El directorio ya no existe: no hay a quién reportar
+            pass
+
+    def collect(self, registry):
+        """Registro con la suma de todos los procesos (el propio, en vivo)"""
+        self.start(registry)
+        total = MetricsRegistry()
+        total.merge(registry.snapshot())
+        with self._locked(exclusive=False):
+            paths = [path for pid, path in self._files()
+                     if pid != os.getpid()]
+            for path in paths + [os.path.join(self.directory, self.EXITED)]:
+                total.merge(_read_json(path))
+        return total
+
+    def _fold_exited(self, pid):
+        """Acumula en EXITED los archivos de los procesos terminados (y el
+        de `pid`) y los borra"""
+        paths = [path for other, path in self._files()
+                 if other == pid or not process_alive(other)]
+        if not paths:
+            return
+        exited = os.path.join(self.directory, self.EXITED)
+        total = MetricsRegistry()
+        for path in [exited] + paths:
+            total.merge(_read_json(path))
+        _write_json(exited, total.snapshot())
+        for path in paths:
+            for stale in (path, f'{path}.tmp'):
+                try:
+                    os.remove(stale)
+                except FileNotFoundError:
+                    continue
+
+    def _files(self):
+        """(pid, archivo) de los procesos con métricas volcadas"""
+        files = []
+        for entry in os.listdir(self.directory):
+            match = self.PATTERN.match(entry)
+            if match:
+                files.append((int(match.group(1)),
+                              os.path.join(self.directory, entry)))
+        return files
+
+    def _path(self, pid):
+        return os.path.join(self.directory, f'metrics.{pid}.json')
+
+    @contextmanager
+    def _locked(self, exclusive):
+        """Bloqueo entre procesos: exclusivo para acumular los terminados,
+        compartido para leer"""
+        with open(os.path.join(self.directory, 'metrics.lock'), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield
+
+
+def _read_json(path):
+    """Snapshot guardado en un archivo (vacío si no existe)"""
+    try:
+        with open(path, encoding='utf-8') as source:
+            return json.load(source)
+    except FileNotFoundError:
+        return {}
+
+
+def _write_json(path, snapshot):
+    """Escribe un snapshot de forma atómica (los lectores ven el anterior o
+    el nuevo, nunca uno a medias)"""
+    temporary = f'{path}.tmp'
+    with open(temporary, 'w', encoding='utf-8') as target:
+        json.dump(snapshot, target)
+    os.replace(temporary, path)
+
+
+def _format_labels(labels):
+    """Serializa las etiquetas escapando barras, comillas y saltos"""
+    escaped = (
+        (name, value.replace('\\', '\\\\').replace('"', '\\"')
+         .replace('\n', '\\n'))
+        for name, value in labels
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+def _counter(lines, name, help_text, values):
+    lines.append(f'# HELP {name} {help_text}')
+    lines.append(f'# TYPE {name} counter')
+    for labels, value in sorted(values.items()):
+        lines.append(f'{name}{_format_labels(labels)} {value}')
+
+
+def _histogram(lines, name, help_text, histograms):
+    lines.append(f'# HELP {name} {help_text}')
+    lines.append(f'# TYPE {name} histogram')
+    for labels, histogram in sorted(histograms.items()):
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            bucket_labels = labels + (('le', str(bound)),)
+            lines.append(
+                f'{name}_bucket{_format_labels(bucket_labels)} {count}'
+            )
+        inf_labels = labels + (('le', '+Inf'),)
+        lines.append(
+            f'{name}_bucket{_format_labels(inf_labels)} {histogram.count}'
+        )
+        lines.append(f'{name}_sum{_format_labels(labels)} {histogram.sum}')
+        lines.append(
+            f'{name}_count{_format_labels(labels)} {histogram.count}'
+        )
+
+
+def track_queries(engine):
+    """Suma las sentencias y su duración a la petición en curso (g)
+
+    También se usa con el motor asíncrono del modo ASGI, cuyas rutas no
+    tienen contexto de petición de Flask pero sí de aplicación.
+    """
+    # El inicio se guarda en el contexto de ejecución: after_cursor_execute
+    # no se dispara si la sentencia falla y el contexto se descarta con ella
+    @event.listens_for(engine, 'before_cursor_execute')
+    def start_query(conn, cursor, statement, parameters, context, many):
+        if context is not None:
+            context._metrics_query_start = time.perf_counter()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def end_query(conn, cursor, statement, parameters, context, many):
+        start = getattr(context, '_metrics_query_start', None)
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start
+        if has_app_context() and 'metrics_start' in g:
+            g.metrics_queries += 1
+            g.metrics_db_time += elapsed
+
+
+def start_request_metrics():
+    """Empieza a medir la petición en curso"""
+    g.metrics_start = time.perf_counter()
+    g.metrics_queries = 0
+    g.metrics_db_time = 0.0
+
+
+def server_timing(duration):
+    """Encabezado Server-Timing con el tiempo en la base y el total"""
+    return (f'db;dur={g.metrics_db_time * 1000:.2f};'
+            f'desc="{g.metrics_queries} queries", '
+            f'app;dur={duration * 1000:.2f}')
+
+
+def init_metrics(app):
+    """Mide cada petición, cuenta su SQL y expone /metrics"""
+    if not app.config['METRICS_ENABLED']:
+        return
+
+    shared = None
+    if app.config['METRICS_DIR'] and fcntl is not None:
+        os.makedirs(app.config['METRICS_DIR'], exist_ok=True)
+        shared = SharedMetrics(app.config['METRICS_DIR'],
+                               app.config['METRICS_FLUSH_INTERVAL'])
+    registry = MetricsRegistry(shared)
+    app.extensions['metrics'] = registry
+
+    with app.app_context():
+        track_queries(db.engine)
+
+    app.before_request(start_request_metrics)
+
+    @app.after_request
+    def record_request(response):
+        if 'metrics_start' not in g:
+            return response
+        duration = time.perf_counter() - g.metrics_start
+        # Solo la plantilla de la ruta, para no crear una serie por URL
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+
+        response.headers.add('Server-Timing', server_timing(duration))
+        registry.observe_request(request.method, endpoint,
+                                 response.status_code, duration,
+                                 g.metrics_queries, g.metrics_db_time)
+        return response
+
+    @app.route('/metrics')
+    def metrics():
+        registry = current_app.extensions['metrics']
+        if registry.shared is not None:
+            registry = registry.shared.collect(registry)
+        return Response(registry.render(),
+                        mimetype='text/plain; version=0.0.4')
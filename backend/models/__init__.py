@@ -1,5 +1,7 @@
 """Modelos de datos del sistema"""
 from backend.models.category import Category, db
+from backend.models.idempotency_key import IdempotencyKey
 from backend.models.product import Product
+from backend.models.table_version import TableVersion
 
-__all__ = ['Category', 'Product', 'db']
\ No newline at end of file
+__all__ = ['Category', 'IdempotencyKey', 'Product', 'TableVersion', 'db']
\ No newline at end of file
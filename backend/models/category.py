@@ -1,28 +1,56 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.orm import validates
+
+from backend.cache import normalize_name
 
 db = SQLAlchemy()
 
 
+def _name_key_default(context):
+    """name_key de las inserciones de Core (insert(Category).values(...))"""
+    return normalize_name(context.get_current_parameters()['name'])
+
+
 class Category(db.Model):
     """Modelo de Categoría"""
     __tablename__ = 'categories'
+    __table_args__ = (
+        # Unicidad sin distinguir mayúsculas ni tildes (NOCASE de SQLite solo
+        # pliega ASCII: "ELECTRÓNICA" y "Electrónica" serían distintas); sirve
+        # también para las búsquedas por nombre de CategoryService
+        db.Index('ux_categories_name_key', 'name_key', unique=True),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False, unique=True)
+    # Nombre normalizado con normalize_name(), igual que el autocompletado
+    name_key = db.Column(db.String(100), nullable=False,
+                         default=_name_key_default)
+
+    # Conteo de productos mantenido por triggers (ver models/schema.py)
+    product_count = db.Column(db.Integer, nullable=False, default=0,
+                              server_default='0')
 
     # Relación con productos
     products = db.relationship('Product', backref='category', lazy=True,
-                               cascade='all, delete-orphan')
+                               cascade='all, delete-orphan',
+                               passive_deletes=True)
 
     def __init__(self, name):
         self.name = name
 
+    @validates('name')
+    def _set_name_key(self, key, name):
+        """Mantiene name_key al asignar el nombre desde el ORM"""
+        self.name_key = normalize_name(name)
+        return name
+
     def to_dict(self):
         """Convierte el objeto a diccionario"""
         return {
             'id': self.id,
             'name': self.name,
-            'product_count': len(self.products)
+            'product_count': self.product_count
         }
 
     def __repr__(self):
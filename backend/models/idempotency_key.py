@@ -0,0 +1,21 @@
+from backend.models.category import db
+
+
+class IdempotencyKey(db.Model):
+    """Respuesta guardada de una escritura enviada con Idempotency-Key"""
+    __tablename__ = 'idempotency_keys'
+    __table_args__ = (
+        # Purga de las claves vencidas
+        db.Index('ix_idempotency_keys_created_at', 'created_at'),
+    )
+
+    key = db.Column(db.String(255), primary_key=True)
+    # Hash del método, la ruta y el cuerpo de la petición original
+    fingerprint = db.Column(db.String(32), nullable=False)
+    # NULL mientras la petición original se está ejecutando
+    status_code = db.Column(db.Integer, nullable=True)
+    body = db.Column(db.LargeBinary, nullable=True)
+    created_at = db.Column(db.Float, nullable=False)
+
+    def __repr__(self):
+        return f'<IdempotencyKey {self.key}>'
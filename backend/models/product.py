@@ -4,6 +4,15 @@ from backend.models.category import db
 class Product(db.Model):
     """Modelo de Producto"""
     __tablename__ = 'products'
+    __table_args__ = (
+        # Filtros y ordenamientos usados por la API y el panel. El filtro por
+        # categoría usa los índices compuestos (category_id va primero)
+        db.Index('ix_products_stock', 'stock'),
+        db.Index('ix_products_price', 'price'),
+        db.Index('ix_products_name_nocase', db.text('name COLLATE NOCASE')),
+        db.Index('ix_products_category_price', 'category_id', 'price'),
+        db.Index('ix_products_category_stock', 'category_id', 'stock'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
@@ -29,8 +38,13 @@ class Product(db.Model):
             'price': self.price,
             'stock': self.stock,
             'category_id': self.category_id,
-            'category_name': self.category.name if self.category else None
+            'category_name': self.category_name
         }
 
+    @property
+    def category_name(self):
+        """Nombre de la categoría (cargada junto al producto si se pidió)"""
+        return self.category.name if self.category else None
+
     def __repr__(self):
         return f'<Product {self.name}>'
\ No newline at end of file
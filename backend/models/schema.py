@@ -0,0 +1,239 @@
+"""Objetos de esquema que db.create_all() no crea ni actualiza por sí solo"""
+import logging
+
+from sqlalchemy import DDL, event, inspect, text
+from sqlalchemy.exc import IntegrityError
+
+from backend.cache import normalize_name
+from backend.models.category import Category
+from backend.models.product import Product
+from backend.models.table_version import TableVersion
+
+# Mantienen categories.product_count al insertar, eliminar o reasignar
+PRODUCT_COUNT_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_products_count_insert
+    AFTER INSERT ON products
+    BEGIN
+        UPDATE categories SET product_count = product_count + 1
+        WHERE id = NEW.category_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_products_count_delete
+    AFTER DELETE ON products
+    BEGIN
+        UPDATE categories SET product_count = product_count - 1
+        WHERE id = OLD.category_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_products_count_update
+    AFTER UPDATE OF category_id ON products
+    WHEN OLD.category_id IS NOT NEW.category_id
+    BEGIN
+        UPDATE categories SET product_count = product_count - 1
+        WHERE id = OLD.category_id;
+        UPDATE categories SET product_count = product_count + 1
+        WHERE id = NEW.category_id;
+    END
+    """,
+]
+
+# Tablas cuyo contador en table_versions se incrementa con cada escritura
+VERSIONED_TABLES = (Category.__table__, Product.__table__)
+
+VERSION_TRIGGERS = [
+    (table, f"""
+    CREATE TRIGGER IF NOT EXISTS trg_{table.name}_version_{operation.lower()}
+    AFTER {operation} ON {table.name}
+    BEGIN
+        UPDATE table_versions SET version = version + 1
+        WHERE name = '{table.name}';
+    END
+    """)
+    for table in VERSIONED_TABLES
+    for operation in ('INSERT', 'UPDATE', 'DELETE')
+]
+
+SEED_TABLE_VERSIONS = (
+    "INSERT OR IGNORE INTO table_versions (name, version) VALUES "
+    + ", ".join(f"('{table.name}', 0)" for table in VERSIONED_TABLES)
+)
+
+# Índice de texto completo sobre nombre y descripción (contenido externo:
+# el texto vive en products y los triggers mantienen el índice)
+PRODUCT_SEARCH_TABLE = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+        name, description,
+        content='products', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """
+
+PRODUCT_SEARCH_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_products_fts_insert
+    AFTER INSERT ON products
+    BEGIN
+        INSERT INTO products_fts (rowid, name, description)
+        VALUES (NEW.id, NEW.name, NEW.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_products_fts_delete
+    AFTER DELETE ON products
+    BEGIN
+        INSERT INTO products_fts (products_fts, rowid, name, description)
+        VALUES ('delete', OLD.id, OLD.name, OLD.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_products_fts_update
+    AFTER UPDATE OF name, description ON products
+    BEGIN
+        INSERT INTO products_fts (products_fts, rowid, name, description)
+        VALUES ('delete', OLD.id, OLD.name, OLD.description);
+        INSERT INTO products_fts (rowid, name, description)
+        VALUES (NEW.id, NEW.name, NEW.description);
+    END
+    """,
+]
+
+logger = logging.getLogger(__name__)
+
+for _trigger in PRODUCT_COUNT_TRIGGERS:
+    event.listen(Product.__table__, 'after_create',
+                 DDL(_trigger).execute_if(dialect='sqlite'))
+
+event.listen(Product.__table__, 'after_create',
+             DDL(PRODUCT_SEARCH_TABLE).execute_if(dialect='sqlite'))
+for _trigger in PRODUCT_SEARCH_TRIGGERS:
+    event.listen(Product.__table__, 'after_create',
+                 DDL(_trigger).execute_if(dialect='sqlite'))
+event.listen(Product.__table__, 'before_drop',
+             DDL("DROP TABLE IF EXISTS products_fts")
+             .execute_if(dialect='sqlite'))
+
+for _table, _trigger in VERSION_TRIGGERS:
+    event.listen(_table, 'after_create',
+                 DDL(_trigger).execute_if(dialect='sqlite'))
+
+event.listen(TableVersion.__table__, 'after_create',
+             DDL(SEED_TABLE_VERSIONS).execute_if(dialect='sqlite'))
+
+
+def upgrade_schema(engine):
+    """Aplica de forma idempotente los cambios sobre bases ya existentes"""
+    if engine.dialect.name != 'sqlite':
+        return []
+
+    with engine.begin() as conn:
+        columns = {
+            column['name']
+            for column in inspect(conn).get_columns(Category.__tablename__)
+        }
+        added_count = 'product_count' not in columns
+        if added_count:
+            conn.execute(text(
+                "ALTER TABLE categories "
+                "ADD COLUMN product_count INTEGER NOT NULL DEFAULT 0"
+            ))
+
+        for trigger in PRODUCT_COUNT_TRIGGERS:
+            conn.execute(text(trigger))
+
+        if 'name_key' not in columns:
+            conn.execute(text(
+                "ALTER TABLE categories "
+                "ADD COLUMN name_key VARCHAR(100) NOT NULL DEFAULT ''"
+            ))
+            backfill_name_keys(conn)
+        # Reemplazado por ux_categories_name_key (NOCASE solo pliega ASCII)
+        conn.execute(text("DROP INDEX IF EXISTS ux_categories_name_nocase"))
+        # Redundante: category_id encabeza ix_products_category_price/stock
+        conn.execute(text("DROP INDEX IF EXISTS ix_products_category_id"))
+
+        created_search = not conn.scalar(text(
+            "SELECT 1 FROM sqlite_master WHERE name = 'products_fts'"
+        ))
+        conn.execute(text(PRODUCT_SEARCH_TABLE))
+        for trigger in PRODUCT_SEARCH_TRIGGERS:
+            conn.execute(text(trigger))
+        if created_search:
+            rebuild_search_index(conn)
+
+        for _, trigger in VERSION_TRIGGERS:
+            conn.execute(text(trigger))
+        conn.execute(text(SEED_TABLE_VERSIONS))
+
+        if added_count:
+            rebuild_product_counts(conn)
+
+    return create_missing_indexes(engine)
+
+
+def create_missing_indexes(engine):
+    """Crea los índices declarados en los modelos que aún no existen"""
+    created = []
+    with engine.connect() as conn:
+        # sqlite_master incluye los índices sobre expresiones (COLLATE),
+        # que la reflexión de SQLAlchemy omite
+        existing = set(conn.scalars(text(
+            "SELECT name FROM sqlite_master WHERE type = 'index'"
+        )))
+
+    for table in (Category.__table__, Product.__table__):
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            try:
+                with engine.begin() as conn:
+                    index.create(conn)
+                created.append(index.name)
+            except IntegrityError as e:
+                # Datos previos que violan un índice único (p. ej. nombres
+                # de categoría repetidos con distinta capitalización)
+                logger.warning("No se pudo crear el índice %s: %s",
+                               index.name, e.orig)
+
+    if created:
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+    return created
+
+
+def rebuild_product_counts(conn):
+    """Recalcula product_count y retorna cuántas categorías se corrigieron"""
+    result = conn.execute(text(
+        """
+        UPDATE categories SET product_count = (
+            SELECT COUNT(*) FROM products
+            WHERE products.category_id = categories.id
+        )
+        WHERE product_count IS NOT (
+            SELECT COUNT(*) FROM products
+            WHERE products.category_id = categories.id
+        )
+        """
+    ))
+    return result.rowcount
+
+
+def backfill_name_keys(conn):
+    """Calcula name_key de las categorías existentes (normalize_name() no
+    tiene equivalente en SQL)"""
+    rows = conn.execute(text("SELECT id, name FROM categories")).all()
+    if rows:
+        conn.execute(
+            text("UPDATE categories SET name_key = :key WHERE id = :id"),
+            [{'id': category_id, 'key': normalize_name(name)}
+             for category_id, name in rows]
+        )
+
+
+def rebuild_search_index(conn):
+    """Reconstruye el índice de texto completo a partir de products"""
+    conn.execute(text(
+        "INSERT INTO products_fts (products_fts) VALUES ('rebuild')"
+    ))
@@ -0,0 +1,12 @@
+from backend.models.category import db
+
+
+class TableVersion(db.Model):
+    """Contador de cambios por tabla, usado para calcular los ETag"""
+    __tablename__ = 'table_versions'
+
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<TableVersion {self.name}={self.version}>'
@@ -5,7 +5,10 @@ Uso: python run_project.py [comando]
 
 Comandos:
     setup       - Instalar dependencias
-    backend     - Ejecutar backend
+    backend     - Ejecutar backend (servidor de desarrollo)
+    serve       - Ejecutar backend en producción con varios procesos e hilos:
+                  serve [--workers N] [--threads N] [--bind host:puerto]
+                  [--async] (listados, búsqueda y exportación con asyncio)
     frontend    - Ejecutar frontend
     test        - Ejecutar todas las pruebas
     test-unit   - Ejecutar pruebas unitarias
@@ -14,9 +17,22 @@ Comandos:
     lint        - Ejecutar análisis estático
     coverage    - Generar reporte de cobertura
     ci          - Simular pipeline CI
+    db-upgrade  - Crear columnas, triggers e índices faltantes en la base
+    recount     - Recalcular el conteo de productos por categoría
+    import      - Importar productos: import <archivo> [--format csv|ndjson]
+                  [--chunk-size N] [--no-create-categories]
+    bench       - Medir servicios y controladores sobre un catálogo sembrado:
+                  bench [--size 1k|100k|1m] [--repeat N] [--only texto]
+                  [--output archivo] [--baseline archivo] [--threshold 0.25]
+    bench-concurrency - Comparar los modos síncrono y asíncrono con clientes
+                  lentos: bench-concurrency [--size 10k] [--url ruta]...
+                  [--concurrency N] [--requests N] [--threads N]
+                  [--delay ms] [--output archivo]
     help        - Mostrar esta ayuda
 """
 
+import argparse
+import json
 import sys
 import subprocess
 import os
@@ -50,6 +66,66 @@ def run_backend():
     run_command("python app.py", cwd="backend")
 
 
+def run_serve():
+    """Ejecutar backend con un servidor WSGI de producción"""
+    parser = argparse.ArgumentParser(prog='run_project.py serve')
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--threads', type=int)
+    parser.add_argument('--bind')
+    parser.add_argument('--async', dest='use_async', action='store_true')
+    args = parser.parse_args(sys.argv[2:])
+
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    bind = args.bind or os.environ.get('WEB_BIND', '0.0.0.0:5000')
+
+    if args.use_async:
+        return run_serve_async(root, bind, args.workers)
+
+    if os.name == 'nt':
+        # gunicorn requiere fork: en Windows un solo proceso con varios hilos
+        threads = args.threads or int(os.environ.get('WEB_THREADS', 8))
+        print(f"🚀 Iniciando waitress en {bind} con {threads} hilos")
+        return run_command(
+            f"waitress-serve --listen={bind} --threads={threads} "
+            f"backend.wsgi:app",
+            cwd=root
+        )
+
+    options = [f"--bind {bind}"]
+    if args.workers:
+        options.append(f"--workers {args.workers}")
+    if args.threads:
+        options.append(f"--threads {args.threads}")
+    print(f"🚀 Iniciando gunicorn en {bind}")
+    return run_command(
+        f"gunicorn --config gunicorn.conf.py {' '.join(options)} "
+        f"backend.wsgi:app",
+        cwd=root
+    )
+
+
+def run_serve_async(root, bind, workers):
+    """Ejecutar la aplicación ASGI (backend.asgi) con workers de uvicorn"""
+    if os.name == 'nt':
+        host, _, port = bind.rpartition(':')
+        option = f" --workers {workers}" if workers else ""
+        print(f"🚀 Iniciando uvicorn en {bind}")
+        return run_command(
+            f"uvicorn --factory backend.asgi:create_asgi_app "
+            f"--host {host} --port {port}{option}",
+            cwd=root
+        )
+
+    option = f" --workers {workers}" if workers else ""
+    print(f"🚀 Iniciando gunicorn (asíncrono) en {bind}")
+    return run_command(
+        f"gunicorn --config gunicorn.conf.py --bind {bind}{option} "
+        f"--worker-class uvicorn.workers.UvicornWorker "
+        f"'backend.asgi:create_asgi_app()'",
+        cwd=root
+    )
+
+
 def run_frontend():
     """Ejecutar frontend"""
     print("🌐 Iniciando frontend en http://localhost:3000")
@@ -130,6 +206,205 @@ def run_ci():
     return True
 
 
+def load_app(overrides=None):
+    """Crea la aplicación Flask para comandos que acceden a la base de datos"""
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    if root not in sys.path:
+        sys.path.insert(0, root)
+
+    from backend.app import create_app
+    return create_app(os.getenv('FLASK_ENV', 'development'), overrides)
+
+
+def run_db_upgrade():
+    """Actualizar el esquema de una base existente sin reconstruirla"""
+    print("🛠️  Actualizando esquema de la base de datos...")
+    # create_app aplica upgrade_schema: columnas, triggers e índices faltantes
+    app = load_app()
+    from backend.models.category import db
+
+    with app.app_context():
+        indexes = db.session.scalars(db.text(
+            "SELECT name FROM sqlite_master "
+            "WHERE type = 'index' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+        )).all()
+
+    print("✅ Esquema actualizado. Índices presentes:")
+    for name in indexes:
+        print(f"   - {name}")
+    return True
+
+
+def run_recount():
+    """Recalcular el conteo de productos por categoría"""
+    print("🔢 Recalculando conteo de productos por categoría...")
+    app = load_app()
+    from backend.services.category_service import CategoryService
+
+    with app.app_context():
+        fixed = CategoryService.rebuild_product_counts()
+
+    print(f"✅ Categorías corregidas: {fixed}")
+    return True
+
+
+def run_import():
+    """Importar productos desde un archivo con punto de control"""
+    parser = argparse.ArgumentParser(prog='run_project.py import')
+    parser.add_argument('file')
+    parser.add_argument('--format', choices=['csv', 'ndjson'])
+    parser.add_argument('--chunk-size', type=int)
+    parser.add_argument('--no-create-categories', action='store_true')
+    args = parser.parse_args(sys.argv[2:])
+
+    import_format = args.format or args.file.rsplit('.', 1)[-1].lower()
+    if import_format not in ('csv', 'ndjson'):
+        print("❌ Formato no soportado, usa --format csv|ndjson")
+        return False
+
+    checkpoint_path = f"{args.file}.checkpoint"
+    resume_from = 0
+    if os.path.exists(checkpoint_path):
+        with open(checkpoint_path) as checkpoint_file:
+            resume_from = json.load(checkpoint_file)['row']
+        print(f"↩️  Reanudando después de la fila {resume_from}")
+
+    def save_checkpoint(row):
+        with open(checkpoint_path, 'w') as checkpoint_file:
+            json.dump({'row': row}, checkpoint_file)
+
+    print(f"📥 Importando {args.file}...")
+    app = load_app()
+    from backend.services.import_service import ImportService
+
+    with app.app_context(), open(args.file, 'rb') as stream:
+        result = ImportService.import_products(
+            ImportService.iter_records(stream, import_format),
+            chunk_size=args.chunk_size or app.config['IMPORT_CHUNK_SIZE'],
+            resume_from=resume_from,
+            create_categories=not args.no_create_categories,
+            max_errors=app.config['IMPORT_MAX_ERRORS'],
+            on_checkpoint=save_checkpoint
+        )
+
+    for error in result['errors']:
+        print(f"  Fila {error['row']}: {error['error']}")
+    print(f"Procesadas: {result['processed']}  "
+          f"Importadas: {result['imported']}  "
+          f"Con error: {result['error_count']}")
+
+    if 'interrupted' in result:
+        print(f"❌ Importación interrumpida: {result['interrupted']}")
+        print(f"   Ejecuta de nuevo el comando para reanudar desde la fila "
+              f"{result['checkpoint']}")
+        return False
+
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    print("✅ Importación completada")
+    return True
+
+
+def run_bench():
+    """Ejecutar los benchmarks y comparar contra una línea base"""
+    parser = argparse.ArgumentParser(prog='run_project.py bench')
+    parser.add_argument('--size', default='1k')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--only')
+    parser.add_argument('--output')
+    parser.add_argument('--baseline')
+    parser.add_argument('--threshold', type=float, default=0.25)
+    args = parser.parse_args(sys.argv[2:])
+
+    size = args.size.lower()
+    print(f"⏱️  Ejecutando benchmarks con un catálogo de {size}...")
+    # Cada tamaño usa su propia base para no volver a sembrarla
+    app = load_app({
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///bench_{size}.db'
+    })
+    from tests.benchmarks.runner import compare, load_results, \
+        run_benchmarks, save_results
+
+    try:
+        results = run_benchmarks(app, size, repeat=args.repeat,
+                                 only=args.only)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return False
+
+    output = args.output or os.path.join(app.instance_path,
+                                         f'bench_{size}.json')
+    save_results(output, results)
+    print(f"📄 Resultados guardados en {output}")
+
+    if not args.baseline:
+        return True
+
+    regressions = compare(results, load_results(args.baseline),
+                          args.threshold)
+    if regressions:
+        print(f"❌ Regresiones mayores al {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"   - {regression['name']}: "
+                  f"{regression['baseline_ms']:.3f} ms → "
+                  f"{regression['current_ms']:.3f} ms "
+                  f"(x{regression['ratio']})")
+        return False
+
+    print("✅ Sin regresiones respecto a la línea base")
+    return True
+
+
+def run_bench_concurrency():
+    """Comparar los modos síncrono y asíncrono con muchos clientes lentos"""
+    parser = argparse.ArgumentParser(prog='run_project.py bench-concurrency')
+    parser.add_argument('--size', default='10k')
+    # Una ruta asíncrona y una delegada en Flask (pool de hilos de AsyncApp)
+    parser.add_argument('--url', action='append', dest='urls')
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--threads', type=int,
+                        default=int(os.environ.get('WEB_THREADS', 4)))
+    parser.add_argument('--delay', type=float, default=50)
+    parser.add_argument('--output')
+    args = parser.parse_args(sys.argv[2:])
+
+    size = args.size.lower()
+    urls = args.urls or ['/api/products?limit=50', '/api/products/1']
+    print(f"⏱️  Comparando modos con {args.concurrency} clientes sobre "
+          f"{', '.join(urls)} ({size} productos)...")
+    app = load_app({
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///bench_{size}.db'
+    })
+    from backend.asgi import AsyncApp
+    from backend.async_database import init_async_database
+    from tests.benchmarks.concurrency import run_concurrency
+    from tests.benchmarks.runner import save_results
+    from tests.benchmarks.seed import parse_size, seed_catalog
+
+    try:
+        products = parse_size(size)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return False
+    with app.app_context():
+        if seed_catalog(products):
+            print(f"Catálogo sembrado con {products} productos")
+
+    init_async_database(app)
+    results = run_concurrency(AsyncApp(app, threads=args.threads), urls,
+                              concurrency=args.concurrency,
+                              requests=args.requests, threads=args.threads,
+                              delay=args.delay / 1000)
+    results['size'] = products
+
+    output = args.output or os.path.join(app.instance_path,
+                                         f'bench_concurrency_{size}.json')
+    save_results(output, results)
+    print(f"📄 Resultados guardados en {output}")
+    return True
+
+
 def show_help():
     """Mostrar ayuda"""
     print(__doc__)
@@ -146,6 +421,7 @@ def main():
     commands = {
         'setup': setup,
         'backend': run_backend,
+        'serve': run_serve,
         'frontend': run_frontend,
         'test': run_tests,
         'test-unit': run_unit_tests,
@@ -154,11 +430,18 @@ def main():
         'lint': run_lint,
         'coverage': run_coverage,
         'ci': run_ci,
+        'db-upgrade': run_db_upgrade,
+        'recount': run_recount,
+        'import': run_import,
+        'bench': run_bench,
+        'bench-concurrency': run_bench_concurrency,
         'help': show_help,
     }
 
     if command in commands:
-        commands[command]()
+        # Código de salida distinto de cero para que CI detecte el fallo
+        if commands[command]() is False:
+            sys.exit(1)
     else:
         print(f"❌ Comando desconocido: {command}")
         show_help()
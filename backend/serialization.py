@@ -0,0 +1,60 @@
+"""Proveedor JSON de la aplicación: orjson si está instalado, si no stdlib"""
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Serializa con orjson; delega en stdlib si se piden opciones propias"""
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self._encode(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._encode(obj),
+                                        mimetype=self.mimetype)
+
+    def _encode(self, obj):
+        """Bytes JSON; los tipos no nativos pasan por el default de Flask"""
+        return orjson.dumps(obj, default=self.default,
+                            option=orjson.OPT_NON_STR_KEYS)
+
+
+def rows_to_dicts(rows, fields=None):
+    """Convierte filas de columnas en diccionarios resolviendo las claves una
+    sola vez (Row._asdict() las recalcula en cada fila)
+
+    Con `fields` solo se incluyen esas claves, aunque la fila traiga más
+    columnas (por ejemplo las del cursor).
+    """
+    if not rows:
+        return []
+    keys = rows[0]._fields
+    if fields is None:
+        return [dict(zip(keys, row)) for row in rows]
+    positions = [(field, keys.index(field)) for field in fields]
+    return [{field: row[index] for field, index in positions}
+            for row in rows]
+
+
+def init_json(app):
+    """Selecciona el proveedor JSON según JSON_BACKEND (auto, orjson, std)"""
+    backend = app.config['JSON_BACKEND']
+    if backend not in ('auto', 'orjson', 'std'):
+        raise ValueError(f"JSON_BACKEND no soportado: {backend}")
+    if backend == 'orjson' and orjson is None:
+        raise ValueError("JSON_BACKEND=orjson requiere instalar orjson")
+
+    if backend != 'std' and orjson is not None:
+        app.json = OrjsonProvider(app)
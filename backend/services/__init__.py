@@ -1,5 +1,13 @@
 """Servicios de lógica de negocio"""
+from backend.services.autocomplete_service import AutocompleteService
 from backend.services.category_service import CategoryService
+from backend.services.export_service import ExportService
+from backend.services.idempotency_service import IdempotencyService
+from backend.services.import_service import ImportService
 from backend.services.product_service import ProductService
+from backend.services.stats_service import StatsService
+from backend.services.version_service import VersionService
 
-__all__ = ['CategoryService', 'ProductService']
\ No newline at end of file
+__all__ = ['AutocompleteService', 'CategoryService', 'ExportService',
+           'IdempotencyService', 'ImportService', 'ProductService',
+           'StatsService', 'VersionService']
\ No newline at end of file
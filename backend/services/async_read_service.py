@@ -0,0 +1,106 @@
+from sqlalchemy import select
+
+from backend.async_database import async_engine
+from backend.models.category import Category
+from backend.models.product import Product
+from backend.services.category_service import CategoryService
+from backend.services.export_service import EXPORT_COLUMNS, EXPORT_FORMATS, \
+    ExportService
+from backend.services.pagination import build_page
+from backend.services.product_service import ProductService
+from backend.services.version_service import VersionService
+
+
+class AsyncReadService:
+    """Consultas de solo lectura sobre el motor asíncrono
+
+    Reutiliza las consultas de los servicios síncronos: solo cambia cómo se
+    ejecutan, de modo que ambos modos devuelven exactamente lo mismo.
+    """
+
+    @staticmethod
+    async def get_versions(tables):
+        """Retorna {tabla: versión} con una única consulta"""
+        async with async_engine().connect() as conn:
+            result = await conn.execute(VersionService.versions_query(tables))
+            return dict(result.all())
+
+    @staticmethod
+    async def get_products_page(category_id=None, **filters):
+        """Obtiene una página de productos filtrada y ordenada"""
+        statement, limit, key = ProductService.products_page_query(
+            category_id=category_id, **filters
+        )
+        async with async_engine().connect() as conn:
+            if category_id:
+                await AsyncReadService._ensure_category_exists(conn,
+                                                               category_id)
+            rows = (await conn.execute(statement)).all()
+        return build_page(rows, limit, key=key)
+
+    @staticmethod
+    async def _ensure_category_exists(conn, category_id):
+        """Valida que la categoría exista"""
+        found = await conn.scalar(
+            select(Category.id).where(Category.id == category_id)
+        )
+        if found is None:
+            raise ValueError("Categoría no encontrada")
+
+    @staticmethod
+    async def search_products(query, limit=None, after=None, fields=None):
+        """Busca productos por nombre y descripción ordenados por relevancia"""
+        statement, limit, key = ProductService.search_query(query, limit,
+                                                            after, fields)
+        async with async_engine().connect() as conn:
+            rows = (await conn.execute(statement)).all()
+        return build_page(rows, limit, key=key)
+
+    @staticmethod
+    async def get_categories_page(limit=None, after=None, fields=None):
+        """Obtiene una página de categorías ordenada por ID"""
+        statement, limit, key = CategoryService.categories_page_query(
+            limit, after, fields
+        )
+        async with async_engine().connect() as conn:
+            rows = (await conn.execute(statement)).all()
+        return build_page(rows, limit, key=key)
+
+    @staticmethod
+    def export_products(export_format, batch_size, category_id=None):
+        """Valida el formato y retorna el generador asíncrono y su tipo"""
+        export_format = ExportService.resolve_format(export_format)
+
+        async def chunks():
+            if export_format == 'csv':
+                yield ExportService.csv_chunk([EXPORT_COLUMNS])
+            async for rows in AsyncReadService.iter_product_batches(
+                    batch_size, category_id):
+                if export_format == 'csv':
+                    yield ExportService.csv_chunk(rows)
+                else:
+                    yield ExportService.ndjson_chunk(rows)
+
+        return chunks(), EXPORT_FORMATS[export_format]
+
+    @staticmethod
+    async def iter_product_batches(batch_size, category_id=None):
+        """Lee los productos por lotes con consultas keyset sobre el ID
+
+        La conexión se devuelve al pool entre lotes: un cliente lento solo
+        retiene una corrutina, no una conexión.
+        """
+        statement = ExportService.product_batches_query(batch_size,
+                                                        category_id)
+        last_id = 0
+        while True:
+            async with async_engine().connect() as conn:
+                rows = (await conn.execute(
+                    statement.where(Product.id > last_id)
+                )).all()
+            if not rows:
+                return
+            yield rows
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1].id
@@ -0,0 +1,49 @@
+from flask import current_app
+from sqlalchemy import select
+
+from backend.cache import autocomplete_index
+from backend.models.category import Category, db
+from backend.models.product import Product
+
+AUTOCOMPLETE_SOURCES = {'products': Product, 'categories': Category}
+
+
+class AutocompleteService:
+    """Servicio de sugerencias por prefijo servidas desde memoria"""
+
+    MAX_LIMIT = 50
+
+    @staticmethod
+    def suggest(prefix, kind='products', limit=None):
+        """Retorna nombres que empiezan por el prefijo dado"""
+        if kind not in AUTOCOMPLETE_SOURCES:
+            raise ValueError("Tipo de autocompletado no soportado")
+
+        if limit is None or limit == '':
+            limit = current_app.config['AUTOCOMPLETE_LIMIT']
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            raise ValueError("El límite debe ser un valor numérico")
+        if limit < 1:
+            raise ValueError("El límite debe ser un valor positivo")
+        limit = min(limit, AutocompleteService.MAX_LIMIT)
+
+        if not prefix or not prefix.strip():
+            return []
+
+        index = autocomplete_index(kind)
+        if index.stale:
+            AutocompleteService.rebuild(kind)
+        return index.search(prefix, limit)
+
+    @staticmethod
+    def rebuild(kind):
+        """Carga el índice desde la base, con los registros más recientes"""
+        model = AUTOCOMPLETE_SOURCES[kind]
+        index = autocomplete_index(kind)
+        index.load(db.session.execute(
+            select(model.id, model.name)
+            .order_by(model.id.desc())
+            .limit(index.max_entries)
+        ))
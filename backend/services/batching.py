@@ -0,0 +1,27 @@
+from itertools import islice
+
+# Parámetros por sentencia en los IN (bajo el límite de variables de SQLite)
+IN_CLAUSE_CHUNK = 500
+
+
+def chunked(items, size):
+    """Divide un iterable en listas de tamaño fijo"""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def parse_id(value, message):
+    """Convierte un identificador a int positivo o lanza ValueError"""
+    if isinstance(value, bool):
+        raise ValueError(message)
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(message)
+    if value < 1:
+        raise ValueError(message)
+    return value
@@ -1,4 +1,18 @@
+from backend.cache import autocomplete_index, category_cache, \
+    normalize_name
 from backend.models.category import Category, db
+from backend.models.schema import rebuild_product_counts
+from backend.services.batching import IN_CLAUSE_CHUNK, chunked
+from backend.services.pagination import build_page, decode_id_cursor, \
+    resolve_limit
+from backend.write_queue import run_write
+
+# Columnas de los listados, en el mismo orden que Category.to_dict()
+CATEGORY_FIELDS = {
+    'id': Category.id,
+    'name': Category.name,
+    'product_count': Category.product_count,
+}
 
 
 class CategoryService:
@@ -10,20 +24,82 @@ class CategoryService:
         if not name or name.strip() == '':
             raise ValueError("El nombre de la categoría es requerido")
 
-        existing = Category.query.filter_by(name=name).first()
-        if existing:
-            raise ValueError("Ya existe una categoría con ese nombre")
+        def create():
+            existing = CategoryService._find_by_name(name.strip()).first()
+            if existing:
+                raise ValueError("Ya existe una categoría con ese nombre")
 
-        category = Category(name=name.strip())
-        db.session.add(category)
-        db.session.commit()
-        return category
+            category = Category(name=name.strip())
+            db.session.add(category)
+            return category
+
+        # Otra petición pudo crear el mismo nombre tras la comprobación: el
+        # índice único lo rechaza al confirmar
+        return run_write(create, CategoryService._after_save,
+                         integrity_error="Ya existe una categoría con ese "
+                                         "nombre")
+
+    @staticmethod
+    def _after_save(category):
+        """Actualiza la caché y el autocompletado tras confirmar el cambio"""
+        category_cache().set(category.id, category.name)
+        autocomplete_index('categories').add(category.id, category.name)
+
+    @staticmethod
+    def _find_by_name(name):
+        """Busca por nombre sin distinguir mayúsculas ni tildes (usa el índice
+        único de name_key)"""
+        return Category.query.filter(Category.name_key == normalize_name(name))
 
     @staticmethod
     def get_all_categories():
         """Obtiene todas las categorías"""
         return Category.query.all()
 
+    @staticmethod
+    def get_categories_page(limit=None, after=None, fields=None):
+        """Obtiene una página de categorías ordenada por ID, como filas"""
+        statement, limit, key = CategoryService.categories_page_query(
+            limit, after, fields
+        )
+        rows = db.session.execute(statement).all()
+        return build_page(rows, limit, key=key)
+
+    @staticmethod
+    def categories_page_query(limit=None, after=None, fields=None):
+        """Construye la consulta de una página de categorías; retorna
+        consulta, límite y clave del cursor"""
+        limit = resolve_limit(limit)
+        query = CategoryService._select_rows(fields)
+
+        if after:
+            last_id = decode_id_cursor(after)
+            query = query.where(Category.id > last_id)
+
+        return (query.order_by(Category.id).limit(limit + 1), limit,
+                lambda row: [row.id])
+
+    @staticmethod
+    def _select_rows(fields=None):
+        """SELECT de las columnas pedidas; el ID siempre (es el cursor)"""
+        if fields is None:
+            fields = CATEGORY_FIELDS
+        elif 'id' not in fields:
+            fields = ('id',) + tuple(fields)
+        return db.select(*(CATEGORY_FIELDS[f] for f in fields))
+
+    @staticmethod
+    def get_category_fields(category_id, fields):
+        """Obtiene solo las columnas pedidas de una categoría, como fila"""
+        row = db.session.execute(
+            CategoryService._select_rows(fields).where(
+                Category.id == category_id
+            )
+        ).first()
+        if row is None:
+            raise ValueError("Categoría no encontrada")
+        return row
+
     @staticmethod
     def get_category_by_id(category_id):
         """Obtiene una categoría por su ID"""
@@ -32,36 +108,81 @@ class CategoryService:
             raise ValueError("Categoría no encontrada")
         return category
 
+    @staticmethod
+    def ensure_category_exists(category_id):
+        """Valida que la categoría exista consultando primero la caché
+
+        La caché es por proceso y puede conservar una categoría eliminada
+        desde otro worker: la clave foránea de products es la que garantiza
+        la integridad y run_write() convierte su error en ValueError.
+        """
+        if category_cache().get(category_id) is None:
+            category = CategoryService.get_category_by_id(category_id)
+            category_cache().set(category.id, category.name)
+
+    @staticmethod
+    def get_existing_ids(category_ids):
+        """Retorna el subconjunto de IDs que existen, con consultas IN
+
+        Se consulta la base y no la caché: las operaciones en bloque reportan
+        el error por elemento antes de escribir.
+        """
+        existing = set()
+        for chunk in chunked(set(category_ids), IN_CLAUSE_CHUNK):
+            existing.update(db.session.scalars(
+                db.select(Category.id).where(Category.id.in_(chunk))
+            ))
+        return existing
+
     @staticmethod
     def update_category(category_id, name):
         """Actualiza una categoría"""
-        category = CategoryService.get_category_by_id(category_id)
+        def update():
+            category = CategoryService.get_category_by_id(category_id)
 
-        if not name or name.strip() == '':
-            raise ValueError("El nombre de la categoría es requerido")
+            if not name or name.strip() == '':
+                raise ValueError("El nombre de la categoría es requerido")
 
-        existing = Category.query.filter(
-            Category.name == name,
-            Category.id != category_id
-        ).first()
+            existing = CategoryService._find_by_name(name.strip()).filter(
+                Category.id != category_id
+            ).first()
 
-        if existing:
-            raise ValueError("Ya existe otra categoría con ese nombre")
+            if existing:
+                raise ValueError("Ya existe otra categoría con ese nombre")
 
-        category.name = name.strip()
-        db.session.commit()
-        return category
+            category.name = name.strip()
+            return category
+
+        return run_write(update, CategoryService._after_save,
+                         integrity_error="Ya existe otra categoría con ese "
+                                         "nombre")
 
     @staticmethod
     def delete_category(category_id):
         """Elimina una categoría"""
-        category = CategoryService.get_category_by_id(category_id)
+        def delete():
+            category = CategoryService.get_category_by_id(category_id)
 
-        if len(category.products) > 0:
-            raise ValueError(
-                "No se puede eliminar una categoría con productos asociados"
-            )
+            if category.product_count > 0:
+                raise ValueError(
+                    "No se puede eliminar una categoría con productos "
+                    "asociados"
+                )
 
-        db.session.delete(category)
+            db.session.delete(category)
+            return True
+
+        def after_commit(_):
+            category_cache().delete(category_id)
+            autocomplete_index('categories').remove(category_id)
+
+        return run_write(delete, after_commit, integrity_error=(
+            "No se puede eliminar una categoría con productos asociados"
+        ))
+
+    @staticmethod
+    def rebuild_product_counts():
+        """Recalcula product_count desde la tabla de productos"""
+        fixed = rebuild_product_counts(db.session.connection())
         db.session.commit()
-        return True
\ No newline at end of file
+        return fixed
\ No newline at end of file
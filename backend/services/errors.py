@@ -0,0 +1,2 @@
+class NotFoundError(ValueError):
+    """El recurso pedido no existe (404 en los endpoints de un elemento)"""
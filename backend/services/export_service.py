@@ -0,0 +1,97 @@
+import csv
+import io
+
+from flask import current_app
+from sqlalchemy import select
+
+from backend.models.category import Category, db
+from backend.models.product import Product
+
+EXPORT_COLUMNS = ['id', 'name', 'description', 'price', 'stock',
+                  'category_id', 'category_name']
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+class ExportService:
+    """Servicio para exportar el catálogo sin cargarlo completo en memoria"""
+
+    @staticmethod
+    def export_products(export_format, batch_size, category_id=None):
+        """Valida el formato y retorna el generador y su tipo de contenido"""
+        export_format = ExportService.resolve_format(export_format)
+        batches = ExportService.iter_product_batches(batch_size, category_id)
+        if export_format == 'csv':
+            chunks = ExportService._iter_csv(batches)
+        else:
+            chunks = ExportService._iter_ndjson(batches)
+        return chunks, EXPORT_FORMATS[export_format]
+
+    @staticmethod
+    def resolve_format(export_format):
+        """Valida el formato pedido (ndjson por defecto)"""
+        export_format = (export_format or 'ndjson').lower()
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError("Formato de exportación no soportado")
+        return export_format
+
+    @staticmethod
+    def product_batches_query(batch_size, category_id=None):
+        """Consulta de un lote; se continúa con .where(Product.id > último)"""
+        statement = select(
+            Product.id, Product.name, Product.description, Product.price,
+            Product.stock, Product.category_id,
+            Category.name.label('category_name')
+        ).outerjoin(
+            Category, Product.category_id == Category.id
+        ).order_by(Product.id).limit(batch_size)
+
+        if category_id:
+            statement = statement.where(Product.category_id == category_id)
+        return statement
+
+    @staticmethod
+    def iter_product_batches(batch_size, category_id=None):
+        """Lee los productos por lotes con consultas keyset sobre el ID"""
+        statement = ExportService.product_batches_query(batch_size,
+                                                        category_id)
+        last_id = 0
+        while True:
+            rows = db.session.execute(
+                statement.where(Product.id > last_id)
+            ).all()
+            if not rows:
+                return
+            yield rows
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1].id
+
+    @staticmethod
+    def _iter_ndjson(batches):
+        """Genera el catálogo como JSON delimitado por saltos de línea"""
+        for rows in batches:
+            yield ExportService.ndjson_chunk(rows)
+
+    @staticmethod
+    def _iter_csv(batches):
+        """Genera el catálogo como CSV con encabezado"""
+        yield ExportService.csv_chunk([EXPORT_COLUMNS])
+        for rows in batches:
+            yield ExportService.csv_chunk(rows)
+
+    @staticmethod
+    def ndjson_chunk(rows):
+        """Un lote de filas como líneas JSON"""
+        dumps = current_app.json.dumps
+        return ''.join(dumps(dict(row._mapping)) + '\n' for row in rows)
+
+    @staticmethod
+    def csv_chunk(rows):
+        """Un lote de filas como líneas CSV"""
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
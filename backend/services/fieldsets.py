@@ -0,0 +1,17 @@
+def resolve_fields(fields, allowed):
+    """Valida el parámetro fields (lista separada por comas)
+
+    Retorna los campos en el orden de `allowed`, o None si no se pidió una
+    selección (se responden todos los campos).
+    """
+    if fields is None or fields.strip() == '':
+        return None
+
+    requested = {field.strip() for field in fields.split(',')} - {''}
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise ValueError(
+            "Campos no válidos: " + ', '.join(sorted(unknown)) +
+            ". Permitidos: " + ', '.join(allowed)
+        )
+    return tuple(field for field in allowed if field in requested)
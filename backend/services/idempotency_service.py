@@ -0,0 +1,177 @@
+import time
+
+from flask import current_app, g
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+
+from backend.models.category import db
+from backend.models.idempotency_key import IdempotencyKey
+from backend.write_queue import run_write
+
+# Largo máximo aceptado para el encabezado Idempotency-Key
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyConflict(Exception):
+    """Otra petición con la misma Idempotency-Key confirmó primero"""
+
+
+class Reservation:
+    """Reserva pendiente de una Idempotency-Key
+
+    No se confirma por separado: run_write la inserta en la misma
+    transacción (o SAVEPOINT de la cola) que la escritura de la petición, de
+    modo que la escritura y su reserva se confirman o revierten juntas.
+    """
+
+    def __init__(self, key, fingerprint, created_at, abandoned_at=None):
+        self.key = key
+        self.fingerprint = fingerprint
+        self.created_at = created_at
+        # created_at de una reserva abandonada que hay que reemplazar
+        self.abandoned_at = abandoned_at
+        self.claimed = False
+        self.conflict = False
+
+    def bind(self, operation):
+        """Envuelve la primera escritura de la petición para que inserte la
+        reserva antes de ejecutarse; las siguientes quedan igual"""
+        if self.claimed:
+            return operation
+        self.claimed = True
+
+        def reserved():
+            self._insert()
+            return operation()
+        return reserved
+
+    def _insert(self):
+        """Inserta la fila en curso; corre en la sesión que hace la
+        escritura (la de la petición o la del hilo escritor)"""
+        if self.abandoned_at is not None:
+            db.session.execute(delete(IdempotencyKey).where(
+                IdempotencyKey.key == self.key,
+                IdempotencyKey.created_at == self.abandoned_at
+            ))
+        db.session.add(IdempotencyKey(key=self.key,
+                                      fingerprint=self.fingerprint,
+                                      created_at=self.created_at))
+        try:
+            # Se detecta aquí, antes de escribir nada más
+            db.session.flush()
+        except IntegrityError:
+            self.conflict = True
+            raise IdempotencyConflict(
+                "Otra petición con la misma Idempotency-Key confirmó primero"
+            ) from None
+
+
+class IdempotencyService:
+    """Servicio para reservar claves de idempotencia y guardar respuestas"""
+
+    @staticmethod
+    def reserve(key, fingerprint):
+        """Prepara la reserva de la clave para esta petición
+
+        Retorna None si la clave está libre (la reserva queda pendiente en
+        g.idempotency hasta la escritura), o la fila existente (con la
+        respuesta guardada o aún en curso) si otra petición ya la usó.
+        """
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise ValueError(
+                "Idempotency-Key debe tener entre 1 y "
+                f"{MAX_KEY_LENGTH} caracteres"
+            )
+
+        now = time.time()
+        IdempotencyService._purge_if_due(now)
+
+        existing = db.session.get(IdempotencyKey, key)
+        abandoned_at = None
+        if existing is not None:
+            if not IdempotencyService._is_abandoned(existing, now):
+                return existing
+            abandoned_at = existing.created_at
+
+        g.idempotency = Reservation(key, fingerprint, now, abandoned_at)
+        return None
+
+    @staticmethod
+    def find(key):
+        """Retorna la fila guardada de la clave, leída de nuevo"""
+        db.session.rollback()
+        return db.session.get(IdempotencyKey, key)
+
+    @staticmethod
+    def _is_abandoned(entry, now):
+        """Vencida, o en curso por más tiempo que IDEMPOTENCY_LOCK_TIMEOUT
+        (el proceso que la reservó terminó sin guardar la respuesta)"""
+        config = current_app.config
+        age = now - entry.created_at
+        if entry.status_code is None:
+            return age > config['IDEMPOTENCY_LOCK_TIMEOUT']
+        return age > config['IDEMPOTENCY_TTL']
+
+    @staticmethod
+    def save_response(status_code, body):
+        """Guarda la respuesta que se repetirá ante reintentos
+
+        Completa la reserva confirmada junto con la escritura o, si la
+        petición no escribió nada (p. ej. un 400 de validación) o la
+        escritura se revirtió, la inserta ya con la respuesta. Pasa por run_write para agruparse con las
+        demás escrituras cuando la cola está activa.
+        """
+        reservation = g.idempotency
+
+        def save():
+            entry = db.session.get(IdempotencyKey, reservation.key)
+            if entry is None:
+                # La escritura se revirtió junto con su reserva
+                entry = IdempotencyKey(key=reservation.key,
+                                       fingerprint=reservation.fingerprint,
+                                       created_at=reservation.created_at)
+                db.session.add(entry)
+            elif entry.created_at != reservation.created_at:
+                # Reserva de otra petición
+                return
+            entry.status_code = status_code
+            entry.body = body
+
+        try:
+            run_write(save)
+        except (IdempotencyConflict, IntegrityError):
+            # Otra petición con la clave se ejecutó mientras tanto
+            pass
+
+    @staticmethod
+    def release():
+        """Libera la reserva para que un reintento vuelva a ejecutarse"""
+        reservation = g.idempotency
+        db.session.rollback()
+        if not reservation.claimed:
+            # No llegó a escribirse
+            return
+        run_write(lambda: db.session.execute(delete(IdempotencyKey).where(
+            IdempotencyKey.key == reservation.key,
+            IdempotencyKey.created_at == reservation.created_at
+        )))
+
+    @staticmethod
+    def _purge_if_due(now):
+        """Elimina las claves vencidas como mucho una vez por intervalo"""
+        config = current_app.config
+        state = current_app.extensions.setdefault('idempotency',
+                                                  {'purged_at': 0})
+        if now - state['purged_at'] < config['IDEMPOTENCY_PURGE_INTERVAL']:
+            return
+        state['purged_at'] = now
+        IdempotencyService.purge_expired(now)
+
+    @staticmethod
+    def purge_expired(now=None):
+        """Elimina las respuestas guardadas más antiguas que el TTL"""
+        now = time.time() if now is None else now
+        cutoff = now - current_app.config['IDEMPOTENCY_TTL']
+        return run_write(lambda: db.session.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.created_at < cutoff)
+        ).rowcount)
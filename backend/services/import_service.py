@@ -0,0 +1,162 @@
+import csv
+import io
+import json
+
+from sqlalchemy import insert, select
+
+from backend.cache import autocomplete_index, normalize_name
+from backend.models.category import Category, db
+from backend.models.product import Product
+from backend.services.batching import parse_id
+from backend.services.product_service import ProductService
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+
+
+class ImportService:
+    """Servicio para importar productos desde archivos CSV o NDJSON"""
+
+    @staticmethod
+    def iter_records(stream, import_format):
+        """Lee el archivo fila a fila y retorna (número de fila, registro)"""
+        if import_format not in IMPORT_FORMATS:
+            raise ValueError("Formato de importación no soportado")
+        return ImportService._read_records(stream, import_format)
+
+    @staticmethod
+    def _read_records(stream, import_format):
+        """Generador de registros a partir de un flujo binario"""
+        text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+        if import_format == 'csv':
+            for row_number, record in enumerate(csv.DictReader(text), 1):
+                yield row_number, record
+            return
+
+        row_number = 0
+        for line in text:
+            if not line.strip():
+                continue
+            row_number += 1
+            try:
+                yield row_number, json.loads(line)
+            except ValueError:
+                yield row_number, ValueError("JSON inválido")
+
+    @staticmethod
+    def import_products(records, chunk_size, resume_from=0,
+                        create_categories=True, max_errors=1000,
+                        on_checkpoint=None):
+        """Importa registros en bloques con commit y punto de control"""
+        categories = CategoryResolver()
+        pending = []
+        result = {
+            'processed': 0,
+            'imported': 0,
+            'error_count': 0,
+            'errors': [],
+            'checkpoint': resume_from
+        }
+
+        def commit(row_number):
+            if pending:
+                db.session.execute(insert(Product), pending)
+            db.session.commit()
+            result['imported'] += len(pending)
+            result['checkpoint'] = row_number
+            pending.clear()
+            if on_checkpoint:
+                on_checkpoint(row_number)
+
+        row_number = resume_from
+        try:
+            for row_number, record in records:
+                if row_number <= resume_from:
+                    continue
+
+                result['processed'] += 1
+                try:
+                    pending.append(ImportService._prepare_row(
+                        record, categories, create_categories
+                    ))
+                except ValueError as e:
+                    result['error_count'] += 1
+                    if len(result['errors']) < max_errors:
+                        result['errors'].append({'row': row_number,
+                                                 'error': str(e)})
+
+                if len(pending) >= chunk_size:
+                    commit(row_number)
+
+            if row_number > result['checkpoint']:
+                commit(row_number)
+        except Exception as e:
+            # El punto de control queda en el último bloque confirmado
+            db.session.rollback()
+            result['interrupted'] = str(e)
+
+        # Las filas se insertan sin RETURNING: se recarga bajo demanda
+        autocomplete_index('products').invalidate()
+        autocomplete_index('categories').invalidate()
+        return result
+
+    @staticmethod
+    def _prepare_row(record, categories, create_categories):
+        """Valida un registro y resuelve su categoría"""
+        if isinstance(record, Exception):
+            raise ValueError(str(record))
+        if not isinstance(record, dict):
+            raise ValueError("Cada registro debe ser un objeto")
+
+        row = ProductService.validate_product_data(
+            record.get('name'), record.get('price'), record.get('stock'),
+            record.get('description')
+        )
+
+        category_name = record.get('category_name') or record.get('category')
+        if category_name and str(category_name).strip():
+            row['category_id'] = categories.by_name(
+                str(category_name).strip(), create_categories
+            )
+        else:
+            row['category_id'] = categories.by_id(record.get('category_id'))
+
+        return row
+
+
+class CategoryResolver:
+    """Mapa en memoria de categorías usado durante una importación"""
+
+    def __init__(self):
+        self.names = {}
+        self.ids = set()
+
+    def by_name(self, name, create):
+        """Resuelve una categoría por nombre (sin distinguir mayúsculas ni
+        tildes) y la crea si se permite"""
+        key = normalize_name(name)
+        if key in self.names:
+            return self.names[key]
+
+        category_id = db.session.scalar(
+            select(Category.id).where(Category.name_key == key)
+        )
+        if category_id is None:
+            if not create:
+                raise ValueError("Categoría no encontrada")
+            category_id = db.session.scalar(
+                insert(Category).values(name=name).returning(Category.id)
+            )
+
+        self.names[key] = category_id
+        self.ids.add(category_id)
+        return category_id
+
+    def by_id(self, category_id):
+        """Valida que exista la categoría indicada por ID"""
+        category_id = parse_id(category_id, "Categoría no encontrada")
+        if category_id not in self.ids:
+            if db.session.get(Category, category_id) is None:
+                raise ValueError("Categoría no encontrada")
+            self.ids.add(category_id)
+        return category_id
@@ -0,0 +1,57 @@
+import base64
+import binascii
+import json
+
+from flask import current_app
+
+
+def resolve_limit(limit):
+    """Valida el tamaño de página y aplica el valor por defecto y el tope"""
+    if limit is None or limit == '':
+        return current_app.config['PAGE_SIZE_DEFAULT']
+
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise ValueError("El límite debe ser un valor numérico")
+
+    if limit < 1:
+        raise ValueError("El límite debe ser un valor positivo")
+
+    return min(limit, current_app.config['PAGE_SIZE_MAX'])
+
+
+def encode_cursor(values):
+    """Codifica la clave de orden del último elemento en un cursor opaco"""
+    raw = json.dumps(values, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, size=1):
+    """Decodifica un cursor y valida la cantidad de claves de orden"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError("Cursor de paginación inválido")
+
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Cursor de paginación inválido")
+
+    return values
+
+
+def decode_id_cursor(cursor):
+    """Decodifica un cursor cuya única clave de orden es el ID"""
+    last_id = decode_cursor(cursor)[0]
+    if not isinstance(last_id, int):
+        raise ValueError("Cursor de paginación inválido")
+    return last_id
+
+
+def build_page(rows, limit, key):
+    """Recorta la consulta de limit + 1 filas y calcula el siguiente cursor"""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(key(rows[-1]))
@@ -1,14 +1,49 @@
+import re
+
+from flask import current_app
+from sqlalchemy import and_, delete, insert, or_, select, text, update
+from sqlalchemy.orm import joinedload
+
+from backend.cache import autocomplete_index
 from backend.models.product import Product
-from backend.models.category import db
+from backend.models.category import Category, db
+from backend.services.batching import IN_CLAUSE_CHUNK, chunked, parse_id
 from backend.services.category_service import CategoryService
+from backend.services.errors import NotFoundError
+from backend.services.pagination import build_page, decode_cursor, \
+    resolve_limit
+from backend.write_queue import claim_reservation, run_write
+
+# Palabras consideradas de una búsqueda de texto completo
+SEARCH_MAX_TERMS = 10
+SEARCH_TERM = re.compile(r'\w+')
+
+# Columnas de los listados, en el mismo orden que Product.to_dict()
+PRODUCT_FIELDS = {
+    'id': Product.id,
+    'name': Product.name,
+    'description': Product.description,
+    'price': Product.price,
+    'stock': Product.stock,
+    'category_id': Product.category_id,
+    'category_name': Category.name.label('category_name'),
+}
+
+# Columnas por las que se permite ordenar el listado ('-' = descendente)
+PRODUCT_SORTS = {
+    'id': Product.id,
+    'name': Product.name.collate('NOCASE'),
+    'price': Product.price,
+    'stock': Product.stock,
+}
 
 
 class ProductService:
     """Servicio para gestionar productos"""
 
     @staticmethod
-    def create_product(name, price, stock, category_id, description=None):
-        """Crea un nuevo producto"""
+    def validate_product_data(name, price, stock, description=None):
+        """Valida y normaliza los campos de un producto nuevo"""
         # Validar nombre
         if not name or str(name).strip() == '':
             raise ValueError("El nombre del producto es requerido")
@@ -16,7 +51,46 @@ class ProductService:
         # Validar precio
         if price is None:
             raise ValueError("El precio debe ser un valor positivo")
+        price = ProductService._parse_price(price)
+
+        # Validar stock
+        if stock is None:
+            raise ValueError("El stock debe ser un valor positivo")
+        stock = ProductService._parse_stock(stock)
+
+        return {
+            'name': str(name).strip(),
+            'price': price,
+            'stock': stock,
+            'description': str(description).strip() if description else None
+        }
+
+    @staticmethod
+    def validate_product_changes(name=None, price=None, stock=None,
+                                 description=None):
+        """Valida los campos enviados en una actualización parcial"""
+        changes = {}
+
+        if name is not None:
+            if str(name).strip() == '':
+                raise ValueError("El nombre del producto no puede estar vacío")
+            changes['name'] = str(name).strip()
 
+        if price is not None:
+            changes['price'] = ProductService._parse_price(price)
+
+        if stock is not None:
+            changes['stock'] = ProductService._parse_stock(stock)
+
+        if description is not None:
+            changes['description'] = (str(description).strip()
+                                      if description else None)
+
+        return changes
+
+    @staticmethod
+    def _parse_price(price):
+        """Convierte el precio a float y valida que no sea negativo"""
         try:
             price = float(price)
         except (TypeError, ValueError):
@@ -24,11 +98,11 @@ class ProductService:
 
         if price < 0:
             raise ValueError("El precio debe ser un valor positivo")
+        return price
 
-        # Validar stock
-        if stock is None:
-            raise ValueError("El stock debe ser un valor positivo")
-
+    @staticmethod
+    def _parse_stock(stock):
+        """Convierte el stock a int y valida que no sea negativo"""
         try:
             stock = int(stock)
         except (TypeError, ValueError):
@@ -36,85 +110,510 @@ class ProductService:
 
         if stock < 0:
             raise ValueError("El stock debe ser un valor positivo")
+        return stock
 
-        # Validar que la categoría existe
-        CategoryService.get_category_by_id(category_id)
+    @staticmethod
+    def create_product(name, price, stock, category_id, description=None):
+        """Crea un nuevo producto"""
+        data = ProductService.validate_product_data(name, price, stock,
+                                                    description)
 
-        product = Product(
-            name=str(name).strip(),
-            price=float(price),
-            stock=int(stock),
-            category_id=category_id,
-            description=str(description).strip() if description else None
-        )
-        db.session.add(product)
-        db.session.commit()
-        return product
+        def create():
+            # Validar que la categoría existe
+            CategoryService.ensure_category_exists(category_id)
+
+            product = Product(category_id=category_id, **data)
+            db.session.add(product)
+            return product
+
+        return run_write(create, after_commit=lambda product: (
+            autocomplete_index('products').add(product.id, product.name)
+        ), integrity_error="Categoría no encontrada")
+
+    @staticmethod
+    def with_category(query):
+        """Carga la categoría en la misma consulta para to_dict()"""
+        return query.options(joinedload(Product.category))
 
     @staticmethod
     def get_all_products():
         """Obtiene todos los productos"""
-        return Product.query.all()
+        return ProductService.with_category(Product.query).all()
+
+    @staticmethod
+    def get_products_page(limit=None, after=None, category_id=None,
+                          min_price=None, max_price=None, min_stock=None,
+                          max_stock=None, name=None, sort=None, fields=None):
+        """Obtiene una página de productos filtrada y ordenada
+
+        Retorna filas de columnas (sin instanciar modelos) y el orden se
+        desempata por ID para que el cursor sea estable. Con `fields` solo se
+        consultan esas columnas más las que necesita el cursor.
+        """
+        if category_id:
+            CategoryService.ensure_category_exists(category_id)
+
+        statement, limit, key = ProductService.products_page_query(
+            limit=limit, after=after, category_id=category_id,
+            min_price=min_price, max_price=max_price, min_stock=min_stock,
+            max_stock=max_stock, name=name, sort=sort, fields=fields
+        )
+        rows = db.session.execute(statement).all()
+        return build_page(rows, limit, key=key)
+
+    @staticmethod
+    def products_page_query(limit=None, after=None, category_id=None,
+                            min_price=None, max_price=None, min_stock=None,
+                            max_stock=None, name=None, sort=None,
+                            fields=None):
+        """Construye la consulta de una página de productos sin ejecutarla
+
+        Retorna la consulta (con limit + 1), el límite y la clave del cursor
+        para build_page(); la existencia de la categoría la valida quien
+        ejecuta la consulta.
+        """
+        limit = resolve_limit(limit)
+        sort = sort or 'id'
+        descending = sort.startswith('-')
+        field = sort.lstrip('-')
+        if field not in PRODUCT_SORTS:
+            raise ValueError(
+                "Solo se puede ordenar por: " + ', '.join(PRODUCT_SORTS)
+            )
+        column = PRODUCT_SORTS[field]
+
+        query = ProductService._select_rows(fields, 'id', field)
+
+        if category_id:
+            query = query.where(Product.category_id == category_id)
+
+        if min_price is not None:
+            query = query.where(
+                Product.price >= ProductService._parse_price(min_price)
+            )
+        if max_price is not None:
+            query = query.where(
+                Product.price <= ProductService._parse_price(max_price)
+            )
+        if min_stock is not None:
+            query = query.where(
+                Product.stock >= ProductService._parse_stock(min_stock)
+            )
+        if max_stock is not None:
+            query = query.where(
+                Product.stock <= ProductService._parse_stock(max_stock)
+            )
+        if name:
+            query = query.where(Product.name.contains(name,
+                                                      autoescape=True))
+
+        if after:
+            query = query.where(
+                ProductService._after_cursor(after, sort, column, descending)
+            )
+
+        if descending:
+            query = query.order_by(column.desc(), Product.id.desc())
+        else:
+            query = query.order_by(column, Product.id)
+
+        return (query.limit(limit + 1), limit,
+                lambda row: [sort, getattr(row, field), row.id])
+
+    @staticmethod
+    def _select_rows(fields=None, *required, extra_columns=()):
+        """SELECT de las columnas pedidas (todas si fields es None)
+
+        `required` son campos que se consultan aunque no se pidan (las claves
+        del cursor); la categoría solo se une si se pide category_name.
+        """
+        if fields is None:
+            fields = PRODUCT_FIELDS
+        else:
+            fields = list(fields) + [f for f in required if f not in fields]
+        # select_from: si solo se pide category_name no hay columnas de
+        # products desde las que unir la categoría
+        query = select(*(PRODUCT_FIELDS[f] for f in fields),
+                       *extra_columns).select_from(Product)
+        if 'category_name' in fields:
+            query = query.outerjoin(Category,
+                                    Category.id == Product.category_id)
+        return query
+
+    @staticmethod
+    def _after_cursor(after, sort, column, descending):
+        """Condición para continuar después del último elemento del cursor"""
+        cursor_sort, last_value, last_id = decode_cursor(after, size=3)
+        if cursor_sort != sort or not isinstance(last_id, int) or \
+                not isinstance(last_value, (int, float, str)):
+            raise ValueError("Cursor de paginación inválido")
+
+        if descending:
+            return or_(column < last_value,
+                       and_(column == last_value, Product.id < last_id))
+        return or_(column > last_value,
+                   and_(column == last_value, Product.id > last_id))
 
     @staticmethod
     def get_product_by_id(product_id):
         """Obtiene un producto por su ID"""
         product = Product.query.get(product_id)
         if not product:
-            raise ValueError("Producto no encontrado")
+            raise NotFoundError("Producto no encontrado")
         return product
 
+    @staticmethod
+    def get_product_fields(product_id, fields=None):
+        """Obtiene un producto como fila (con el nombre de su categoría)
+
+        Con `fields` solo se consultan esas columnas.
+        """
+        row = db.session.execute(
+            ProductService._select_rows(fields).where(Product.id == product_id)
+        ).first()
+        if row is None:
+            raise NotFoundError("Producto no encontrado")
+        return row
+
     @staticmethod
     def get_products_by_category(category_id):
         """Obtiene productos de una categoría específica"""
-        CategoryService.get_category_by_id(category_id)
-        return Product.query.filter_by(category_id=category_id).all()
+        CategoryService.ensure_category_exists(category_id)
+        return ProductService.with_category(
+            Product.query.filter_by(category_id=category_id)
+        ).all()
+
+    @staticmethod
+    def search_products(query, limit=None, after=None, fields=None):
+        """Busca productos por nombre y descripción ordenados por relevancia"""
+        statement, limit, key = ProductService.search_query(query, limit,
+                                                            after, fields)
+        rows = db.session.execute(statement).all()
+        return build_page(rows, limit, key=key)
+
+    @staticmethod
+    def search_query(query, limit=None, after=None, fields=None):
+        """Construye la consulta de búsqueda; retorna consulta, límite y
+        clave del cursor"""
+        limit = resolve_limit(limit)
+        match = ProductService._match_expression(query)
+
+        search = text(
+            "SELECT rowid AS id, rank FROM products_fts "
+            "WHERE products_fts MATCH :match"
+        ).bindparams(match=match).columns(
+            id=db.Integer, rank=db.Float
+        ).subquery('search')
+
+        statement = ProductService._select_rows(
+            fields, 'id', extra_columns=(search.c.rank,)
+        ).join(
+            search, search.c.id == Product.id
+        )
+
+        if after:
+            last_rank, last_id = decode_cursor(after, size=2)
+            if not isinstance(last_rank, (int, float)) or \
+                    not isinstance(last_id, int):
+                raise ValueError("Cursor de paginación inválido")
+            statement = statement.where(or_(
+                search.c.rank > last_rank,
+                and_(search.c.rank == last_rank, Product.id > last_id)
+            ))
+
+        return (statement.order_by(search.c.rank, Product.id)
+                .limit(limit + 1), limit, lambda row: [row.rank, row.id])
+
+    @staticmethod
+    def _match_expression(query):
+        """Convierte el texto buscado en una consulta FTS5 por prefijos"""
+        terms = SEARCH_TERM.findall(query or '')[:SEARCH_MAX_TERMS]
+        if not terms:
+            raise ValueError("El texto de búsqueda es requerido")
+        # Cada palabra entre comillas para neutralizar la sintaxis de FTS5
+        return ' '.join(f'"{term}"*' for term in terms)
 
     @staticmethod
     def update_product(product_id, name=None, price=None, stock=None,
                        category_id=None, description=None):
         """Actualiza un producto"""
-        product = ProductService.get_product_by_id(product_id)
+        changes = ProductService.validate_product_changes(
+            name=name, price=price, stock=stock, description=description
+        )
 
-        if name is not None:
-            if str(name).strip() == '':
-                raise ValueError("El nombre del producto no puede estar vacío")
-            product.name = str(name).strip()
+        def update():
+            product = ProductService.get_product_by_id(product_id)
 
-        if price is not None:
+            if category_id is not None:
+                CategoryService.ensure_category_exists(category_id)
+                changes['category_id'] = category_id
+
+            for field, value in changes.items():
+                setattr(product, field, value)
+            return product
+
+        def after_commit(product):
+            if 'name' in changes:
+                autocomplete_index('products').add(product.id, product.name)
+
+        return run_write(update, after_commit,
+                         integrity_error="Categoría no encontrada")
+
+    @staticmethod
+    def delete_product(product_id):
+        """Elimina un producto"""
+        def delete():
+            product = ProductService.get_product_by_id(product_id)
+            db.session.delete(product)
+            return True
+
+        return run_write(delete, after_commit=lambda _: (
+            autocomplete_index('products').remove(product_id)
+        ))
+
+    @staticmethod
+    def adjust_stock(product_id, delta):
+        """Suma un delta al stock de forma atómica y retorna el nuevo nivel"""
+        delta = ProductService._parse_delta(delta)
+        return run_write(
+            lambda: ProductService._apply_stock_delta(product_id, delta)
+        )
+
+    @staticmethod
+    def bulk_adjust_stock(items):
+        """Aplica deltas de stock en una transacción; todo o nada"""
+        ProductService._check_bulk_items(items)
+        rows, errors = [], []
+
+        for index, item in enumerate(items):
             try:
-                price = float(price)
-            except (TypeError, ValueError):
-                raise ValueError("El precio debe ser un valor numérico")
+                if not isinstance(item, dict):
+                    raise ValueError("Cada elemento debe ser un objeto")
+                rows.append((index, {
+                    'id': parse_id(item.get('id'), "Producto no encontrado"),
+                    'delta': ProductService._parse_delta(item.get('delta'))
+                }))
+            except ValueError as e:
+                errors.append({'index': index, 'error': str(e)})
 
-            if price < 0:
-                raise ValueError("El precio debe ser un valor positivo")
-            product.price = float(price)
+        if errors:
+            return {'updated': [], 'errors': errors}
 
-        if stock is not None:
+        updated = []
+        try:
+            claim_reservation()
+            for index, row in rows:
+                try:
+                    stock = ProductService._apply_stock_delta(row['id'],
+                                                              row['delta'])
+                    updated.append({'id': row['id'], 'stock': stock})
+                except ValueError as e:
+                    errors.append({'index': index, 'error': str(e)})
+
+            if errors:
+                db.session.rollback()
+                return {'updated': [], 'errors': errors}
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return {'updated': updated, 'errors': []}
+
+    @staticmethod
+    def _apply_stock_delta(product_id, delta):
+        """UPDATE condicional: nunca deja el stock por debajo de cero"""
+        stock = db.session.scalar(
+            update(Product)
+            .where(Product.id == product_id, Product.stock + delta >= 0)
+            .values(stock=Product.stock + delta)
+            .returning(Product.stock),
+            execution_options={'synchronize_session': False}
+        )
+        if stock is None:
+            # Solo ante un fallo se consulta el motivo
+            if db.session.get(Product, product_id) is None:
+                raise NotFoundError("Producto no encontrado")
+            raise ValueError("Stock insuficiente")
+        return stock
+
+    @staticmethod
+    def _parse_delta(delta):
+        """Valida que el ajuste de stock sea un entero (positivo o negativo)"""
+        if isinstance(delta, bool) or not isinstance(delta, (int, str)):
+            raise ValueError("El ajuste de stock debe ser un valor entero")
+        try:
+            return int(delta)
+        except ValueError:
+            raise ValueError("El ajuste de stock debe ser un valor entero")
+
+    @staticmethod
+    def get_existing_ids(product_ids):
+        """Retorna el subconjunto de IDs que existen, con consultas IN"""
+        existing = set()
+        for chunk in chunked(set(product_ids), IN_CLAUSE_CHUNK):
+            existing.update(db.session.scalars(
+                db.select(Product.id).where(Product.id.in_(chunk))
+            ))
+        return existing
+
+    @staticmethod
+    def bulk_create_products(items):
+        """Crea productos en bloque; no escribe nada si algún elemento falla"""
+        ProductService._check_bulk_items(items)
+        rows, errors = [], []
+
+        for index, item in enumerate(items):
             try:
-                stock = int(stock)
-            except (TypeError, ValueError):
-                raise ValueError("El stock debe ser un valor numérico")
+                if not isinstance(item, dict):
+                    raise ValueError("Cada elemento debe ser un objeto")
+                row = ProductService.validate_product_data(
+                    item.get('name'), item.get('price'), item.get('stock'),
+                    item.get('description')
+                )
+                row['category_id'] = parse_id(item.get('category_id'),
+                                              "Categoría no encontrada")
+                rows.append((index, row))
+            except ValueError as e:
+                errors.append({'index': index, 'error': str(e)})
 
-            if stock < 0:
-                raise ValueError("El stock debe ser un valor positivo")
-            product.stock = int(stock)
+        # Una sola resolución de categorías para todo el lote
+        categories = CategoryService.get_existing_ids(
+            row['category_id'] for _, row in rows
+        )
+        errors.extend(
+            {'index': index, 'error': "Categoría no encontrada"}
+            for index, row in rows if row['category_id'] not in categories
+        )
 
-        if category_id is not None:
-            CategoryService.get_category_by_id(category_id)
-            product.category_id = category_id
+        if errors:
+            return {'created': [], 'errors': sorted(errors,
+                                                    key=lambda e: e['index'])}
 
-        if description is not None:
-            product.description = str(description).strip() if description else None
+        statement = insert(Product).returning(Product.id,
+                                              sort_by_parameter_order=True)
+        ids = ProductService._write_in_chunks(
+            [row for _, row in rows],
+            lambda chunk: db.session.scalars(statement, chunk).all()
+        )
+        created = [i for chunk in ids for i in chunk]
+        autocomplete_index('products').add_many(
+            (product_id, row['name'])
+            for product_id, (_, row) in zip(created, rows)
+        )
+        return {'created': created, 'errors': []}
 
-        db.session.commit()
-        return product
+    @staticmethod
+    def bulk_update_products(items):
+        """Actualiza productos en bloque; cada elemento debe incluir su ID"""
+        ProductService._check_bulk_items(items)
+        rows, errors = [], []
+
+        for index, item in enumerate(items):
+            try:
+                if not isinstance(item, dict):
+                    raise ValueError("Cada elemento debe ser un objeto")
+                product_id = parse_id(item.get('id'), "Producto no encontrado")
+                changes = ProductService.validate_product_changes(
+                    name=item.get('name'), price=item.get('price'),
+                    stock=item.get('stock'),
+                    description=item.get('description')
+                )
+                if item.get('category_id') is not None:
+                    changes['category_id'] = parse_id(
+                        item['category_id'], "Categoría no encontrada"
+                    )
+                if not changes:
+                    raise ValueError("No se recibieron campos para actualizar")
+                changes['id'] = product_id
+                rows.append((index, changes))
+            except ValueError as e:
+                errors.append({'index': index, 'error': str(e)})
+
+        products = ProductService.get_existing_ids(
+            row['id'] for _, row in rows
+        )
+        categories = CategoryService.get_existing_ids(
+            row['category_id'] for _, row in rows if 'category_id' in row
+        )
+        for index, row in rows:
+            if row['id'] not in products:
+                errors.append({'index': index,
+                               'error': "Producto no encontrado"})
+            elif ('category_id' in row
+                  and row['category_id'] not in categories):
+                errors.append({'index': index,
+                               'error': "Categoría no encontrada"})
+
+        if errors:
+            return {'updated': 0, 'errors': sorted(errors,
+                                                   key=lambda e: e['index'])}
+
+        ProductService._write_in_chunks(
+            [row for _, row in rows],
+            lambda chunk: db.session.execute(update(Product), chunk)
+        )
+        autocomplete_index('products').add_many(
+            (row['id'], row['name']) for _, row in rows if 'name' in row
+        )
+        return {'updated': len(rows), 'errors': []}
 
     @staticmethod
-    def delete_product(product_id):
-        """Elimina un producto"""
-        product = ProductService.get_product_by_id(product_id)
-        db.session.delete(product)
-        db.session.commit()
-        return True
\ No newline at end of file
+    def bulk_delete_products(product_ids):
+        """Elimina productos en bloque a partir de sus IDs"""
+        ProductService._check_bulk_items(product_ids)
+        ids, errors = [], []
+
+        for index, product_id in enumerate(product_ids):
+            try:
+                ids.append((index, parse_id(product_id,
+                                            "Producto no encontrado")))
+            except ValueError as e:
+                errors.append({'index': index, 'error': str(e)})
+
+        existing = ProductService.get_existing_ids(pid for _, pid in ids)
+        errors.extend(
+            {'index': index, 'error': "Producto no encontrado"}
+            for index, pid in ids if pid not in existing
+        )
+
+        if errors:
+            return {'deleted': 0, 'errors': sorted(errors,
+                                                   key=lambda e: e['index'])}
+
+        def delete_chunk(chunk):
+            for in_chunk in chunked(chunk, IN_CLAUSE_CHUNK):
+                db.session.execute(
+                    delete(Product).where(Product.id.in_(in_chunk)),
+                    execution_options={'synchronize_session': False}
+                )
+
+        ProductService._write_in_chunks(sorted(existing), delete_chunk)
+        autocomplete_index('products').remove_many(existing)
+        return {'deleted': len(existing), 'errors': []}
+
+    @staticmethod
+    def _check_bulk_items(items):
+        """Valida que el lote sea una lista no vacía dentro del máximo"""
+        if not isinstance(items, list) or not items:
+            raise ValueError("Se requiere una lista de elementos")
+
+        max_items = current_app.config['BULK_MAX_ITEMS']
+        if len(items) > max_items:
+            raise ValueError(
+                f"El lote no puede superar {max_items} elementos"
+            )
+
+    @staticmethod
+    def _write_in_chunks(rows, write):
+        """Escribe las filas en una transacción o en commits por bloques"""
+        chunk_size = current_app.config['BULK_CHUNK_SIZE'] or len(rows)
+        results = []
+        try:
+            claim_reservation()
+            for chunk in chunked(rows, chunk_size):
+                results.append(write(chunk))
+                db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return results
\ No newline at end of file
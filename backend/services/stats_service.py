@@ -0,0 +1,71 @@
+from sqlalchemy import case, func, select
+
+from backend.models.category import Category, db
+from backend.models.product import Product
+from backend.services.product_service import ProductService
+
+
+class StatsService:
+    """Servicio para calcular las estadísticas del panel de control"""
+
+    MAX_RECENT = 50
+
+    @staticmethod
+    def get_dashboard_stats(low_threshold, medium_threshold, recent_limit):
+        """Calcula totales, niveles de stock y productos recientes"""
+        try:
+            low_threshold = int(low_threshold)
+            medium_threshold = int(medium_threshold)
+            recent_limit = int(recent_limit)
+        except (TypeError, ValueError):
+            raise ValueError("Los umbrales deben ser valores numéricos")
+
+        if low_threshold < 0 or medium_threshold < low_threshold:
+            raise ValueError(
+                "El umbral medio debe ser mayor o igual al umbral bajo"
+            )
+
+        if recent_limit < 0 or recent_limit > StatsService.MAX_RECENT:
+            raise ValueError(
+                f"La cantidad de recientes debe estar entre 0 y "
+                f"{StatsService.MAX_RECENT}"
+            )
+
+        # Una sola consulta agregada para los totales y los niveles de stock
+        totals = db.session.execute(
+            select(
+                select(func.count(Category.id)).scalar_subquery(),
+                func.count(Product.id),
+                func.coalesce(func.sum(
+                    case((Product.stock < low_threshold, 1), else_=0)
+                ), 0),
+                func.coalesce(func.sum(
+                    case((Product.stock.between(low_threshold,
+                                                medium_threshold - 1), 1),
+                         else_=0)
+                ), 0),
+            ).select_from(Product)
+        ).one()
+
+        total_categories, total_products, low, medium = totals
+
+        recent = []
+        if recent_limit:
+            recent = ProductService.with_category(
+                Product.query.order_by(Product.id.desc()).limit(recent_limit)
+            ).all()
+
+        return {
+            'total_categories': total_categories,
+            'total_products': total_products,
+            'stock': {
+                'low': low,
+                'medium': medium,
+                'normal': total_products - low - medium
+            },
+            'thresholds': {
+                'low': low_threshold,
+                'medium': medium_threshold
+            },
+            'recent_products': [prod.to_dict() for prod in recent]
+        }
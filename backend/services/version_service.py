@@ -0,0 +1,21 @@
+from sqlalchemy import select
+
+from backend.models.category import db
+from backend.models.table_version import TableVersion
+
+
+class VersionService:
+    """Servicio para consultar los contadores de cambios por tabla"""
+
+    @staticmethod
+    def get_versions(tables):
+        """Retorna {tabla: versión} con una única consulta"""
+        rows = db.session.execute(VersionService.versions_query(tables)).all()
+        return dict(rows)
+
+    @staticmethod
+    def versions_query(tables):
+        """Consulta de los contadores de las tablas indicadas"""
+        return select(TableVersion.name, TableVersion.version).where(
+            TableVersion.name.in_(tables)
+        )
@@ -0,0 +1,269 @@
+"""Registro de consultas lentas con su plan de ejecución"""
+import json
+import logging
+import os
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+
+from flask import g, has_app_context, has_request_context, request
+from sqlalchemy import event
+
+from backend.models.category import db
+
+EXPLAINABLE = ('SELECT', 'WITH', 'UPDATE', 'DELETE', 'INSERT')
+MAX_PARAMETER_LENGTH = 200
+
+
+class SlowQueryLog:
+    """Guarda las consultas lentas en un log rotativo por proceso
+
+    Rotar un mismo archivo desde varios procesos pierde entradas, así que
+    cada worker escribe en <nombre>.<pid><extensión>. El pid se resuelve al
+    escribir porque gunicorn carga la aplicación en el maestro antes del
+    fork. recent() lee el final de los archivos de todos los procesos.
+
+    gunicorn recicla los workers, así que al abrir su log cada proceso borra
+    los de los procesos terminados salvo el archivo actual de los
+    `keep_exited` más recientes.
+    """
+
+    def __init__(self, path, max_bytes, backups, recent, keep_exited=4):
+        self.path = os.path.abspath(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.recent_size = recent
+        self.keep_exited = keep_exited
+        self._logger = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def worker_path(self, pid=None):
+        """Archivo de log del proceso indicado (por defecto el actual)"""
+        stem, extension = os.path.splitext(self.path)
+        return f'{stem}.{pid or os.getpid()}{extension}'
+
+    def worker_paths(self):
+        """Archivos de log actuales (sin los rotados) de todos los procesos"""
+        return [self.worker_path(pid) for pid, paths
+                in self._log_files().items()
+                if self.worker_path(pid) in paths]
+
+    def _log_files(self):
+        """pid -> archivos de log de ese proceso (el actual y los rotados)"""
+        directory, name = os.path.split(os.path.abspath(self.path))
+        stem, extension = os.path.splitext(name)
+        pattern = re.compile(
+            re.escape(stem) + r'\.(\d+)' + re.escape(extension) +
+            r'(\.\d+)?$'
+        )
+        files = {}
+        for entry in os.listdir(directory):
+            match = pattern.match(entry)
+            if match:
+                files.setdefault(int(match.group(1)), []).append(
+                    os.path.join(directory, entry)
+                )
+        return files
+
+    def prune(self):
+        """Borra los logs de los procesos terminados: de los `keep_exited`
+        más recientes se conserva el archivo actual, del resto todos"""
+        exited = [(pid, paths) for pid, paths in self._log_files().items()
+                  if pid != os.getpid() and not process_alive(pid)]
+        exited.sort(key=lambda item: max(map(_modified, item[1])),
+                    reverse=True)
+        for index, (pid, paths) in enumerate(exited):
+            for path in paths:
+                if index < self.keep_exited and \
+                        path == self.worker_path(pid):
+                    continue
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    continue
+
+    def _get_logger(self):
+        """Logger con el RotatingFileHandler del proceso actual"""
+        pid = os.getpid()
+        if self._pid != pid:
+            with self._lock:
+                if self._pid != pid:
+                    self.prune()
+                    path = self.worker_path(pid)
+                    logger = logging.getLogger(f'{__name__}.{path}')
+                    logger.setLevel(logging.INFO)
+                    logger.propagate = False
+                    if not logger.handlers:
+                        handler = RotatingFileHandler(
+                            path, maxBytes=self.max_bytes,
+                            backupCount=self.backups, encoding='utf-8'
+                        )
+                        handler.setFormatter(logging.Formatter('%(message)s'))
+                        logger.addHandler(handler)
+                    self._logger, self._pid = logger, pid
+        return self._logger
+
+    def record(self, entry):
+        """Escribe una entrada en el log del proceso"""
+        self._get_logger().info(json.dumps(entry, ensure_ascii=False))
+
+    def recent(self):
+        """Entradas recientes de todos los procesos, la más nueva primero"""
+        entries = []
+        for path in self.worker_paths():
+            # Una línea más por si la última está a medio escribir
+            for line in tail_lines(path, self.recent_size + 1):
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+        entries.sort(key=lambda entry: entry['timestamp'], reverse=True)
+        return entries[:self.recent_size]
+
+
+def process_alive(pid):
+    """Si el proceso existe (en Windows, os.kill terminaría el proceso: se
+    consideran terminados y solo se conservan los más recientes)"""
+    if os.name == 'nt':
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _modified(path):
+    """Fecha de modificación de un archivo (0 si ya no existe)"""
+    try:
+        return os.path.getmtime(path)
+    except FileNotFoundError:
+        return 0
+
+
+def tail_lines(path, count, block_size=65536):
+    """Últimas `count` líneas completas de un archivo, leído desde el final"""
+    if count < 1:
+        return []
+    try:
+        with open(path, 'rb') as log:
+            position = log.seek(0, os.SEEK_END)
+            data = b''
+            while position > 0 and data.count(b'\n') <= count:
+                step = min(block_size, position)
+                position -= step
+                log.seek(position)
+                data = log.read(step) + data
+    except FileNotFoundError:
+        return []
+
+    lines = data.splitlines()
+    if position > 0:
+        # La primera línea leída puede estar incompleta
+        lines = lines[1:]
+    return [line.decode('utf-8', 'replace') for line in lines[-count:]]
+
+
+def explain(dbapi_connection, statement, parameters):
+    """Plan de ejecución de SQLite y tablas recorridas completas"""
+    if not statement.lstrip().upper().startswith(EXPLAINABLE):
+        return None, []
+    # Cursor propio: el de la sentencia aún tiene filas por leer
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        rows = cursor.fetchall()
+    except Exception as e:
+        return [f"No se pudo obtener el plan: {e}"], []
+    finally:
+        cursor.close()
+
+    plan = [row[-1] for row in rows]
+    full_scans = [
+        detail.split()[1] for detail in plan
+        if detail.startswith('SCAN ')
+        and 'USING' not in detail
+        and 'VIRTUAL TABLE' not in detail
+        and detail != 'SCAN CONSTANT ROW'
+    ]
+    return plan, full_scans
+
+
+def _format_parameters(parameters):
+    """Representación acotada de los parámetros de la sentencia"""
+    text = repr(parameters)
+    if len(text) > MAX_PARAMETER_LENGTH:
+        text = text[:MAX_PARAMETER_LENGTH] + '...'
+    return text
+
+
+def init_slow_query_log(app):
+    """Registra las sentencias que superan SLOW_QUERY_THRESHOLD_MS"""
+    if not app.config['SLOW_QUERY_LOG_ENABLED']:
+        return
+
+    path = app.config['SLOW_QUERY_LOG'] or os.path.join(
+        app.instance_path, 'slow_queries.log'
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    slow_log = SlowQueryLog(path,
+                            max_bytes=app.config['SLOW_QUERY_LOG_MAX_BYTES'],
+                            backups=app.config['SLOW_QUERY_LOG_BACKUPS'],
+                            recent=app.config['SLOW_QUERY_RECENT'],
+                            keep_exited=app.config[
+                                'SLOW_QUERY_LOG_KEEP_EXITED'])
+    app.extensions['slow_queries'] = slow_log
+
+    with app.app_context():
+        watch_engine(db.engine, slow_log,
+                     app.config['SLOW_QUERY_THRESHOLD_MS'] / 1000)
+
+
+def watch_engine(engine, slow_log, threshold):
+    """Registra en slow_log las sentencias del motor que superen threshold
+
+    También se usa con el motor asíncrono del modo ASGI: allí no hay
+    contexto de petición y la ruta se toma de g.request_endpoint.
+    """
+    # El inicio va en el contexto de ejecución: si la sentencia falla no se
+    # llama a after_cursor_execute y no debe quedar nada en la conexión
+    @event.listens_for(engine, 'before_cursor_execute')
+    def start_query(conn, cursor, statement, parameters, context, many):
+        if context is not None:
+            context._slow_query_start = time.perf_counter()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def check_query(conn, cursor, statement, parameters, context, many):
+        start = getattr(context, '_slow_query_start', None)
+        if start is None:
+            return
+        duration = time.perf_counter() - start
+        if duration < threshold:
+            return
+
+        # En executemany se explica con el primer juego de parámetros
+        plan_parameters = parameters[0] if many and parameters else parameters
+        plan, full_scans = explain(conn.connection.dbapi_connection,
+                                   statement, plan_parameters)
+        endpoint = None
+        if has_request_context():
+            rule = request.url_rule.rule if request.url_rule else request.path
+            endpoint = f'{request.method} {rule}'
+        elif has_app_context():
+            endpoint = g.get('request_endpoint')
+
+        slow_log.record({
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'duration_ms': round(duration * 1000, 3),
+            'endpoint': endpoint,
+            'statement': statement,
+            'parameters': _format_parameters(parameters),
+            'executemany': many,
+            'plan': plan,
+            'full_scans': full_scans,
+        })
@@ -0,0 +1,218 @@
+"""Cola de escrituras con commit agrupado (group commit)
+
+Con WRITE_QUEUE_ENABLED, las escrituras individuales de los servicios se
+encolan y un único hilo escritor las ejecuta en una sola transacción cada
+WRITE_QUEUE_MAX_DELAY_MS milisegundos o WRITE_QUEUE_MAX_BATCH operaciones.
+Cada operación corre en su propio SAVEPOINT, de modo que un error solo
+revierte esa operación, y cada petición recibe su resultado después del
+COMMIT del lote: nunca se confirma al cliente una escritura no persistida.
+"""
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from flask import current_app, g
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import IntegrityError
+
+from backend.models.category import db
+
+logger = logging.getLogger(__name__)
+
+# Indica al hilo escritor que termine
+_STOP = object()
+
+
+class WriteQueue:
+    """Agrupa las escrituras concurrentes del proceso en transacciones"""
+
+    def __init__(self, app, max_batch, max_delay):
+        self.app = app
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.batches = 0
+        self.operations = 0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def submit(self, operation, after_commit=None):
+        """Encola una operación y espera su resultado (o su excepción)
+
+        Retorna el resultado y las claves de identidad que la operación
+        eliminó.
+        """
+        self._ensure_writer()
+        future = Future()
+        self._queue.put((operation, after_commit, future))
+        return future.result()
+
+    def close(self):
+        """Procesa lo pendiente y detiene el hilo escritor"""
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                return
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+
+    def _ensure_writer(self):
+        """Arranca el hilo escritor en el primer uso
+
+        Los hilos no sobreviven a un fork: cada worker de gunicorn arranca
+        el suyo aunque la aplicación se haya cargado en el maestro.
+        """
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._queue = queue.Queue()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run,
+                                            name='write-queue', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        """Toma lotes de la cola y los confirma hasta recibir _STOP"""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_delay
+            while batch[-1] is not _STOP and len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                try:
+                    if timeout > 0:
+                        batch.append(self._queue.get(timeout=timeout))
+                    else:
+                        # Sin espera: solo lo que ya está encolado
+                        batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = batch[-1] is _STOP
+            if stop:
+                batch.pop()
+            if batch:
+                # Al cerrar el contexto se descarta la sesión del lote
+                with self.app.app_context():
+                    self._flush(batch)
+            if stop:
+                return
+
+    def _flush(self, batch):
+        """Ejecuta un lote en una transacción y entrega los resultados"""
+        session = db.session()
+        # Los resultados se leen desde otros hilos después del COMMIT
+        session.expire_on_commit = False
+        done = []
+        try:
+            if db.engine.dialect.name == 'sqlite':
+                # En SQLite un SAVEPOINT sin transacción abierta abre una
+                # propia que se confirma en su RELEASE
+                session.execute(text("BEGIN IMMEDIATE"))
+
+            for operation, after_commit, future in batch:
+                try:
+                    with session.begin_nested():
+                        result = operation()
+                        deleted = [inspect(instance).identity_key
+                                   for instance in session.deleted]
+                    done.append((result, deleted, after_commit, future))
+                except Exception as e:
+                    future.set_exception(e)
+
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.exception("Falló el commit de un lote de escrituras")
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self.batches += 1
+            self.operations += len(batch)
+
+        for result, deleted, after_commit, future in done:
+            if after_commit:
+                try:
+                    after_commit(result)
+                except Exception:
+                    logger.exception("Falló after_commit de una escritura")
+            future.set_result((result, deleted))
+
+
+def run_write(operation, after_commit=None, integrity_error=None):
+    """Ejecuta una escritura de un servicio y la confirma
+
+    Sin cola se confirma en la sesión de la petición; con cola, en el lote
+    del hilo escritor. after_commit recibe el resultado y solo se llama si el
+    COMMIT tuvo éxito. Si se indica integrity_error, una violación de
+    restricción (p. ej. una clave foránea) se reporta como ValueError con
+    ese mensaje. La reserva de idempotencia pendiente de la petición se
+    escribe en la misma transacción.
+    """
+    write_queue = current_app.extensions.get('write_queue')
+    operation = with_reservation(operation)
+    try:
+        if write_queue is None:
+            try:
+                result = operation()
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+            if after_commit:
+                after_commit(result)
+            return result
+
+        result, deleted = write_queue.submit(operation, after_commit)
+    except IntegrityError:
+        if integrity_error is None:
+            raise
+        raise ValueError(integrity_error) from None
+    # Igual que un COMMIT propio: las filas eliminadas se separan de la
+    # sesión de la petición y el resto se vuelve a leer al usarlo
+    for key in deleted:
+        instance = db.session.identity_map.get(key)
+        if instance is not None:
+            db.session.expunge(instance)
+    db.session.expire_all()
+    if isinstance(result, db.Model):
+        # Instancia de la sesión del escritor: se asocia a la de la petición
+        # para que sus relaciones se puedan cargar
+        result = db.session.merge(result, load=False)
+    return result
+
+
+def with_reservation(operation):
+    """Envuelve la operación para que escriba en su misma transacción la
+    reserva pendiente de la petición (la de su Idempotency-Key), si la hay"""
+    reservation = g.get('idempotency')
+    if reservation is None:
+        return operation
+    return reservation.bind(operation)
+
+
+def claim_reservation():
+    """Inserta ya la reserva pendiente en la sesión de la petición
+
+    Para las escrituras que confirman por su cuenta sin pasar por run_write
+    (las masivas): la reserva se confirma con su primer COMMIT.
+    """
+    with_reservation(lambda: None)()
+
+
+def init_write_queue(app):
+    """Activa la cola de escrituras si WRITE_QUEUE_ENABLED"""
+    if not app.config['WRITE_QUEUE_ENABLED']:
+        return
+    app.extensions['write_queue'] = WriteQueue(
+        app,
+        max_batch=app.config['WRITE_QUEUE_MAX_BATCH'],
+        max_delay=app.config['WRITE_QUEUE_MAX_DELAY_MS'] / 1000
+    )
@@ -0,0 +1,6 @@
+"""Punto de entrada WSGI para producción (gunicorn backend.wsgi:app)"""
+import os
+
+from backend.app import create_app
+
+app = create_app(os.getenv('FLASK_ENV', 'production'))
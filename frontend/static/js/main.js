@@ -15,6 +15,114 @@ function showMessage(text, type = 'success') {
     }, 5000);
 }
 
+async function fetchPage(url, cursor = null) {
+    // Una página de un listado paginado por cursor: { items, next_cursor }
+    const separator = url.includes('?') ? '&' : '?';
+    const pageUrl = cursor
+        ? `${url}${separator}after=${encodeURIComponent(cursor)}`
+        : url;
+    const response = await fetch(pageUrl);
+    const page = await response.json();
+    if (!response.ok) {
+        throw new Error(page.error || response.statusText);
+    }
+    return page;
+}
+
+async function fetchAllPages(url) {
+    // Recorre todas las páginas: solo para listados pequeños (p. ej. un <select>)
+    const items = [];
+    let cursor = null;
+
+    do {
+        const page = await fetchPage(url, cursor);
+        items.push(...page.items);
+        cursor = page.next_cursor;
+    } while (cursor);
+
+    return items;
+}
+
+function cursorTable(tbodyId, buttonId, renderRow, emptyRow) {
+    // Tabla que muestra la primera página y pide las siguientes con el botón
+    // "Cargar más" mientras la API devuelva next_cursor. Retorna load(url),
+    // que vuelve a empezar desde la primera página de url
+    const tbody = document.getElementById(tbodyId);
+    const button = document.getElementById(buttonId);
+    let url = null;
+    let cursor = null;
+    let version = 0;
+
+    function render(page, append) {
+        const rows = page.items.map(renderRow).join('');
+        if (append) {
+            tbody.insertAdjacentHTML('beforeend', rows);
+        } else {
+            tbody.innerHTML = rows || emptyRow;
+        }
+        cursor = page.next_cursor;
+        button.style.display = cursor ? 'inline-block' : 'none';
+    }
+
+    button.addEventListener('click', async () => {
+        // Si mientras tanto se recargó la tabla, esta página ya no aplica
+        const current = version;
+        button.disabled = true;
+        try {
+            const page = await fetchPage(url, cursor);
+            if (current === version) render(page, true);
+        } catch (error) {
+            showMessage('Error al cargar más resultados: ' + error.message, 'error');
+        } finally {
+            button.disabled = false;
+        }
+    });
+
+    return async function load(newUrl) {
+        const current = ++version;
+        url = newUrl;
+        const page = await fetchPage(url);
+        if (current === version) render(page, false);
+    };
+}
+
+function attachAutocomplete(inputId, type) {
+    // Sugerencias por prefijo en un <datalist> asociado al campo
+    const input = document.getElementById(inputId);
+    const datalist = document.createElement('datalist');
+    datalist.id = `${inputId}-suggestions`;
+    input.after(datalist);
+    input.setAttribute('list', datalist.id);
+    input.setAttribute('autocomplete', 'off');
+
+    let timer = null;
+    input.addEventListener('input', () => {
+        clearTimeout(timer);
+        const query = input.value.trim();
+        if (!query) {
+            datalist.innerHTML = '';
+            return;
+        }
+        timer = setTimeout(async () => {
+            try {
+                const response = await fetch(
+                    `${API_URL}/api/autocomplete?type=${type}&q=${encodeURIComponent(query)}`
+                );
+                if (!response.ok) return;
+                const page = await response.json();
+                datalist.innerHTML = '';
+                page.items.forEach(item => {
+                    const option = document.createElement('option');
+                    option.value = item.name;
+                    datalist.appendChild(option);
+                });
+            } catch (error) {
+                console.error('Error:', error);
+            }
+        }, 100);
+    });
+}
+
 function formatCurrency(value) {
     return new Intl.NumberFormat('es-CO', {
         style: 'currency',
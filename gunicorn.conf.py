@@ -0,0 +1,62 @@
+"""Configuración de gunicorn para `python backend/run_project.py serve`
+
+Cada valor se puede ajustar con variables de entorno; las opciones de línea
+de comandos tienen prioridad sobre este archivo.
+"""
+import multiprocessing
+import os
+import shutil
+
+bind = os.environ.get('WEB_BIND', '0.0.0.0:5000')
+
+# Procesos y hilos: por defecto un proceso por núcleo (más uno) con varios
+# hilos cada uno para solapar la espera de E/S
+workers = int(os.environ.get('WEB_WORKERS', multiprocessing.cpu_count() + 1))
+threads = int(os.environ.get('WEB_THREADS', 4))
+worker_class = 'gthread'
+
+# La aplicación se carga una vez en el proceso maestro y se comparte por fork
+preload_app = True
+
+# Cada worker vuelca sus métricas aquí y /metrics responde la suma de todos
+# (se lee al cargar la aplicación, después de este archivo)
+metrics_dir = os.environ.setdefault(
+    'METRICS_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance',
+                 'metrics')
+)
+
+# Reinicios ordenados: los workers terminan sus peticiones antes de salir y
+# se reciclan periódicamente para acotar el crecimiento de memoria
+timeout = int(os.environ.get('WEB_TIMEOUT', 60))
+graceful_timeout = int(os.environ.get('WEB_GRACEFUL_TIMEOUT', 30))
+max_requests = int(os.environ.get('WEB_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('WEB_MAX_REQUESTS_JITTER', 100))
+
+# Conexiones keep-alive detrás de un proxy o balanceador
+keepalive = int(os.environ.get('WEB_KEEPALIVE', 5))
+backlog = int(os.environ.get('WEB_BACKLOG', 2048))
+
+accesslog = os.environ.get('WEB_ACCESS_LOG', '-')
+errorlog = os.environ.get('WEB_ERROR_LOG', '-')
+loglevel = os.environ.get('WEB_LOG_LEVEL', 'info')
+
+
+def on_starting(server):
+    """Empieza las métricas desde cero en cada arranque del servidor"""
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+
+
+def post_fork(server, worker):
+    """Descarta las conexiones heredadas del maestro tras el fork
+
+    create_app() abre conexiones SQLite al crear el esquema; compartirlas
+    entre procesos corrompe su estado, así que cada worker abre las suyas.
+    """
+    from backend.models.category import db
+
+    # Con preload_app es la aplicación ya cargada: Flask o backend.asgi
+    app = server.app.wsgi()
+    flask_app = getattr(app, 'flask_app', app)
+    with flask_app.app_context():
+        db.engine.dispose(close=False)
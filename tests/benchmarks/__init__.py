@@ -0,0 +1 @@
+"""Benchmarks de servicios y controladores (python run_project.py bench)"""
@@ -0,0 +1,161 @@
+"""Comparación del modo síncrono (WSGI) y asíncrono (ASGI) con muchos
+clientes concurrentes (python run_project.py bench-concurrency)
+
+Ambos modos se ejecutan en el proceso, sin red. El síncrono atiende con un
+pool de hilos del tamaño de un worker gthread; el asíncrono, con el bucle de
+eventos. Cada bloque de la respuesta tarda `delay` segundos en llegar al
+cliente (cliente lento): en el modo síncrono esa espera ocupa el hilo, como
+al escribir en el socket, y en el asíncrono solo suspende la corrutina.
+
+Conviene medir tanto una ruta asíncrona (ASYNC_ROUTES) como una delegada en
+Flask: en el modo asíncrono esta última se ejecuta en el pool de hilos de
+AsyncApp, que debe escalar como el del modo síncrono.
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from werkzeug.test import EnvironBuilder
+
+
+def percentile(values, fraction):
+    """Percentil de una lista ya ordenada"""
+    index = min(len(values) - 1, round(fraction * (len(values) - 1)))
+    return values[index]
+
+
+def summarize(latencies, elapsed):
+    """Rendimiento y latencias (en ms) de una ejecución"""
+    latencies = sorted(latencies)
+    return {
+        'requests': len(latencies),
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.5) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'max_ms': round(latencies[-1] * 1000, 3),
+    }
+
+
+def sync_caller(flask_app, url, threads, delay):
+    """Petición WSGI ejecutada en un pool de `threads` hilos"""
+    parts = urlsplit(url)
+    executor = ThreadPoolExecutor(max_workers=threads)
+
+    def handle():
+        environ = EnvironBuilder(path=parts.path,
+                                 query_string=parts.query).get_environ()
+        status = []
+        app_iter = flask_app(environ,
+                             lambda code, headers: status.append(code))
+        try:
+            for _ in app_iter:
+                time.sleep(delay)
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+        if not status[0].startswith('200'):
+            raise RuntimeError(f"{url}: {status[0]}")
+
+    async def call():
+        await asyncio.get_running_loop().run_in_executor(executor, handle)
+
+    return call, executor.shutdown
+
+
+def async_caller(asgi_app, url, delay):
+    """Petición ASGI ejecutada como corrutina"""
+    parts = urlsplit(url)
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'GET', 'scheme': 'http', 'path': parts.path,
+        'raw_path': parts.path.encode(), 'root_path': '',
+        'query_string': parts.query.encode(), 'headers': [],
+        'server': ('localhost', 80), 'client': ('127.0.0.1', 0),
+    }
+
+    async def call():
+        received = []
+
+        async def receive():
+            if not received:
+                received.append(True)
+                return {'type': 'http.request', 'body': b'',
+                        'more_body': False}
+            await asyncio.Event().wait()
+
+        status = []
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                status.append(message['status'])
+            elif message.get('body'):
+                await asyncio.sleep(delay)
+
+        await asgi_app(scope, receive, send)
+        if status[0] != 200:
+            raise RuntimeError(f"{url}: {status[0]}")
+
+    return call
+
+
+async def run_clients(call, concurrency, requests):
+    """`concurrency` clientes que reparten `requests` peticiones en serie"""
+    await call()
+    latencies = []
+
+    async def client(count):
+        for _ in range(count):
+            start = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - start)
+
+    per_client, extra = divmod(requests, concurrency)
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(per_client + (1 if index < extra else 0))
+        for index in range(concurrency)
+    ))
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def run_concurrency(asgi_app, urls, concurrency=200, requests=2000,
+                    threads=4, delay=0.05, log=print):
+    """Mide cada URL en ambos modos; retorna el documento de resultados.
+    `threads` es el tamaño del pool síncrono y debe coincidir con el de
+    asgi_app"""
+    def run_sync(url):
+        async def run():
+            call, shutdown = sync_caller(asgi_app.flask_app, url, threads,
+                                         delay)
+            try:
+                return await run_clients(call, concurrency, requests)
+            finally:
+                shutdown()
+        return run()
+
+    def run_async(url):
+        async def run():
+            try:
+                return await run_clients(async_caller(asgi_app, url, delay),
+                                         concurrency, requests)
+            finally:
+                await asgi_app.flask_app.extensions['async_engine'].dispose()
+        return run()
+
+    results = {}
+    for url in urls:
+        log(f"  {url}")
+        results[url] = {}
+        for mode, run in (('sync', run_sync), ('async', run_async)):
+            summary = results[url][mode] = asyncio.run(run(url))
+            log(f"    {mode}: {summary['throughput_rps']} req/s, "
+                f"p50 {summary['p50_ms']:.1f} ms, "
+                f"p99 {summary['p99_ms']:.1f} ms")
+
+    return {
+        'concurrency': concurrency,
+        'threads': threads,
+        'delay_ms': delay * 1000,
+        'results': results,
+    }
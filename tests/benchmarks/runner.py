@@ -0,0 +1,248 @@
+import json
+import platform
+import statistics
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, func, select
+
+from backend.models.category import db
+from backend.models.product import Product
+from backend.services.autocomplete_service import AutocompleteService
+from backend.services.category_service import CategoryService
+from backend.services.import_service import ImportService
+from backend.services.product_service import ProductService
+from backend.services.stats_service import StatsService
+from tests.benchmarks.seed import parse_size, seed_catalog
+
+# Casos que recorren toda la tabla: se omiten por encima de este tamaño
+FULL_SCAN_MAX = 100000
+
+# Elementos por llamada en los casos de escritura en bloque e importación
+BULK_ITEMS = 100
+
+
+def service_cases():
+    """Llamadas a los servicios, ejecutadas dentro del contexto de la app"""
+    return {
+        'service.get_all_categories': (
+            CategoryService.get_all_categories, None),
+        'service.get_all_products': (
+            ProductService.get_all_products, FULL_SCAN_MAX),
+        'service.get_products_page': (
+            lambda: ProductService.get_products_page(limit=50), None),
+        'service.get_products_page.sorted_filtered': (
+            lambda: ProductService.get_products_page(
+                limit=50, sort='-price', max_stock=5
+            ), None),
+        'service.get_products_page.category': (
+            lambda: ProductService.get_products_page(
+                limit=50, category_id=1, sort='price'
+            ), None),
+        'service.get_product_by_id': (
+            lambda: ProductService.get_product_by_id(1), None),
+        'service.search_products': (
+            lambda: ProductService.search_products('monitor usb', limit=20),
+            None),
+        'service.get_categories_page': (
+            lambda: CategoryService.get_categories_page(limit=50), None),
+        'service.get_existing_category_ids': (
+            lambda: CategoryService.get_existing_ids(range(1, 51)), None),
+        'service.get_dashboard_stats': (
+            lambda: StatsService.get_dashboard_stats(5, 20, 5), None),
+        'service.autocomplete': (
+            lambda: AutocompleteService.suggest('lam', 'products'), None),
+    }
+
+
+def write_cases():
+    """Escrituras de los servicios; cada caso deshace lo que escribe para
+    que todas las ejecuciones partan del mismo catálogo
+
+    Los valores originales se leen en la ejecución de calentamiento.
+    """
+    ids = list(range(1, BULK_ITEMS + 1))
+    original = {}
+
+    def new_items():
+        return [{'name': f'Benchmark {i}', 'price': 10, 'stock': 1,
+                 'category_id': 1} for i in range(BULK_ITEMS)]
+
+    def create_delete_product():
+        product = ProductService.create_product('Benchmark', 10, 1, 1)
+        ProductService.delete_product(product.id)
+
+    def update_product():
+        name = original.setdefault(
+            'product', ProductService.get_product_by_id(1).name
+        )
+        ProductService.update_product(1, name=f'{name} *')
+        ProductService.update_product(1, name=name)
+
+    def bulk_create_delete_products():
+        created = ProductService.bulk_create_products(new_items())['created']
+        ProductService.bulk_delete_products(created)
+
+    def bulk_update_products():
+        if 'prices' not in original:
+            original['prices'] = dict(db.session.execute(
+                select(Product.id, Product.price).where(Product.id.in_(ids))
+            ).all())
+        prices = original['prices']
+        ProductService.bulk_update_products(
+            [{'id': i, 'price': price + 1} for i, price in prices.items()]
+        )
+        ProductService.bulk_update_products(
+            [{'id': i, 'price': price} for i, price in prices.items()]
+        )
+
+    def bulk_adjust_stock():
+        ProductService.bulk_adjust_stock([{'id': i, 'delta': 1}
+                                          for i in ids])
+        ProductService.bulk_adjust_stock([{'id': i, 'delta': -1}
+                                          for i in ids])
+
+    def import_products():
+        last_id = db.session.scalar(select(func.max(Product.id)))
+        ImportService.import_products(enumerate(new_items(), start=1),
+                                      chunk_size=BULK_ITEMS)
+        # La importación no retorna IDs: se eliminan los nuevos por rango
+        db.session.execute(delete(Product).where(Product.id > last_id))
+        db.session.commit()
+
+    def create_delete_category():
+        category = CategoryService.create_category('Benchmark')
+        CategoryService.delete_category(category.id)
+
+    def update_category():
+        name = original.setdefault(
+            'category', CategoryService.get_category_by_id(1).name
+        )
+        CategoryService.update_category(1, f'{name} *')
+        CategoryService.update_category(1, name)
+
+    return {
+        'service.create_product+delete_product': (
+            create_delete_product, None),
+        'service.update_product': (update_product, None),
+        'service.adjust_stock': (
+            lambda: (ProductService.adjust_stock(1, 1),
+                     ProductService.adjust_stock(1, -1)), None),
+        'service.bulk_create_products+bulk_delete_products': (
+            bulk_create_delete_products, None),
+        'service.bulk_update_products': (bulk_update_products, None),
+        'service.bulk_adjust_stock': (bulk_adjust_stock, None),
+        'service.import_products': (import_products, None),
+        'service.create_category+delete_category': (
+            create_delete_category, None),
+        'service.update_category': (update_category, None),
+    }
+
+
+def controller_cases(client):
+    """Peticiones HTTP a través del cliente de pruebas de Flask"""
+    def get(url):
+        def call():
+            response = client.get(url)
+            response.get_data()
+            if response.status_code != 200:
+                raise RuntimeError(f"{url}: {response.status_code}")
+        return call
+
+    return {
+        'http.GET /api/products': (get('/api/products'), None),
+        'http.GET /api/products?limit=500': (
+            get('/api/products?limit=500'), None),
+        'http.GET /api/products?sort=-price&max_stock=5': (
+            get('/api/products?sort=-price&max_stock=5'), None),
+        'http.GET /api/products/1': (get('/api/products/1'), None),
+        'http.GET /api/products/search': (
+            get('/api/products/search?q=monitor'), None),
+        'http.GET /api/products/export': (
+            get('/api/products/export?format=ndjson&category_id=1'), None),
+        'http.GET /api/categories': (get('/api/categories'), None),
+        'http.GET /api/stats': (get('/api/stats'), None),
+        'http.GET /api/autocomplete': (
+            get('/api/autocomplete?q=lam'), None),
+    }
+
+
+def time_call(call, repeat):
+    """Ejecuta una vez de calentamiento y mide repeat ejecuciones
+
+    La sesión se descarta antes de cada ejecución para que el mapa de
+    identidad no evite las consultas.
+    """
+    call()
+    timings = []
+    for _ in range(repeat):
+        db.session.remove()
+        start = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        'runs': repeat,
+        'min_ms': round(timings[0], 3),
+        'median_ms': round(statistics.median(timings), 3),
+        'max_ms': round(timings[-1], 3),
+    }
+
+
+def run_benchmarks(app, size, repeat=5, only=None, log=print):
+    """Siembra el catálogo y mide cada caso; retorna el documento de
+    resultados"""
+    products = parse_size(size)
+    results = {}
+
+    with app.app_context():
+        if seed_catalog(products):
+            log(f"Catálogo sembrado con {products} productos")
+
+        cases = {**service_cases(), **write_cases(),
+                 **controller_cases(app.test_client())}
+        for name, (call, max_size) in cases.items():
+            if only and only not in name:
+                continue
+            if max_size is not None and products > max_size:
+                log(f"  {name}: omitido (> {max_size} productos)")
+                continue
+            results[name] = time_call(call, repeat)
+            log(f"  {name}: {results[name]['median_ms']:.3f} ms")
+
+    return {
+        'size': products,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold):
+    """Casos cuya mediana empeora más que threshold (0.25 = 25 %)"""
+    regressions = []
+    for name, result in current['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if not previous or not previous['median_ms']:
+            continue
+        ratio = result['median_ms'] / previous['median_ms']
+        if ratio > 1 + threshold:
+            regressions.append({
+                'name': name,
+                'baseline_ms': previous['median_ms'],
+                'current_ms': result['median_ms'],
+                'ratio': round(ratio, 2),
+            })
+    return regressions
+
+
+def load_results(path):
+    """Lee un archivo de resultados"""
+    with open(path) as results_file:
+        return json.load(results_file)
+
+
+def save_results(path, results):
+    """Escribe los resultados en JSON"""
+    with open(path, 'w') as results_file:
+        json.dump(results, results_file, indent=2, ensure_ascii=False)
@@ -0,0 +1,68 @@
+import random
+
+from sqlalchemy import func, insert, select
+
+from backend.models.category import Category, db
+from backend.models.product import Product
+
+SEED_CHUNK = 10000
+WORDS = [
+    'laptop', 'mouse', 'teclado', 'monitor', 'cable', 'silla', 'mesa',
+    'lámpara', 'cámara', 'audífonos', 'parlante', 'cargador', 'router',
+    'impresora', 'tablet', 'disco', 'memoria', 'batería', 'adaptador',
+    'micrófono', 'escritorio', 'ventilador', 'control', 'soporte'
+]
+ADJECTIVES = [
+    'inalámbrico', 'portátil', 'gamer', 'profesional', 'compacto', 'negro',
+    'blanco', 'ergonómico', 'usb', 'hdmi', 'básico', 'premium'
+]
+
+
+def parse_size(size):
+    """Convierte '1k', '100k' o '1m' en un número de productos"""
+    text = str(size).strip().lower()
+    multiplier = {'k': 1000, 'm': 1000000}.get(text[-1:], 1)
+    number = text[:-1] if multiplier > 1 else text
+    try:
+        value = int(number) * multiplier
+    except ValueError:
+        raise ValueError(f"Tamaño de catálogo inválido: {size}")
+    if value < 1:
+        raise ValueError(f"Tamaño de catálogo inválido: {size}")
+    return value
+
+
+def seed_catalog(products, seed=42):
+    """Crea un catálogo determinista si la base no tiene ya ese tamaño"""
+    current = db.session.scalar(select(func.count(Product.id)))
+    if current == products:
+        return False
+
+    db.drop_all()
+    db.create_all()
+
+    rng = random.Random(seed)
+    category_count = max(10, products // 1000)
+    db.session.execute(insert(Category), [
+        {'name': f'Categoría {i:05d}'} for i in range(1, category_count + 1)
+    ])
+
+    for start in range(0, products, SEED_CHUNK):
+        rows = []
+        for _ in range(start, min(start + SEED_CHUNK, products)):
+            name = f'{rng.choice(WORDS).capitalize()} ' \
+                   f'{rng.choice(ADJECTIVES)} {rng.randint(1, 9999)}'
+            rows.append({
+                'name': name,
+                'description': ' '.join(rng.choices(WORDS + ADJECTIVES,
+                                                    k=8)),
+                'price': round(rng.uniform(1, 5000), 2),
+                'stock': rng.randint(0, 500),
+                'category_id': rng.randint(1, category_count)
+            })
+        db.session.execute(insert(Product), rows)
+        db.session.commit()
+
+    db.session.execute(db.text("ANALYZE"))
+    db.session.commit()
+    return True
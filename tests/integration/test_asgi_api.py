@@ -0,0 +1,242 @@
+import asyncio
+import gzip
+import json
+import threading
+import time
+
+import pytest
+
+pytest.importorskip('aiosqlite')
+pytest.importorskip('asgiref')
+
+from backend.asgi import create_asgi_app  # noqa: E402
+from backend.models.category import db  # noqa: E402
+
+
+@pytest.fixture
+def asgi_app(tmp_path):
+    """Crea una aplicación ASGI de prueba que registra todas las consultas"""
+    asgi_app = create_asgi_app('testing', {
+        'SLOW_QUERY_THRESHOLD_MS': 0,
+        'SLOW_QUERY_LOG': str(tmp_path / 'slow_queries.log')
+    })
+    with asgi_app.flask_app.app_context():
+        db.create_all()
+        yield asgi_app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(asgi_app):
+    """Cliente de prueba de la aplicación Flask subyacente"""
+    return asgi_app.flask_app.test_client()
+
+
+@pytest.fixture
+def category(client):
+    """Crea una categoría con productos"""
+    category = json.loads(client.post(
+        '/api/categories',
+        data=json.dumps({'name': 'Electrónica'}),
+        content_type='application/json'
+    ).data)
+    client.post('/api/products/bulk',
+                data=json.dumps({'items': [{
+                    'name': f'Monitor {i}',
+                    'price': 100 + i,
+                    'stock': i,
+                    'category_id': category['id']
+                } for i in range(50)]}),
+                content_type='application/json')
+    return category
+
+
+async def call(asgi_app, path, query='', method='GET', headers=None,
+               body=b''):
+    """Ejecuta una petición ASGI y retorna (estado, encabezados, cuerpo)"""
+    headers = dict(headers or {})
+    if body:
+        headers['Content-Length'] = str(len(body))
+
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'},
+        'http_version': '1.1', 'method': method, 'scheme': 'http',
+        'path': path, 'raw_path': path.encode(), 'root_path': '',
+        'query_string': query.encode(),
+        'headers': [(name.lower().encode(), value.encode())
+                    for name, value in headers.items()],
+        'server': ('testserver', 80), 'client': ('127.0.0.1', 1234),
+    }
+    messages = [{'type': 'http.request', 'body': body,
+                 'more_body': False}]
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await asyncio.Event().wait()
+
+    response = {'body': b''}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+            response['headers'] = {
+                name.decode().lower(): value.decode()
+                for name, value in message['headers']
+            }
+        else:
+            response['body'] += message.get('body', b'')
+
+    await asgi_app(scope, receive, send)
+    return response['status'], response['headers'], response['body']
+
+
+def request(asgi_app, path, *args, **kwargs):
+    """Ejecuta una petición ASGI en su propio bucle de eventos"""
+    async def run():
+        try:
+            return await call(asgi_app, path, *args, **kwargs)
+        finally:
+            await asgi_app.flask_app.extensions['async_engine'].dispose()
+
+    return asyncio.run(run())
+
+
+class TestAsgiAPI:
+    """Pruebas de integración para el modo ASGI"""
+
+    def test_products_page_matches_sync(self, asgi_app, client, category):
+        """Prueba que el listado asíncrono responda igual que el síncrono"""
+        sync = client.get('/api/products?limit=20&sort=-price')
+        status, headers, body = request(asgi_app, '/api/products',
+                                        'limit=20&sort=-price')
+
+        assert status == 200
+        assert json.loads(body) == sync.get_json()
+        # El ETag es intercambiable entre ambos modos
+        assert headers['etag'] == sync.headers['ETag']
+        assert headers['cache-control'] == 'no-cache'
+
+    def test_fields_match_sync(self, asgi_app, client, category):
+        """Prueba que fields responda igual en ambos modos"""
+        sync = client.get('/api/products?fields=id,stock&sort=-stock')
+        status, _, body = request(asgi_app, '/api/products',
+                                  'fields=id,stock&sort=-stock')
+
+        assert status == 200
+        assert json.loads(body) == sync.get_json()
+        assert set(json.loads(body)['items'][0]) == {'id', 'stock'}
+
+    def test_not_modified(self, asgi_app, client, category):
+        """Prueba responder 304 con el ETag del modo síncrono"""
+        etag = client.get('/api/categories').headers['ETag']
+        status, headers, body = request(asgi_app, '/api/categories',
+                                        headers={'If-None-Match': etag})
+
+        assert status == 304
+        assert body == b''
+        assert headers['etag'] == etag
+
+    def test_invalid_parameters(self, asgi_app, category):
+        """Prueba los errores de validación y la categoría inexistente"""
+        status, _, body = request(asgi_app, '/api/products',
+                                  'sort=description')
+        assert status == 400
+        assert 'Solo se puede ordenar' in json.loads(body)['error']
+
+        status, _, body = request(asgi_app, '/api/products',
+                                  'category_id=999')
+        assert status == 400
+        assert json.loads(body)['error'] == 'Categoría no encontrada'
+
+    def test_search_compressed(self, asgi_app, category):
+        """Prueba buscar y comprimir la respuesta con gzip"""
+        status, headers, body = request(asgi_app, '/api/products/search',
+                                        'q=monitor&limit=50',
+                                        headers={'Accept-Encoding': 'gzip'})
+
+        assert status == 200
+        assert headers['content-encoding'] == 'gzip'
+        assert headers['etag'].endswith('-gzip"')
+        items = json.loads(gzip.decompress(body))['items']
+        assert len(items) == 50
+        # Los mismos campos que el listado (sin la columna interna rank)
+        _, _, body = request(asgi_app, '/api/products', 'limit=1')
+        assert set(items[0]) == set(json.loads(body)['items'][0])
+
+    def test_export_streams_ndjson(self, asgi_app, category):
+        """Prueba exportar por lotes desde el motor asíncrono"""
+        asgi_app.flask_app.config['EXPORT_BATCH_SIZE'] = 7
+        status, headers, body = request(asgi_app, '/api/products/export',
+                                        'format=ndjson')
+
+        assert status == 200
+        assert headers['content-type'] == 'application/x-ndjson'
+        lines = [json.loads(line) for line in body.decode().splitlines()]
+        assert [line['id'] for line in lines] == list(range(1, 51))
+        assert lines[0]['category_name'] == 'Electrónica'
+
+    def test_other_routes_delegated(self, asgi_app, category):
+        """Prueba que las escrituras pasen por la aplicación Flask"""
+        status, _, body = request(
+            asgi_app, '/api/categories', method='POST',
+            headers={'Content-Type': 'application/json'},
+            body=json.dumps({'name': 'Hogar'}).encode()
+        )
+        assert status == 201
+
+        status, _, body = request(asgi_app, '/api/categories')
+        assert [c['name'] for c in json.loads(body)['items']] == [
+            'Electrónica', 'Hogar'
+        ]
+
+    def test_metrics_and_slow_queries(self, asgi_app, client, category):
+        """Prueba medir las rutas asíncronas en /metrics y en el log"""
+        status, headers, _ = request(asgi_app, '/api/products',
+                                     'category_id=1')
+        assert status == 200
+        assert headers['server-timing'].startswith('db;dur=')
+
+        text = client.get('/metrics').get_data(as_text=True)
+        assert ('http_requests_total{method="GET",endpoint="/api/products",'
+                'status="200"} 1') in text
+        assert 'db_queries_total{method="GET",endpoint="/api/products"}' \
+            in text
+
+        entry = next(
+            entry for entry in
+            client.get('/admin/slow-queries').get_json()['items']
+            if entry['endpoint'] == 'GET /api/products'
+            and 'FROM products' in entry['statement']
+        )
+        assert any('ix_products_category' in step for step in entry['plan'])
+
+    def test_database_error_returns_json(self, asgi_app, category):
+        """Prueba responder 500 en JSON si falla la consulta de versiones"""
+        db.session.execute(db.text("DROP TABLE table_versions"))
+        db.session.commit()
+
+        status, headers, body = request(asgi_app, '/api/products')
+        assert status == 500
+        assert headers['content-type'] == 'application/json'
+        assert 'table_versions' in json.loads(body)['error']
+
+    def test_delegated_routes_run_in_parallel(self, asgi_app):
+        """Prueba que las rutas de Flask se repartan en el pool de hilos"""
+        asgi_app.flask_app.add_url_rule(
+            '/slow', 'slow',
+            lambda: (time.sleep(0.2), str(threading.get_ident()))[1]
+        )
+
+        async def run():
+            return await asyncio.gather(*(call(asgi_app, '/slow')
+                                          for _ in range(4)))
+
+        start = time.perf_counter()
+        responses = asyncio.run(run())
+        elapsed = time.perf_counter() - start
+
+        assert [status for status, _, _ in responses] == [200] * 4
+        assert len({body for _, _, body in responses}) == 4
+        assert elapsed < 0.6
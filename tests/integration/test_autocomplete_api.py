@@ -0,0 +1,105 @@
+import pytest
+import json
+from sqlalchemy import event
+from backend.app import create_app
+from backend.models.category import db
+
+
+@pytest.fixture
+def app():
+    """Crea una aplicación de prueba"""
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Cliente de prueba"""
+    return app.test_client()
+
+
+@pytest.fixture
+def category(client):
+    """Crea una categoría de prueba"""
+    response = client.post('/api/categories',
+                           data=json.dumps({'name': 'Electrónica'}),
+                           content_type='application/json')
+    return json.loads(response.data)
+
+
+def create_product(client, category, name):
+    """Crea un producto vía API y retorna su JSON"""
+    response = client.post('/api/products',
+                           data=json.dumps({'name': name, 'price': 10,
+                                            'stock': 1,
+                                            'category_id': category['id']}),
+                           content_type='application/json')
+    return json.loads(response.data)
+
+
+def suggestions(client, query, kind='products'):
+    """Nombres sugeridos por el autocompletado"""
+    response = client.get(f'/api/autocomplete?type={kind}&q={query}')
+    assert response.status_code == 200
+    return [item['name'] for item in json.loads(response.data)['items']]
+
+
+class TestAutocompleteAPI:
+    """Pruebas de integración para el autocompletado"""
+
+    def test_autocomplete_products_api(self, client, category):
+        """Prueba sugerir productos por prefijo"""
+        for name in ['Laptop Gamer', 'Lámpara', 'Mouse']:
+            create_product(client, category, name)
+        assert suggestions(client, 'la') == ['Lámpara', 'Laptop Gamer']
+
+    def test_autocomplete_categories_api(self, client, category):
+        """Prueba sugerir categorías por prefijo"""
+        assert suggestions(client, 'ELEC', 'categories') == ['Electrónica']
+
+    def test_autocomplete_follows_writes(self, client, category):
+        """Prueba que el índice cargado refleje las escrituras"""
+        product = create_product(client, category, 'Laptop')
+        assert suggestions(client, 'lap') == ['Laptop']
+
+        client.put(f"/api/products/{product['id']}",
+                   data=json.dumps({'name': 'Tablet'}),
+                   content_type='application/json')
+        assert suggestions(client, 'lap') == []
+        assert suggestions(client, 'tab') == ['Tablet']
+
+        client.post('/api/products/bulk',
+                    data=json.dumps({'items': [{
+                        'name': 'Teclado', 'price': 10, 'stock': 1,
+                        'category_id': category['id']
+                    }]}),
+                    content_type='application/json')
+        assert suggestions(client, 't') == ['Tablet', 'Teclado']
+
+        client.delete(f"/api/products/{product['id']}")
+        assert suggestions(client, 't') == ['Teclado']
+
+    def test_autocomplete_served_from_memory(self, app, client, category):
+        """Prueba que las consultas no accedan a la base una vez cargado"""
+        create_product(client, category, 'Laptop')
+        suggestions(client, 'l')
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, many):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', count)
+        try:
+            assert suggestions(client, 'lap') == ['Laptop']
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', count)
+        assert statements == []
+
+    def test_autocomplete_invalid_type_api(self, client):
+        """Prueba un tipo de autocompletado no soportado"""
+        response = client.get('/api/autocomplete?type=users&q=a')
+        assert response.status_code == 400
@@ -45,6 +45,19 @@ class TestCategoryAPI:
         )
         assert response.status_code == 400
 
+    def test_create_category_duplicate_accented_api(self, client):
+        """Prueba rechazar un nombre que solo cambia mayúsculas con tilde"""
+        client.post('/api/categories',
+                    data=json.dumps({'name': 'Electrónica'}),
+                    content_type='application/json')
+        response = client.post(
+            '/api/categories',
+            data=json.dumps({'name': 'ELECTRÓNICA'}),
+            content_type='application/json'
+        )
+        assert response.status_code == 400
+        assert 'Ya existe' in json.loads(response.data)['error']
+
     def test_get_all_categories_api(self, client):
         """Prueba obtener todas las categorías vía API"""
         client.post('/api/categories',
@@ -57,7 +70,30 @@ class TestCategoryAPI:
         response = client.get('/api/categories')
         assert response.status_code == 200
         data = json.loads(response.data)
-        assert len(data) == 2
+        assert len(data['items']) == 2
+        assert data['next_cursor'] is None
+
+    def test_get_categories_limit_api(self, client):
+        """Prueba el tamaño de página y el cursor de categorías"""
+        for name in ['Electrónica', 'Ropa', 'Hogar']:
+            client.post('/api/categories',
+                        data=json.dumps({'name': name}),
+                        content_type='application/json')
+
+        first = json.loads(client.get('/api/categories?limit=2').data)
+        assert [c['name'] for c in first['items']] == ['Electrónica', 'Ropa']
+        assert first['next_cursor'] is not None
+
+        second = json.loads(client.get(
+            f"/api/categories?limit=2&after={first['next_cursor']}"
+        ).data)
+        assert [c['name'] for c in second['items']] == ['Hogar']
+        assert second['next_cursor'] is None
+
+    def test_get_categories_invalid_limit_api(self, client):
+        """Prueba un límite de página inválido"""
+        response = client.get('/api/categories?limit=0')
+        assert response.status_code == 400
 
     def test_get_category_by_id_api(self, client):
         """Prueba obtener categoría por ID vía API"""
@@ -111,6 +147,26 @@ class TestCategoryAPI:
         get_response = client.get(f'/api/categories/{category_id}')
         assert get_response.status_code == 404
 
+    def test_get_categories_fields_api(self, client):
+        """Prueba pedir solo algunos campos de categorías vía API"""
+        for name in ['Electrónica', 'Hogar']:
+            client.post('/api/categories',
+                        data=json.dumps({'name': name}),
+                        content_type='application/json')
+
+        response = client.get('/api/categories?fields=name&limit=1')
+        data = json.loads(response.data)
+        assert data['items'] == [{'name': 'Electrónica'}]
+
+        response = client.get(
+            f"/api/categories?fields=name&after={data['next_cursor']}"
+        )
+        assert json.loads(response.data)['items'] == [{'name': 'Hogar'}]
+
+        response = client.get('/api/categories/2?fields=product_count')
+        assert json.loads(response.data) == {'product_count': 0}
+        assert client.get('/api/categories?fields=x').status_code == 400
+
     def test_health_endpoint(self, client):
         """Prueba endpoint de health check"""
         response = client.get('/health')
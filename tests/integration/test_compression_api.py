@@ -0,0 +1,94 @@
+import pytest
+import gzip
+import json
+from backend.app import create_app
+from backend.models.category import db
+
+
+@pytest.fixture
+def app():
+    """Crea una aplicación de prueba"""
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Cliente de prueba"""
+    return app.test_client()
+
+
+@pytest.fixture
+def products(client):
+    """Crea suficientes productos para superar el umbral de compresión"""
+    category = json.loads(client.post(
+        '/api/categories',
+        data=json.dumps({'name': 'Electrónica'}),
+        content_type='application/json'
+    ).data)
+    client.post('/api/products/bulk',
+                data=json.dumps({'items': [{
+                    'name': f'Producto {i}',
+                    'price': 10,
+                    'stock': i,
+                    'category_id': category['id']
+                } for i in range(100)]}),
+                content_type='application/json')
+    return category
+
+
+GZIP = {'Accept-Encoding': 'gzip'}
+
+
+class TestCompressionAPI:
+    """Pruebas de integración para la compresión de respuestas"""
+
+    def test_gzip_list_api(self, client, products):
+        """Prueba comprimir un listado grande"""
+        plain = client.get('/api/products?limit=100')
+        response = client.get('/api/products?limit=100', headers=GZIP)
+
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert len(response.data) < len(plain.data) / 3
+        assert gzip.decompress(response.data) == plain.data
+
+    def test_small_response_not_compressed(self, client, products):
+        """Prueba no comprimir por debajo del umbral"""
+        response = client.get('/api/products?limit=1', headers=GZIP)
+        assert 'Content-Encoding' not in response.headers
+
+    def test_not_accepted_not_compressed(self, client, products):
+        """Prueba respetar Accept-Encoding"""
+        response = client.get('/api/products?limit=100',
+                              headers={'Accept-Encoding': 'gzip;q=0, br'})
+        assert 'Content-Encoding' not in response.headers
+
+    def test_gzip_streamed_export_api(self, app, client, products):
+        """Prueba comprimir una exportación en streaming por bloques"""
+        app.config['EXPORT_BATCH_SIZE'] = 10
+        plain = client.get('/api/products/export?format=csv')
+        response = client.get('/api/products/export?format=csv',
+                              headers=GZIP)
+
+        assert response.is_streamed
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Content-Length' not in response.headers
+        assert gzip.decompress(response.data) == plain.data
+
+    def test_etag_per_encoding(self, client, products):
+        """Prueba que el ETag distinga la representación comprimida"""
+        plain = client.get('/api/products?limit=100')
+        response = client.get('/api/products?limit=100', headers=GZIP)
+        assert response.headers['ETag'] != plain.headers['ETag']
+
+        revalidated = client.get('/api/products?limit=100', headers={
+            'Accept-Encoding': 'gzip',
+            'If-None-Match': response.headers['ETag']
+        })
+        assert revalidated.status_code == 304
+        assert revalidated.headers['ETag'] == response.headers['ETag']
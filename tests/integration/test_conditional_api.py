@@ -0,0 +1,107 @@
+import pytest
+import json
+from sqlalchemy import event
+from backend.app import create_app
+from backend.models.category import db
+
+
+@pytest.fixture
+def app():
+    """Crea una aplicación de prueba"""
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Cliente de prueba"""
+    return app.test_client()
+
+
+@pytest.fixture
+def category(client):
+    """Crea una categoría de prueba"""
+    response = client.post('/api/categories',
+                           data=json.dumps({'name': 'Electrónica'}),
+                           content_type='application/json')
+    return json.loads(response.data)
+
+
+class TestConditionalAPI:
+    """Pruebas de integración para las peticiones condicionales (ETag)"""
+
+    def test_etag_present(self, client, category):
+        """Prueba que los listados incluyen ETag y Cache-Control"""
+        response = client.get('/api/products')
+        assert response.status_code == 200
+        assert response.headers['ETag']
+        assert response.headers['Cache-Control'] == 'no-cache'
+
+    def test_not_modified(self, client, category):
+        """Prueba responder 304 si el ETag del cliente coincide"""
+        etag = client.get('/api/categories').headers['ETag']
+        response = client.get('/api/categories',
+                              headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.headers['ETag'] == etag
+        assert response.data == b''
+
+    def test_etag_changes_after_write(self, client, category):
+        """Prueba que una escritura invalida el ETag de las lecturas"""
+        etag = client.get('/api/stats').headers['ETag']
+        client.post('/api/products',
+                    data=json.dumps({'name': 'Laptop', 'price': 999.99,
+                                     'stock': 10,
+                                     'category_id': category['id']}),
+                    content_type='application/json')
+        response = client.get('/api/stats', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+
+    def test_etag_depends_on_query(self, client, category):
+        """Prueba que cada combinación de parámetros tiene su ETag"""
+        first = client.get('/api/products?limit=1').headers['ETag']
+        second = client.get('/api/products?limit=2').headers['ETag']
+        assert first != second
+
+    def test_product_write_changes_category_etag(self, client, category):
+        """Prueba que crear un producto invalida el detalle de su categoría"""
+        etag = client.get(f"/api/categories/{category['id']}").headers['ETag']
+        client.post('/api/products',
+                    data=json.dumps({'name': 'Laptop', 'price': 999.99,
+                                     'stock': 10,
+                                     'category_id': category['id']}),
+                    content_type='application/json')
+        response = client.get(f"/api/categories/{category['id']}",
+                              headers={'If-None-Match': etag})
+        # El trigger de product_count también versiona la tabla categories
+        assert response.status_code == 200
+
+    def test_not_modified_skips_view(self, app, client, category):
+        """Prueba que el 304 solo ejecuta la consulta de versiones"""
+        etag = client.get('/api/products').headers['ETag']
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, many):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', count)
+        try:
+            response = client.get('/api/products',
+                                  headers={'If-None-Match': etag})
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', count)
+
+        assert response.status_code == 304
+        assert len(statements) == 1
+        assert 'table_versions' in statements[0]
+
+    def test_error_has_no_etag(self, client):
+        """Prueba que las respuestas de error no llevan ETag"""
+        response = client.get('/api/products/999')
+        assert response.status_code == 404
+        assert 'ETag' not in response.headers
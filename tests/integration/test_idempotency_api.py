@@ -0,0 +1,217 @@
+import pytest
+import json
+import time
+from sqlalchemy import event
+from backend.app import create_app
+from backend.controllers.idempotency import request_fingerprint
+from backend.models.category import db
+from backend.models.idempotency_key import IdempotencyKey
+from backend.models.product import Product
+from backend.services.idempotency_service import IdempotencyService
+
+
+@pytest.fixture
+def app():
+    """Crea una aplicación de prueba"""
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Cliente de prueba"""
+    return app.test_client()
+
+
+@pytest.fixture
+def category(client):
+    """Crea una categoría"""
+    return json.loads(client.post(
+        '/api/categories',
+        data=json.dumps({'name': 'Electrónica'}),
+        content_type='application/json'
+    ).data)
+
+
+def post_product(client, category, key, name='Laptop'):
+    """Crea un producto enviando una Idempotency-Key"""
+    return client.post('/api/products',
+                       data=json.dumps({'name': name, 'price': 1500,
+                                        'stock': 10,
+                                        'category_id': category['id']}),
+                       content_type='application/json',
+                       headers={'Idempotency-Key': key})
+
+
+class TestIdempotencyAPI:
+    """Pruebas de integración para las claves de idempotencia"""
+
+    def test_retry_replays_response(self, app, client, category):
+        """Prueba que un reintento no cree un producto duplicado"""
+        first = post_product(client, category, 'scan-1')
+        retry = post_product(client, category, 'scan-1')
+
+        assert first.status_code == retry.status_code == 201
+        assert retry.get_json() == first.get_json()
+        assert retry.headers['Idempotent-Replayed'] == 'true'
+        assert 'Idempotent-Replayed' not in first.headers
+        with app.app_context():
+            assert Product.query.count() == 1
+
+    def test_other_key_executes_again(self, app, client, category):
+        """Prueba que claves distintas sean peticiones distintas"""
+        post_product(client, category, 'scan-1')
+        response = post_product(client, category, 'scan-2')
+
+        assert response.status_code == 201
+        with app.app_context():
+            assert Product.query.count() == 2
+
+    def test_key_reused_with_other_body(self, client, category):
+        """Prueba rechazar una clave reutilizada con otro cuerpo"""
+        post_product(client, category, 'scan-1')
+        response = post_product(client, category, 'scan-1', name='Mouse')
+
+        assert response.status_code == 422
+        assert 'otra petición' in response.get_json()['error']
+
+    def test_client_errors_are_replayed(self, client, category):
+        """Prueba guardar también las respuestas de validación"""
+        def adjust():
+            return client.post('/api/products/999/stock',
+                               data=json.dumps({'delta': -1}),
+                               content_type='application/json',
+                               headers={'Idempotency-Key': 'adjust-1'})
+
+        first, retry = adjust(), adjust()
+        assert first.status_code == retry.status_code == 404
+        assert retry.headers['Idempotent-Replayed'] == 'true'
+
+    def test_request_in_progress(self, app, client, category):
+        """Prueba responder 409 mientras la petición original no termina"""
+        body = json.dumps({'name': 'Laptop', 'price': 1500, 'stock': 10,
+                           'category_id': category['id']})
+        with app.test_request_context('/api/products', method='POST',
+                                      data=body):
+            db.session.add(IdempotencyKey(key='scan-1',
+                                          fingerprint=request_fingerprint(),
+                                          created_at=time.time()))
+            db.session.commit()
+
+        response = post_product(client, category, 'scan-1')
+        assert response.status_code == 409
+
+        # Una reserva abandonada se puede retomar
+        app.config['IDEMPOTENCY_LOCK_TIMEOUT'] = -1
+        assert post_product(client, category, 'scan-1').status_code == 201
+
+    def test_expired_key_executes_again(self, app, client, category):
+        """Prueba que una clave vencida vuelva a ejecutar la escritura"""
+        post_product(client, category, 'scan-1')
+        app.config['IDEMPOTENCY_TTL'] = -1
+        response = post_product(client, category, 'scan-1')
+
+        assert response.status_code == 201
+        assert 'Idempotent-Replayed' not in response.headers
+        with app.app_context():
+            assert Product.query.count() == 2
+
+    def test_category_update_replayed(self, client, category):
+        """Prueba repetir la respuesta de una actualización de categoría"""
+        def rename(name):
+            return client.put(f"/api/categories/{category['id']}",
+                              data=json.dumps({'name': name}),
+                              content_type='application/json',
+                              headers={'Idempotency-Key': 'rename-1'})
+
+        assert rename('Tecnología').status_code == 200
+        retry = rename('Tecnología')
+        assert retry.status_code == 200
+        assert retry.get_json()['name'] == 'Tecnología'
+        assert retry.headers['Idempotent-Replayed'] == 'true'
+
+    def test_invalid_key(self, client, category):
+        """Prueba rechazar una clave demasiado larga"""
+        response = post_product(client, category, 'x' * 256)
+        assert response.status_code == 400
+
+    def test_reservation_commits_with_write(self, app, client, category):
+        """Prueba que la reserva no agregue su propia transacción"""
+        # La primera petición con clave además purga las vencidas
+        post_product(client, category, 'scan-0', name='Mouse')
+        commits = []
+        with app.app_context():
+            engine = db.engine
+
+        def listener(conn):
+            commits.append(conn)
+
+        event.listen(engine, 'commit', listener)
+        try:
+            response = post_product(client, category, 'scan-1')
+        finally:
+            event.remove(engine, 'commit', listener)
+
+        # La escritura con su reserva, y la respuesta guardada
+        assert response.status_code == 201
+        assert len(commits) == 2
+
+    def test_concurrent_duplicate_replays_winner(self, app, client,
+                                                 category, monkeypatch):
+        """Prueba que una petición que pierde la carrera por la clave
+        revierta su escritura y repita la respuesta de la ganadora"""
+        reserve = IdempotencyService.reserve
+
+        def reserve_then_lose(key, fingerprint):
+            existing = reserve(key, fingerprint)
+            # Otra petición con la misma clave confirma antes que esta
+            db.session.add(IdempotencyKey(key=key, fingerprint=fingerprint,
+                                          status_code=201,
+                                          body=b'{"id": 99}',
+                                          created_at=time.time()))
+            db.session.commit()
+            return existing
+
+        monkeypatch.setattr(IdempotencyService, 'reserve',
+                            staticmethod(reserve_then_lose))
+        response = post_product(client, category, 'scan-1')
+
+        assert response.status_code == 201
+        assert response.get_json() == {'id': 99}
+        assert response.headers['Idempotent-Replayed'] == 'true'
+        with app.app_context():
+            assert Product.query.count() == 0
+
+    def test_bulk_duplicate_replays_winner(self, app, client, category,
+                                           monkeypatch):
+        """Prueba la misma carrera en una escritura masiva"""
+        reserve = IdempotencyService.reserve
+
+        def reserve_then_lose(key, fingerprint):
+            existing = reserve(key, fingerprint)
+            db.session.add(IdempotencyKey(key=key, fingerprint=fingerprint,
+                                          status_code=201,
+                                          body=b'{"created": []}',
+                                          created_at=time.time()))
+            db.session.commit()
+            return existing
+
+        monkeypatch.setattr(IdempotencyService, 'reserve',
+                            staticmethod(reserve_then_lose))
+        response = client.post(
+            '/api/products/bulk',
+            data=json.dumps({'items': [{'name': 'Laptop', 'price': 1500,
+                                        'stock': 10,
+                                        'category_id': category['id']}]}),
+            content_type='application/json',
+            headers={'Idempotency-Key': 'bulk-1'}
+        )
+
+        assert response.get_json() == {'created': []}
+        assert response.headers['Idempotent-Replayed'] == 'true'
+        with app.app_context():
+            assert Product.query.count() == 0
@@ -0,0 +1,74 @@
+import pytest
+import json
+from backend.app import create_app
+from backend.models.category import db
+
+
+@pytest.fixture
+def app():
+    """Crea una aplicación de prueba"""
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Cliente de prueba"""
+    return app.test_client()
+
+
+class TestMetricsAPI:
+    """Pruebas de integración para las métricas"""
+
+    def test_server_timing_header(self, client):
+        """Prueba que cada respuesta informe tiempo total y de base"""
+        response = client.get('/api/categories')
+        timing = response.headers['Server-Timing']
+        assert timing.startswith('db;dur=')
+        assert 'queries"' in timing
+        assert 'app;dur=' in timing
+
+    def test_metrics_endpoint(self, client):
+        """Prueba exponer contadores e histogramas por ruta"""
+        client.post('/api/categories',
+                    data=json.dumps({'name': 'Electrónica'}),
+                    content_type='application/json')
+        client.get('/api/categories/1')
+        client.get('/api/categories/999')
+
+        response = client.get('/metrics')
+        assert response.status_code == 200
+        assert response.mimetype == 'text/plain'
+        text = response.get_data(as_text=True)
+
+        route = 'endpoint="/api/categories/<int:category_id>"'
+        assert (f'http_requests_total{{method="GET",{route},status="200"}} 1'
+                in text)
+        assert (f'http_requests_total{{method="GET",{route},status="404"}} 1'
+                in text)
+        assert '# TYPE http_request_duration_seconds histogram' in text
+        assert (f'http_request_duration_seconds_count{{method="GET",{route}}}'
+                ' 2' in text)
+        assert 'db_queries_total{method="POST",' \
+               'endpoint="/api/categories"}' in text
+
+    def test_unmatched_routes_share_label(self, client):
+        """Prueba que las rutas inexistentes no creen series nuevas"""
+        client.get('/no-existe/1')
+        client.get('/no-existe/2')
+        text = client.get('/metrics').get_data(as_text=True)
+        assert ('http_requests_total{method="GET",endpoint="unmatched",'
+                'status="404"} 2') in text
+
+    def test_failed_statements_leave_no_state(self, app):
+        """Prueba que una sentencia fallida no deje datos en la conexión"""
+        with app.app_context():
+            for _ in range(3):
+                with pytest.raises(Exception):
+                    db.session.execute(db.text("SELECT * FROM inexistente"))
+                db.session.rollback()
+            assert not db.session.connection().info.get('metrics_query_start')
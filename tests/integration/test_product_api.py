@@ -87,7 +87,106 @@ class TestProductAPI:
         response = client.get('/api/products')
         assert response.status_code == 200
         data = json.loads(response.data)
-        assert len(data) == 2
+        assert len(data['items']) == 2
+        assert data['next_cursor'] is None
+
+    def test_get_products_pagination_api(self, client, category):
+        """Prueba recorrer los productos por cursor vía API"""
+        for i in range(5):
+            client.post('/api/products',
+                        data=json.dumps({
+                            'name': f'Producto {i}',
+                            'price': 10,
+                            'stock': 1,
+                            'category_id': category['id']
+                        }),
+                        content_type='application/json')
+
+        names = []
+        url = '/api/products?limit=2'
+        while url:
+            data = json.loads(client.get(url).data)
+            assert len(data['items']) <= 2
+            names.extend(p['name'] for p in data['items'])
+            cursor = data['next_cursor']
+            url = f'/api/products?limit=2&after={cursor}' if cursor else None
+
+        assert names == [f'Producto {i}' for i in range(5)]
+
+    def test_get_products_filtered_api(self, client, category):
+        """Prueba filtrar y ordenar el listado vía API"""
+        for i in range(5):
+            client.post('/api/products',
+                        data=json.dumps({
+                            'name': f'Producto {i}',
+                            'price': 10 * i,
+                            'stock': i,
+                            'category_id': category['id']
+                        }),
+                        content_type='application/json')
+
+        response = client.get('/api/products?min_price=10&max_stock=3'
+                              '&sort=-stock')
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert [p['stock'] for p in data['items']] == [3, 2, 1]
+
+    def test_get_products_invalid_filter_api(self, client):
+        """Prueba filtros y ordenamientos inválidos"""
+        assert client.get('/api/products?sort=description').status_code == 400
+        assert client.get('/api/products?min_price=abc').status_code == 400
+
+    def test_get_products_invalid_cursor_api(self, client):
+        """Prueba un cursor de paginación inválido"""
+        response = client.get('/api/products?after=no-es-un-cursor')
+        assert response.status_code == 400
+
+    def test_search_products_api(self, client, category):
+        """Prueba buscar productos vía API"""
+        for name in ['Laptop Gamer', 'Mouse Inalámbrico', 'Laptop Oficina']:
+            client.post('/api/products',
+                        data=json.dumps({
+                            'name': name,
+                            'price': 10,
+                            'stock': 1,
+                            'category_id': category['id']
+                        }),
+                        content_type='application/json')
+
+        response = client.get('/api/products/search?q=lap&limit=1')
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert len(data['items']) == 1
+        assert data['items'][0]['category_name'] == 'Electrónica'
+
+        response = client.get(
+            f"/api/products/search?q=lap&after={data['next_cursor']}"
+        )
+        data = json.loads(response.data)
+        assert len(data['items']) == 1
+        assert data['next_cursor'] is None
+
+    def test_search_items_match_list_items_api(self, client, category):
+        """Prueba que la búsqueda responda los mismos campos que el listado"""
+        client.post('/api/products',
+                    data=json.dumps({
+                        'name': 'Laptop',
+                        'price': 10,
+                        'stock': 1,
+                        'category_id': category['id']
+                    }),
+                    content_type='application/json')
+
+        listed = json.loads(client.get('/api/products').data)['items'][0]
+        found = json.loads(
+            client.get('/api/products/search?q=laptop').data
+        )['items'][0]
+        assert found == listed
+
+    def test_search_products_without_query_api(self, client):
+        """Prueba buscar sin el parámetro q"""
+        response = client.get('/api/products/search')
+        assert response.status_code == 400
 
     def test_get_product_by_id_api(self, client, category):
         """Prueba obtener producto por ID vía API"""
@@ -108,6 +207,66 @@ class TestProductAPI:
         data = json.loads(response.data)
         assert data['name'] == 'Laptop'
 
+    def test_get_products_fields_api(self, client, category):
+        """Prueba pedir solo algunos campos de productos vía API"""
+        for i in range(3):
+            client.post('/api/products',
+                        data=json.dumps({
+                            'name': f'Producto {i}',
+                            'description': 'Descripción larga',
+                            'price': 10 * i,
+                            'stock': i,
+                            'category_id': category['id']
+                        }),
+                        content_type='application/json')
+
+        response = client.get('/api/products?fields=stock,id,name'
+                              '&sort=-price&limit=2')
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['items'] == [
+            {'id': 3, 'name': 'Producto 2', 'stock': 2},
+            {'id': 2, 'name': 'Producto 1', 'stock': 1},
+        ]
+
+        # El cursor funciona aunque price no se haya pedido
+        response = client.get(f"/api/products?fields=name&sort=-price"
+                              f"&after={data['next_cursor']}")
+        assert json.loads(response.data)['items'] == [{'name': 'Producto 0'}]
+
+        response = client.get('/api/products/search?q=producto&limit=1'
+                              '&fields=category_name')
+        assert json.loads(response.data)['items'] == [
+            {'category_name': 'Electrónica'}
+        ]
+
+        response = client.get('/api/products/1?fields=name,stock')
+        assert json.loads(response.data) == {'name': 'Producto 0',
+                                             'stock': 0}
+
+    def test_get_product_category_name_only_api(self, client, category):
+        """Prueba pedir solo category_name del detalle de un producto"""
+        client.post('/api/products',
+                    data=json.dumps({
+                        'name': 'Laptop',
+                        'price': 999.99,
+                        'stock': 10,
+                        'category_id': category['id']
+                    }),
+                    content_type='application/json')
+
+        response = client.get('/api/products/1?fields=category_name')
+        assert response.status_code == 200
+        assert json.loads(response.data) == {'category_name': 'Electrónica'}
+
+    def test_get_products_invalid_fields_api(self, client, category):
+        """Prueba rechazar campos desconocidos"""
+        response = client.get('/api/products?fields=id,password')
+        assert response.status_code == 400
+        assert 'password' in json.loads(response.data)['error']
+        assert client.get('/api/products/1?fields=rank').status_code == 400
+        assert client.get('/api/products/99?fields=id').status_code == 404
+
     def test_get_products_by_category_api(self, client, category):
         """Prueba obtener productos por categoría vía API"""
         client.post('/api/products',
@@ -122,7 +281,7 @@ class TestProductAPI:
         response = client.get(f'/api/products?category_id={category["id"]}')
         assert response.status_code == 200
         data = json.loads(response.data)
-        assert len(data) >= 1
+        assert len(data['items']) >= 1
 
     def test_update_product_api(self, client, category):
         """Prueba actualizar producto vía API"""
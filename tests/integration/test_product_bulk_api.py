@@ -0,0 +1,158 @@
+import pytest
+import json
+from backend.app import create_app
+from backend.models.category import db
+
+
+@pytest.fixture
+def app():
+    """Crea una aplicación de prueba"""
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Cliente de prueba"""
+    return app.test_client()
+
+
+@pytest.fixture
+def category(client):
+    """Crea una categoría de prueba"""
+    response = client.post(
+        '/api/categories',
+        data=json.dumps({'name': 'Electrónica'}),
+        content_type='application/json'
+    )
+    return json.loads(response.data)
+
+
+def bulk_items(category_id, count):
+    """Genera productos válidos para un lote"""
+    return [{
+        'name': f'Producto {i}',
+        'price': 10 + i,
+        'stock': i,
+        'category_id': category_id
+    } for i in range(count)]
+
+
+class TestProductBulkAPI:
+    """Pruebas de integración para las operaciones en bloque"""
+
+    def test_bulk_create_api(self, client, category):
+        """Prueba crear productos en bloque vía API"""
+        response = client.post(
+            '/api/products/bulk',
+            data=json.dumps({'items': bulk_items(category['id'], 300)}),
+            content_type='application/json'
+        )
+        assert response.status_code == 201
+        data = json.loads(response.data)
+        assert len(data['created']) == 300
+        assert data['errors'] == []
+
+        category_data = json.loads(
+            client.get(f"/api/categories/{category['id']}").data
+        )
+        assert category_data['product_count'] == 300
+
+    def test_bulk_create_reports_item_errors(self, client, category):
+        """Prueba que los errores se reportan por elemento sin escribir"""
+        items = bulk_items(category['id'], 3)
+        items[1]['price'] = -1
+        items[2]['category_id'] = 999
+
+        response = client.post(
+            '/api/products/bulk',
+            data=json.dumps({'items': items}),
+            content_type='application/json'
+        )
+        assert response.status_code == 400
+        data = json.loads(response.data)
+        assert [e['index'] for e in data['errors']] == [1, 2]
+        assert 'precio' in data['errors'][0]['error']
+        assert 'Categoría' in data['errors'][1]['error']
+
+        listing = json.loads(client.get('/api/products').data)
+        assert listing['items'] == []
+
+    def test_bulk_create_chunked_commits(self, app, client, category):
+        """Prueba la escritura con commits por bloques"""
+        app.config['BULK_CHUNK_SIZE'] = 7
+        response = client.post(
+            '/api/products/bulk',
+            data=json.dumps(bulk_items(category['id'], 20)),
+            content_type='application/json'
+        )
+        assert response.status_code == 201
+        assert len(json.loads(response.data)['created']) == 20
+
+    def test_bulk_update_api(self, client, category):
+        """Prueba actualizar productos en bloque vía API"""
+        created = json.loads(client.post(
+            '/api/products/bulk',
+            data=json.dumps({'items': bulk_items(category['id'], 3)}),
+            content_type='application/json'
+        ).data)['created']
+
+        response = client.put(
+            '/api/products/bulk',
+            data=json.dumps({'items': [
+                {'id': created[0], 'stock': 99},
+                {'id': created[2], 'name': 'Renombrado', 'price': 1.5}
+            ]}),
+            content_type='application/json'
+        )
+        assert response.status_code == 200
+        assert json.loads(response.data)['updated'] == 2
+
+        first = json.loads(client.get(f'/api/products/{created[0]}').data)
+        last = json.loads(client.get(f'/api/products/{created[2]}').data)
+        assert first['stock'] == 99
+        assert (last['name'], last['price']) == ('Renombrado', 1.5)
+
+    def test_bulk_update_unknown_product(self, client, category):
+        """Prueba actualizar en bloque un producto inexistente"""
+        response = client.put(
+            '/api/products/bulk',
+            data=json.dumps({'items': [{'id': 999, 'stock': 1}]}),
+            content_type='application/json'
+        )
+        assert response.status_code == 400
+        data = json.loads(response.data)
+        assert data['errors'] == [{'index': 0,
+                                   'error': 'Producto no encontrado'}]
+
+    def test_bulk_delete_api(self, client, category):
+        """Prueba eliminar productos en bloque vía API"""
+        created = json.loads(client.post(
+            '/api/products/bulk',
+            data=json.dumps({'items': bulk_items(category['id'], 4)}),
+            content_type='application/json'
+        ).data)['created']
+
+        response = client.delete(
+            '/api/products/bulk',
+            data=json.dumps({'ids': created[:3]}),
+            content_type='application/json'
+        )
+        assert response.status_code == 200
+        assert json.loads(response.data)['deleted'] == 3
+
+        listing = json.loads(client.get('/api/products').data)
+        assert [p['id'] for p in listing['items']] == [created[3]]
+
+    def test_bulk_requires_items(self, client):
+        """Prueba un lote vacío"""
+        response = client.post(
+            '/api/products/bulk',
+            data=json.dumps({'items': []}),
+            content_type='application/json'
+        )
+        assert response.status_code == 400
@@ -0,0 +1,79 @@
+import pytest
+import csv
+import io
+import json
+from backend.app import create_app
+from backend.models.category import db
+
+
+@pytest.fixture
+def app():
+    """Crea una aplicación de prueba"""
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Cliente de prueba"""
+    return app.test_client()
+
+
+@pytest.fixture
+def products(client):
+    """Crea una categoría con cinco productos"""
+    category = json.loads(client.post(
+        '/api/categories',
+        data=json.dumps({'name': 'Electrónica'}),
+        content_type='application/json'
+    ).data)
+    client.post('/api/products/bulk',
+                data=json.dumps({'items': [{
+                    'name': f'Producto {i}',
+                    'description': 'Con "comillas", y comas' if i == 0 else None,
+                    'price': 10 + i,
+                    'stock': i,
+                    'category_id': category['id']
+                } for i in range(5)]}),
+                content_type='application/json')
+    return category
+
+
+class TestProductExportAPI:
+    """Pruebas de integración para la exportación del catálogo"""
+
+    def test_export_ndjson_api(self, app, client, products):
+        """Prueba exportar en NDJSON leyendo en varios lotes"""
+        app.config['EXPORT_BATCH_SIZE'] = 2
+        response = client.get('/api/products/export?format=ndjson')
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+        assert response.is_streamed
+
+        lines = response.get_data(as_text=True).splitlines()
+        rows = [json.loads(line) for line in lines]
+        assert [row['name'] for row in rows] == [
+            f'Producto {i}' for i in range(5)
+        ]
+        assert rows[0]['category_name'] == 'Electrónica'
+
+    def test_export_csv_api(self, client, products):
+        """Prueba exportar en CSV"""
+        response = client.get('/api/products/export?format=csv')
+        assert response.status_code == 200
+        assert 'products.csv' in response.headers['Content-Disposition']
+
+        reader = csv.DictReader(io.StringIO(response.get_data(as_text=True)))
+        rows = list(reader)
+        assert len(rows) == 5
+        assert rows[0]['description'] == 'Con "comillas", y comas'
+        assert rows[4]['stock'] == '4'
+
+    def test_export_invalid_format(self, client):
+        """Prueba un formato de exportación no soportado"""
+        response = client.get('/api/products/export?format=xml')
+        assert response.status_code == 400
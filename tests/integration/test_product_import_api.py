@@ -0,0 +1,68 @@
+import pytest
+import io
+import json
+from backend.app import create_app
+from backend.models.category import db
+
+
+@pytest.fixture
+def app():
+    """Crea una aplicación de prueba"""
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Cliente de prueba"""
+    return app.test_client()
+
+
+class TestProductImportAPI:
+    """Pruebas de integración para la importación de productos"""
+
+    def test_import_csv_file_api(self, client):
+        """Prueba importar un archivo CSV enviado como formulario"""
+        content = (
+            'name,price,stock,category\n'
+            'Laptop,1500,10,Electrónica\n'
+            'Mouse,abc,5,Electrónica\n'
+        ).encode('utf-8')
+        response = client.post(
+            '/api/products/import',
+            data={'file': (io.BytesIO(content), 'productos.csv')},
+            content_type='multipart/form-data'
+        )
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['imported'] == 1
+        assert data['errors'] == [{'row': 2,
+                                   'error': 'El precio debe ser un valor '
+                                            'numérico'}]
+
+        listing = json.loads(client.get('/api/products').data)
+        assert listing['items'][0]['category_name'] == 'Electrónica'
+
+    def test_import_ndjson_body_api(self, client):
+        """Prueba importar NDJSON enviado en el cuerpo con reanudación"""
+        body = '\n'.join(json.dumps({
+            'name': f'Producto {i}', 'price': 1, 'stock': 1,
+            'category': 'General'
+        }) for i in range(4))
+        response = client.post('/api/products/import?format=ndjson'
+                               '&resume_from=1',
+                               data=body,
+                               content_type='application/x-ndjson')
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['imported'] == 3
+        assert data['checkpoint'] == 4
+
+    def test_import_unknown_format_api(self, client):
+        """Prueba importar sin un formato reconocible"""
+        response = client.post('/api/products/import', data='x')
+        assert response.status_code == 400
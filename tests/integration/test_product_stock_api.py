@@ -0,0 +1,133 @@
+import pytest
+import json
+import threading
+from backend.app import create_app
+from backend.models.category import db
+
+
+@pytest.fixture
+def app():
+    """Crea una aplicación de prueba"""
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Cliente de prueba"""
+    return app.test_client()
+
+
+@pytest.fixture
+def products(client):
+    """Crea dos productos con stock 10 y 0"""
+    category = json.loads(client.post(
+        '/api/categories',
+        data=json.dumps({'name': 'Electrónica'}),
+        content_type='application/json'
+    ).data)
+    response = client.post('/api/products/bulk',
+                           data=json.dumps({'items': [
+                               {'name': 'Laptop', 'price': 10, 'stock': 10,
+                                'category_id': category['id']},
+                               {'name': 'Mouse', 'price': 5, 'stock': 0,
+                                'category_id': category['id']}
+                           ]}),
+                           content_type='application/json')
+    return json.loads(response.data)['created']
+
+
+def adjust(client, product_id, delta):
+    """Envía un ajuste de stock"""
+    return client.post(f'/api/products/{product_id}/stock',
+                       data=json.dumps({'delta': delta}),
+                       content_type='application/json')
+
+
+class TestProductStockAPI:
+    """Pruebas de integración para los ajustes de stock"""
+
+    def test_adjust_stock_api(self, client, products):
+        """Prueba sumar y restar stock"""
+        response = adjust(client, products[0], -3)
+        assert response.status_code == 200
+        assert json.loads(response.data) == {'id': products[0], 'stock': 7}
+
+        response = adjust(client, products[1], 4)
+        assert json.loads(response.data)['stock'] == 4
+
+    def test_adjust_stock_insufficient_api(self, client, products):
+        """Prueba que el stock no quede negativo"""
+        response = adjust(client, products[0], -11)
+        assert response.status_code == 400
+        assert json.loads(response.data)['error'] == "Stock insuficiente"
+
+        product = json.loads(client.get(f'/api/products/{products[0]}').data)
+        assert product['stock'] == 10
+
+    def test_adjust_stock_invalid_api(self, client, products):
+        """Prueba un producto inexistente y un delta inválido"""
+        response = adjust(client, 999, 1)
+        assert response.status_code == 404
+        assert json.loads(response.data)['error'] == "Producto no encontrado"
+        assert adjust(client, products[0], 1.5).status_code == 400
+        assert adjust(client, products[0], 'abc').status_code == 400
+
+    def test_adjust_stock_concurrently(self, app, products):
+        """Prueba que los ajustes concurrentes no pierdan actualizaciones"""
+        results = []
+
+        def pick():
+            client = app.test_client()
+            for _ in range(3):
+                results.append(adjust(client, products[0], -1).status_code)
+
+        threads = [threading.Thread(target=pick) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # 15 intentos sobre 10 unidades: exactamente 10 confirmados
+        assert results.count(200) == 10
+        assert results.count(400) == 5
+        product = json.loads(
+            app.test_client().get(f'/api/products/{products[0]}').data
+        )
+        assert product['stock'] == 0
+
+    def test_bulk_adjust_stock_api(self, client, products):
+        """Prueba ajustar varios productos en una transacción"""
+        response = client.post('/api/products/stock',
+                               data=json.dumps({'items': [
+                                   {'id': products[0], 'delta': -2},
+                                   {'id': products[1], 'delta': 5},
+                                   {'id': products[0], 'delta': -2}
+                               ]}),
+                               content_type='application/json')
+        assert response.status_code == 200
+        assert json.loads(response.data)['updated'] == [
+            {'id': products[0], 'stock': 8},
+            {'id': products[1], 'stock': 5},
+            {'id': products[0], 'stock': 6}
+        ]
+
+    def test_bulk_adjust_stock_all_or_nothing(self, client, products):
+        """Prueba que un ajuste fallido revierta todo el lote"""
+        response = client.post('/api/products/stock',
+                               data=json.dumps([
+                                   {'id': products[0], 'delta': -2},
+                                   {'id': products[1], 'delta': -1}
+                               ]),
+                               content_type='application/json')
+        assert response.status_code == 400
+        assert json.loads(response.data)['errors'] == [
+            {'index': 1, 'error': "Stock insuficiente"}
+        ]
+
+        product = json.loads(client.get(f'/api/products/{products[0]}').data)
+        assert product['stock'] == 10
@@ -0,0 +1,81 @@
+import pytest
+import json
+from sqlalchemy import event
+from backend.app import create_app
+from backend.models.category import db
+
+
+@pytest.fixture
+def app():
+    """Crea una aplicación de prueba"""
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Cliente de prueba"""
+    return app.test_client()
+
+
+def seed(client, prefix, categories, products_per_category):
+    """Crea categorías con productos vía API y retorna sus IDs"""
+    category_ids = []
+    for i in range(categories):
+        response = client.post('/api/categories',
+                               data=json.dumps({'name': f'{prefix} {i}'}),
+                               content_type='application/json')
+        category_id = json.loads(response.data)['id']
+        category_ids.append(category_id)
+        for j in range(products_per_category):
+            client.post('/api/products',
+                        data=json.dumps({
+                            'name': f'{prefix} producto {i}-{j}',
+                            'price': 10,
+                            'stock': 1,
+                            'category_id': category_id
+                        }),
+                        content_type='application/json')
+    return category_ids
+
+
+def count_queries(app, client, url):
+    """Cuenta las sentencias SQL ejecutadas durante una petición GET"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+    assert response.status_code == 200
+    return len(statements)
+
+
+class TestQueryCount:
+    """Verifica que los listados no dependan del número de filas"""
+
+    @pytest.mark.parametrize('url', [
+        '/api/products',
+        '/api/products/1',
+        '/api/categories',
+        '/api/categories/1',
+        '/api/stats',
+    ])
+    def test_query_count_is_constant(self, app, client, url):
+        """Prueba que el número de consultas no crece con los datos"""
+        seed(client, 'Pequeña', categories=1, products_per_category=1)
+        small = count_queries(app, client, url)
+
+        seed(client, 'Grande', categories=5, products_per_category=5)
+        large = count_queries(app, client, url)
+
+        assert large == small
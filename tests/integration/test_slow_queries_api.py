@@ -0,0 +1,151 @@
+import pytest
+import json
+import os
+from backend.app import create_app
+from backend.config import DevelopmentConfig, ProductionConfig
+from backend.models.category import db
+
+
+@pytest.fixture
+def app(tmp_path):
+    """Crea una aplicación que registra todas las consultas"""
+    app = create_app('testing', {
+        'SLOW_QUERY_THRESHOLD_MS': 0,
+        'SLOW_QUERY_LOG': str(tmp_path / 'slow_queries.log')
+    })
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Cliente de prueba"""
+    return app.test_client()
+
+
+def slow_queries(client, query=''):
+    """Entradas del registro de consultas lentas"""
+    response = client.get(f'/admin/slow-queries{query}')
+    assert response.status_code == 200
+    return json.loads(response.data)['items']
+
+
+class TestSlowQueriesAPI:
+    """Pruebas de integración para el registro de consultas lentas"""
+
+    def test_records_endpoint_and_plan(self, client):
+        """Prueba registrar sentencia, parámetros, endpoint y plan"""
+        client.post('/api/categories',
+                    data=json.dumps({'name': 'Electrónica'}),
+                    content_type='application/json')
+        client.get('/api/products?category_id=1')
+        entry = next(entry for entry in slow_queries(client)
+                     if entry['endpoint'] == 'GET /api/products'
+                     and 'FROM products' in entry['statement'])
+        assert entry['duration_ms'] >= 0
+        assert '1' in entry['parameters']
+        assert any('ix_products_category_' in step
+                   for step in entry['plan'])
+        assert entry['full_scans'] == []
+
+    def test_flags_full_table_scans(self, client):
+        """Prueba marcar las tablas recorridas sin índice"""
+        client.get('/api/products?name=lap')
+        scans = slow_queries(client, '?full_scan=true')
+        assert any('products' in entry['full_scans'] for entry in scans)
+
+        client.get('/api/products/1')
+        lookup = next(entry for entry in slow_queries(client)
+                      if entry['endpoint'] ==
+                      'GET /api/products/<int:product_id>'
+                      and 'FROM products' in entry['statement'])
+        assert lookup['full_scans'] == []
+
+    def test_writes_rotating_log(self, app, client):
+        """Prueba escribir cada entrada como una línea JSON"""
+        client.get('/api/categories')
+        path = app.extensions['slow_queries'].worker_path()
+        assert path.endswith(f'slow_queries.{os.getpid()}.log')
+        with open(path, encoding='utf-8') as log:
+            lines = [json.loads(line) for line in log]
+        assert any(line['endpoint'] == 'GET /api/categories'
+                   for line in lines)
+
+    def test_reads_every_worker_log(self, app, client):
+        """Prueba listar las entradas de todos los procesos por fecha"""
+        client.get('/api/categories')
+        slow_log = app.extensions['slow_queries']
+        other = {'timestamp': '2999-01-01T00:00:00+00:00',
+                 'endpoint': 'GET /otro-worker', 'full_scans': []}
+        with open(slow_log.worker_path(pid=99999), 'w',
+                  encoding='utf-8') as log:
+            log.write(json.dumps(other) + '\n{"incompleta')
+
+        items = slow_queries(client)
+        assert items[0] == other
+        assert any(item['endpoint'] == 'GET /api/categories'
+                   for item in items)
+
+        app.config['SLOW_QUERY_RECENT'] = slow_log.recent_size = 1
+        assert slow_queries(client) == [other]
+
+    def test_prunes_exited_worker_logs(self, app):
+        """Prueba borrar los logs de procesos terminados salvo los recientes"""
+        slow_log = app.extensions['slow_queries']
+        slow_log.keep_exited = 2
+        # pids por encima de pid_max: nunca corresponden a un proceso vivo
+        exited = [5000000 + i for i in range(4)]
+        for pid in exited + [os.getppid()]:
+            for path in (slow_log.worker_path(pid),
+                         slow_log.worker_path(pid) + '.1'):
+                with open(path, 'w', encoding='utf-8') as log:
+                    log.write('{}\n')
+        # El último es el que terminó más recientemente
+        for index, pid in enumerate(exited):
+            os.utime(slow_log.worker_path(pid), (index, index))
+            os.utime(slow_log.worker_path(pid) + '.1', (index, index))
+
+        slow_log.prune()
+
+        remaining = {os.path.basename(path)
+                     for path in os.listdir(os.path.dirname(slow_log.path))}
+        assert remaining == {
+            f'slow_queries.{exited[3]}.log',
+            f'slow_queries.{exited[2]}.log',
+            f'slow_queries.{os.getppid()}.log',
+            f'slow_queries.{os.getppid()}.log.1',
+            f'slow_queries.{os.getpid()}.log',
+        }
+        assert set(slow_log.worker_paths()) == {
+            slow_log.worker_path(pid)
+            for pid in (exited[3], exited[2], os.getppid(), os.getpid())
+        }
+
+    def test_admin_token(self, app, client):
+        """Prueba exigir el token de administración si está configurado"""
+        app.config['ADMIN_TOKEN'] = 'secreto'
+        assert client.get('/admin/slow-queries').status_code == 401
+        response = client.get('/admin/slow-queries',
+                              headers={'X-Admin-Token': 'otro'})
+        assert response.status_code == 401
+        response = client.get('/admin/slow-queries',
+                              headers={'X-Admin-Token': 'secreto'})
+        assert response.status_code == 200
+
+    def test_admin_requires_configured_token(self, app, client):
+        """Prueba cerrar /admin si no hay token fuera de desarrollo"""
+        app.config['ADMIN_REQUIRE_TOKEN'] = True
+        response = client.get('/admin/slow-queries')
+        assert response.status_code == 403
+        assert 'ADMIN_TOKEN' in json.loads(response.data)['error']
+        response = client.get('/admin/slow-queries',
+                              headers={'X-Admin-Token': ''})
+        assert response.status_code == 403
+
+    def test_admin_token_defaults(self):
+        """Prueba que producción exija token y desarrollo no"""
+        assert ProductionConfig.ADMIN_REQUIRE_TOKEN is True
+        assert DevelopmentConfig.ADMIN_REQUIRE_TOKEN is False
@@ -0,0 +1,79 @@
+import pytest
+import json
+from backend.app import create_app
+from backend.models.category import db
+
+
+@pytest.fixture
+def app():
+    """Crea una aplicación de prueba"""
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Cliente de prueba"""
+    return app.test_client()
+
+
+@pytest.fixture
+def category(client):
+    """Crea una categoría de prueba"""
+    response = client.post(
+        '/api/categories',
+        data=json.dumps({'name': 'Electrónica'}),
+        content_type='application/json'
+    )
+    return json.loads(response.data)
+
+
+class TestStatsAPI:
+    """Pruebas de integración para la API de estadísticas"""
+
+    def test_get_stats_api(self, client, category):
+        """Prueba obtener estadísticas vía API"""
+        for name, stock in [('Cable', 1), ('Mouse', 10), ('Monitor', 30)]:
+            client.post('/api/products',
+                        data=json.dumps({
+                            'name': name,
+                            'price': 10,
+                            'stock': stock,
+                            'category_id': category['id']
+                        }),
+                        content_type='application/json')
+
+        response = client.get('/api/stats')
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['total_categories'] == 1
+        assert data['total_products'] == 3
+        assert data['stock'] == {'low': 1, 'medium': 1, 'normal': 1}
+        assert data['thresholds'] == {'low': 5, 'medium': 20}
+        assert data['recent_products'][0]['name'] == 'Monitor'
+
+    def test_get_stats_custom_thresholds(self, client, category):
+        """Prueba umbrales enviados como parámetros"""
+        client.post('/api/products',
+                    data=json.dumps({
+                        'name': 'Mouse',
+                        'price': 10,
+                        'stock': 10,
+                        'category_id': category['id']
+                    }),
+                    content_type='application/json')
+
+        response = client.get('/api/stats?low=15&medium=30&recent=0')
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['stock']['low'] == 1
+        assert data['recent_products'] == []
+
+    def test_get_stats_invalid_thresholds(self, client):
+        """Prueba umbrales inválidos vía API"""
+        response = client.get('/api/stats?low=abc')
+        assert response.status_code == 400
@@ -0,0 +1,76 @@
+import pytest
+from backend.app import create_app
+from backend.models.category import Category, db
+from backend.models.product import Product
+from tests.benchmarks.concurrency import summarize
+from tests.benchmarks.runner import compare, write_cases
+from tests.benchmarks.seed import parse_size, seed_catalog
+
+
+@pytest.fixture
+def app():
+    """Crea una aplicación de prueba"""
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def snapshot():
+    """Contenido del catálogo que las escrituras no deben alterar"""
+    db.session.expire_all()
+    return (
+        [(p.id, p.name, p.price, p.stock, p.category_id)
+         for p in Product.query.order_by(Product.id)],
+        [(c.id, c.name, c.product_count)
+         for c in Category.query.order_by(Category.id)],
+    )
+
+
+def results(**medians):
+    """Documento de resultados con las medianas dadas"""
+    return {'results': {name: {'median_ms': value}
+                        for name, value in medians.items()}}
+
+
+class TestBenchmarks:
+    """Pruebas unitarias para las utilidades de benchmarks"""
+
+    def test_parse_size(self):
+        """Prueba interpretar los tamaños de catálogo"""
+        assert parse_size('1k') == 1000
+        assert parse_size('100K') == 100000
+        assert parse_size('1m') == 1000000
+        assert parse_size('250') == 250
+        with pytest.raises(ValueError, match="Tamaño de catálogo inválido"):
+            parse_size('mucho')
+
+    def test_compare_detects_regressions(self):
+        """Prueba marcar solo los casos que superan el umbral"""
+        baseline = results(a=10, b=10, c=10)
+        current = results(a=12, b=20, d=50)
+        regressions = compare(current, baseline, threshold=0.25)
+        assert [r['name'] for r in regressions] == ['b']
+        assert regressions[0]['ratio'] == 2.0
+
+    def test_summarize_concurrency(self):
+        """Prueba calcular rendimiento y percentiles de una ejecución"""
+        latencies = [i / 1000 for i in range(100, 0, -1)]
+        summary = summarize(latencies, elapsed=2.0)
+        assert summary['requests'] == 100
+        assert summary['throughput_rps'] == 50.0
+        assert summary['p50_ms'] == 51.0
+        assert summary['p99_ms'] == 99.0
+        assert summary['max_ms'] == 100.0
+
+    def test_write_cases_restore_catalog(self, app):
+        """Prueba que cada caso de escritura deje el catálogo como estaba"""
+        with app.app_context():
+            seed_catalog(150)
+            before = snapshot()
+            for name, (call, _) in write_cases().items():
+                call()
+                call()
+                assert snapshot() == before, name
@@ -0,0 +1,94 @@
+import time
+from backend.cache import LRUCache, PrefixIndex, normalize_name
+
+
+class TestLRUCache:
+    """Pruebas unitarias para LRUCache"""
+
+    def test_get_and_set(self):
+        """Prueba guardar y leer valores"""
+        cache = LRUCache(max_size=10)
+        cache.set(1, "Electrónica")
+        assert cache.get(1) == "Electrónica"
+        assert cache.get(2) is None
+
+    def test_evicts_least_recently_used(self):
+        """Prueba que se descarte la entrada menos usada"""
+        cache = LRUCache(max_size=2)
+        cache.set(1, "a")
+        cache.set(2, "b")
+        cache.get(1)
+        cache.set(3, "c")
+        assert cache.get(2) is None
+        assert cache.get(1) == "a"
+        assert len(cache) == 2
+
+    def test_entries_expire(self):
+        """Prueba la expiración por tiempo"""
+        cache = LRUCache(max_size=10, ttl=0.01)
+        cache.set(1, "a")
+        time.sleep(0.02)
+        assert cache.get(1) is None
+
+    def test_delete(self):
+        """Prueba invalidar una entrada"""
+        cache = LRUCache(max_size=10)
+        cache.set(1, "a")
+        cache.delete(1)
+        assert cache.get(1) is None
+
+
+class TestPrefixIndex:
+    """Pruebas unitarias para PrefixIndex"""
+
+    def test_normalize_name(self):
+        """Prueba normalizar mayúsculas, tildes y espacios"""
+        assert normalize_name("  Cámara   WEB ") == "camara web"
+
+    def test_search_by_prefix(self):
+        """Prueba sugerir nombres distintos en orden alfabético"""
+        index = PrefixIndex(max_entries=100)
+        index.load([(1, "Monitor"), (2, "Mouse"), (3, "mouse"),
+                    (4, "Teclado"), (5, "Móvil")])
+        assert index.search("MO", 10) == [
+            {'id': 1, 'name': "Monitor"},
+            {'id': 2, 'name': "Mouse"},
+            {'id': 5, 'name': "Móvil"}
+        ]
+        assert index.search("mo", 1) == [{'id': 1, 'name': "Monitor"}]
+        assert index.search("x", 10) == []
+
+    def test_incremental_updates(self):
+        """Prueba agregar, renombrar y quitar elementos"""
+        index = PrefixIndex(max_entries=100)
+        index.load([(1, "Laptop")])
+        index.add(2, "Lámpara")
+        index.add(1, "Tablet")
+        assert [s['name'] for s in index.search("la", 10)] == ["Lámpara"]
+
+        index.add_many([(3, "Lapicero"), (4, "Lazo")])
+        index.remove_many([2, 4])
+        assert [s['name'] for s in index.search("la", 10)] == ["Lapicero"]
+        assert len(index) == 2
+
+    def test_ignores_writes_before_load(self):
+        """Prueba que las escrituras esperen a la carga diferida"""
+        index = PrefixIndex(max_entries=100)
+        index.add(1, "Laptop")
+        assert index.stale
+        assert len(index) == 0
+
+    def test_bounded_size(self):
+        """Prueba que no se supere el máximo de entradas"""
+        index = PrefixIndex(max_entries=2)
+        index.load([(1, "a"), (2, "b"), (3, "c")])
+        index.add(4, "d")
+        assert len(index) == 2
+
+    def test_reload_after_ttl(self):
+        """Prueba que el índice quede vencido tras el ttl"""
+        index = PrefixIndex(max_entries=10, ttl=0.01)
+        index.load([])
+        assert not index.stale
+        time.sleep(0.02)
+        assert index.stale
@@ -2,6 +2,7 @@ import pytest
 from backend.app import create_app
 from backend.models.category import db, Category
 from backend.services.category_service import CategoryService
+from backend.services.product_service import ProductService
 
 
 @pytest.fixture
@@ -44,6 +45,48 @@ class TestCategoryService:
             with pytest.raises(ValueError, match="Ya existe una categoría"):
                 CategoryService.create_category("Electrónica")
 
+    def test_create_category_duplicate_ignores_case(self, app):
+        """Prueba que la unicidad del nombre no distinga mayúsculas"""
+        with app.app_context():
+            CategoryService.create_category("Ropa")
+            with pytest.raises(ValueError, match="Ya existe una categoría"):
+                CategoryService.create_category(" ROPA ")
+
+    def test_create_category_duplicate_ignores_accented_case(self, app):
+        """Prueba la unicidad con mayúsculas fuera de ASCII (NOCASE no las
+        pliega)"""
+        with app.app_context():
+            category = CategoryService.create_category("Electrónica")
+            with pytest.raises(ValueError, match="Ya existe una categoría"):
+                CategoryService.create_category("ELECTRÓNICA")
+
+            other = CategoryService.create_category("Ropa")
+            with pytest.raises(ValueError, match="Ya existe otra categoría"):
+                CategoryService.update_category(other.id, "electrónica")
+
+            # Cambiar solo la capitalización de la propia categoría
+            renamed = CategoryService.update_category(category.id,
+                                                      "ELECTRÓNICA")
+            assert renamed.name_key == 'electronica'
+
+    def test_create_category_race_returns_value_error(self, app,
+                                                      monkeypatch):
+        """Prueba que el índice único rechace el nombre si dos peticiones
+        pasan la comprobación a la vez"""
+        with app.app_context():
+            CategoryService.create_category("Electrónica")
+            other = CategoryService.create_category("Ropa")
+            # Simula que la otra petición confirmó tras la comprobación
+            monkeypatch.setattr(
+                CategoryService, '_find_by_name',
+                staticmethod(lambda name: Category.query.filter(False))
+            )
+            with pytest.raises(ValueError, match="Ya existe una categoría"):
+                CategoryService.create_category("ELECTRÓNICA")
+            with pytest.raises(ValueError, match="Ya existe otra categoría"):
+                CategoryService.update_category(other.id, "electrónica")
+            assert Category.query.count() == 2
+
     def test_get_all_categories(self, app):
         """Prueba obtener todas las categorías"""
         with app.app_context():
@@ -52,6 +95,18 @@ class TestCategoryService:
             categories = CategoryService.get_all_categories()
             assert len(categories) == 2
 
+    def test_get_categories_page_respects_max(self, app):
+        """Prueba que el tamaño de página no supera el tope configurado"""
+        with app.app_context():
+            app.config['PAGE_SIZE_MAX'] = 2
+            for name in ["Electrónica", "Ropa", "Hogar"]:
+                CategoryService.create_category(name)
+            categories, next_cursor = CategoryService.get_categories_page(
+                limit=100
+            )
+            assert len(categories) == 2
+            assert next_cursor is not None
+
     def test_get_category_by_id_success(self, app):
         """Prueba obtener categoría por ID exitosamente"""
         with app.app_context():
@@ -87,4 +142,41 @@ class TestCategoryService:
             result = CategoryService.delete_category(category.id)
             assert result is True
             with pytest.raises(ValueError):
-                CategoryService.get_category_by_id(category.id)
\ No newline at end of file
+                CategoryService.get_category_by_id(category.id)
+
+    def test_delete_category_with_products(self, app):
+        """Prueba que no se elimine una categoría con productos"""
+        with app.app_context():
+            category = CategoryService.create_category("Electrónica")
+            ProductService.create_product("Laptop", 1500, 10, category.id)
+            with pytest.raises(ValueError, match="productos asociados"):
+                CategoryService.delete_category(category.id)
+
+    def test_product_count_maintained(self, app):
+        """Prueba que product_count siga las altas, bajas y reasignaciones"""
+        with app.app_context():
+            cat1 = CategoryService.create_category("Electrónica")
+            cat2 = CategoryService.create_category("Ropa")
+            laptop = ProductService.create_product("Laptop", 1500, 10, cat1.id)
+            ProductService.create_product("Mouse", 25, 50, cat1.id)
+            assert (cat1.product_count, cat2.product_count) == (2, 0)
+
+            ProductService.update_product(laptop.id, category_id=cat2.id)
+            assert (cat1.product_count, cat2.product_count) == (1, 1)
+
+            ProductService.delete_product(laptop.id)
+            assert (cat1.product_count, cat2.product_count) == (1, 0)
+
+    def test_rebuild_product_counts(self, app):
+        """Prueba la reconciliación de product_count"""
+        with app.app_context():
+            category = CategoryService.create_category("Electrónica")
+            ProductService.create_product("Laptop", 1500, 10, category.id)
+            db.session.execute(
+                db.update(Category).values(product_count=7)
+            )
+            db.session.commit()
+
+            assert CategoryService.rebuild_product_counts() == 1
+            assert category.product_count == 1
+            assert CategoryService.rebuild_product_counts() == 0
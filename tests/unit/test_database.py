@@ -0,0 +1,61 @@
+import pytest
+from backend.app import create_app
+from backend.database import pool_options, validate_pragmas
+from backend.models.category import db
+
+
+@pytest.fixture
+def app():
+    """Crea una aplicación de prueba"""
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def pragma(name):
+    """Lee el valor actual de un pragma en la conexión de la sesión"""
+    return db.session.execute(db.text(f"PRAGMA {name}")).scalar()
+
+
+class TestDatabase:
+    """Pruebas unitarias para la configuración del motor SQLite"""
+
+    def test_pragmas_applied(self, app):
+        """Prueba que cada conexión nueva reciba los pragmas configurados"""
+        with app.app_context():
+            assert pragma('journal_mode') == 'wal'
+            assert pragma('synchronous') == 1
+            assert pragma('busy_timeout') == 5000
+            assert pragma('temp_store') == 2
+            assert pragma('cache_size') == -64000
+            assert pragma('foreign_keys') == 1
+
+    def test_empty_values_skipped(self):
+        """Prueba omitir los pragmas sin valor"""
+        assert validate_pragmas({'synchronous': '', 'cache_size': -2000}) \
+            == {'cache_size': -2000}
+
+    def test_invalid_pragmas(self):
+        """Prueba rechazar pragmas o valores no permitidos"""
+        with pytest.raises(ValueError, match="no soportado"):
+            validate_pragmas({'writable_schema': 'ON'})
+        with pytest.raises(ValueError, match="Valor inválido"):
+            validate_pragmas({'synchronous': 'OFF; DROP TABLE products'})
+
+    def test_in_memory_database(self):
+        """Prueba que SQLite en memoria no reciba las opciones del pool"""
+        app = create_app('testing', {'SQLALCHEMY_DATABASE_URI': 'sqlite://'})
+        with app.app_context():
+            db.create_all()
+            assert pragma('foreign_keys') == 1
+
+    def test_pool_options(self, app):
+        """Prueba aplicar el pool solo a las bases en archivo"""
+        assert pool_options('sqlite:///:memory:', app.config) == {}
+        assert pool_options('sqlite:///inventory.db', app.config)[
+            'pool_size'] == 10
+        with app.app_context():
+            assert db.engine.pool.size() == 10
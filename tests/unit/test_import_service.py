@@ -0,0 +1,106 @@
+import pytest
+import io
+from backend.app import create_app
+from backend.models.category import db, Category
+from backend.models.product import Product
+from backend.services.category_service import CategoryService
+from backend.services.import_service import ImportService
+
+
+@pytest.fixture
+def app():
+    """Crea una aplicación de prueba"""
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def csv_stream(rows):
+    """Arma un archivo CSV en memoria"""
+    lines = ['name,price,stock,category,description']
+    lines.extend(rows)
+    return io.BytesIO('\n'.join(lines).encode('utf-8'))
+
+
+class TestImportService:
+    """Pruebas unitarias para ImportService"""
+
+    def test_import_csv_creates_categories(self, app):
+        """Prueba importar CSV creando categorías por nombre"""
+        with app.app_context():
+            CategoryService.create_category("Electrónica")
+            stream = csv_stream([
+                'Laptop,1500,10,Electrónica,Gama alta',
+                'Camisa,20,5,Ropa,',
+                'Mouse,25,50,ELECTRÓNICA,',
+                'Pantalón,30,2,ropa,',
+            ])
+            result = ImportService.import_products(
+                ImportService.iter_records(stream, 'csv'), chunk_size=2
+            )
+            assert result['imported'] == 4
+            assert result['error_count'] == 0
+            assert result['checkpoint'] == 4
+            # Los nombres se resuelven sin distinguir mayúsculas ni tildes
+            assert Category.query.count() == 2
+            counts = {c.name: c.product_count for c in Category.query.all()}
+            assert counts == {'Electrónica': 2, 'Ropa': 2}
+
+    def test_import_reports_row_errors(self, app):
+        """Prueba que las filas inválidas se reportan sin detener la carga"""
+        with app.app_context():
+            stream = io.BytesIO(
+                b'{"name": "Laptop", "price": 10, "stock": 1, '
+                b'"category": "A"}\n'
+                b'no es json\n'
+                b'{"name": "", "price": 10, "stock": 1, "category": "A"}\n'
+                b'{"name": "Mouse", "price": 5, "stock": 1, '
+                b'"category_id": 999}\n'
+            )
+            result = ImportService.import_products(
+                ImportService.iter_records(stream, 'ndjson'), chunk_size=10
+            )
+            assert result['imported'] == 1
+            assert result['error_count'] == 3
+            assert [e['row'] for e in result['errors']] == [2, 3, 4]
+
+    def test_import_resume_from_checkpoint(self, app):
+        """Prueba reanudar una importación desde el punto de control"""
+        with app.app_context():
+            rows = [f'Producto {i},10,1,General,' for i in range(5)]
+            checkpoints = []
+            ImportService.import_products(
+                ImportService.iter_records(csv_stream(rows), 'csv'),
+                chunk_size=2, on_checkpoint=checkpoints.append
+            )
+            assert checkpoints == [2, 4, 5]
+
+            db.session.execute(db.delete(Product).where(Product.id > 2))
+            db.session.commit()
+
+            result = ImportService.import_products(
+                ImportService.iter_records(csv_stream(rows), 'csv'),
+                chunk_size=2, resume_from=2
+            )
+            assert result['processed'] == 3
+            assert Product.query.count() == 5
+
+    def test_import_without_category_creation(self, app):
+        """Prueba rechazar categorías inexistentes si no se permite crear"""
+        with app.app_context():
+            result = ImportService.import_products(
+                ImportService.iter_records(
+                    csv_stream(['Laptop,10,1,Nueva,']), 'csv'),
+                chunk_size=10, create_categories=False
+            )
+            assert result['imported'] == 0
+            assert result['errors'][0]['error'] == "Categoría no encontrada"
+
+    def test_import_invalid_format(self, app):
+        """Prueba un formato de importación no soportado"""
+        with app.app_context():
+            with pytest.raises(ValueError, match="Formato"):
+                ImportService.iter_records(io.BytesIO(b''), 'xml')
@@ -0,0 +1,68 @@
+import json
+import os
+
+from backend.metrics import Histogram, MetricsRegistry, SharedMetrics
+
+
+class TestMetrics:
+    """Pruebas unitarias para el registro de métricas"""
+
+    def test_histogram_cumulative(self):
+        """Prueba que los buckets sean acumulativos"""
+        histogram = Histogram((0.1, 1))
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5)
+        assert histogram.counts == [1, 2]
+        assert histogram.count == 3
+        assert histogram.sum == 5.55
+
+    def test_render_escapes_labels(self):
+        """Prueba escapar comillas y barras en las etiquetas"""
+        registry = MetricsRegistry()
+        registry.observe_request('GET', '/a"b\\c', 200, 0.01, 2, 0.001)
+        text = registry.render()
+        assert ('http_requests_total{method="GET",endpoint="/a\\"b\\\\c",'
+                'status="200"} 1') in text
+        assert 'db_queries_per_request_bucket{method="GET",' \
+               'endpoint="/a\\"b\\\\c",le="+Inf"} 1' in text
+
+    def test_snapshot_merge(self):
+        """Prueba sumar el snapshot de otro registro"""
+        registry = MetricsRegistry()
+        registry.observe_request('GET', '/a', 200, 0.01, 2, 0.001)
+        total = MetricsRegistry()
+        total.merge(json.loads(json.dumps(registry.snapshot())))
+        total.merge(registry.snapshot())
+        labels = (('method', 'GET'), ('endpoint', '/a'))
+        assert total.requests[labels + (('status', '200'),)] == 2
+        assert total.queries[labels] == 4
+        assert total.latency[labels].count == 2
+        assert total.latency[labels].counts[0] == 0
+        assert total.latency[labels].counts[1] == 2
+
+    def test_shared_metrics_sum_workers(self, tmp_path):
+        """Prueba sumar los procesos vivos y acumular los terminados"""
+        other = MetricsRegistry()
+        other.observe_request('GET', '/a', 200, 0.01, 1, 0.001)
+        # Un worker vivo (el proceso padre) y uno terminado
+        (tmp_path / f'metrics.{os.getppid()}.json').write_text(
+            json.dumps(other.snapshot()))
+        (tmp_path / 'metrics.5000000.json').write_text(
+            json.dumps(other.snapshot()))
+
+        shared = SharedMetrics(str(tmp_path), interval=60)
+        registry = MetricsRegistry(shared)
+        registry.observe_request('GET', '/a', 200, 0.01, 1, 0.001)
+
+        # El terminado se acumuló en metrics.exited.json
+        assert not (tmp_path / 'metrics.5000000.json').exists()
+        assert (tmp_path / SharedMetrics.EXITED).exists()
+        text = shared.collect(registry).render()
+        assert ('http_requests_total{method="GET",endpoint="/a",'
+                'status="200"} 3') in text
+
+        shared.flush(registry)
+        saved = json.loads(
+            (tmp_path / f'metrics.{os.getpid()}.json').read_text())
+        assert saved == json.loads(json.dumps(registry.snapshot()))
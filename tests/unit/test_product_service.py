@@ -1,4 +1,5 @@
 import pytest
+from sqlalchemy import event
 from backend.app import create_app
 from backend.models.category import db
 from backend.services.category_service import CategoryService
@@ -80,6 +81,126 @@ class TestProductService:
             products = ProductService.get_all_products()
             assert len(products) == 2
 
+    def test_get_products_page(self, app):
+        """Prueba obtener productos por páginas"""
+        with app.app_context():
+            category = CategoryService.create_category("Electrónica")
+            for name in ["Laptop", "Mouse", "Teclado"]:
+                ProductService.create_product(name, 10, 1, category.id)
+
+            first, cursor = ProductService.get_products_page(limit=2)
+            assert [p.name for p in first] == ["Laptop", "Mouse"]
+
+            second, cursor = ProductService.get_products_page(limit=2,
+                                                              after=cursor)
+            assert [p.name for p in second] == ["Teclado"]
+            assert cursor is None
+
+    def test_get_products_page_filtered_and_sorted(self, app):
+        """Prueba filtrar por precio y stock y ordenar de forma estable"""
+        with app.app_context():
+            category = CategoryService.create_category("Electrónica")
+            for name, price, stock in [("Mouse", 20, 2), ("Laptop", 900, 1),
+                                       ("Cable", 20, 9), ("Monitor", 300, 0),
+                                       ("Teclado", 50, 30)]:
+                ProductService.create_product(name, price, stock, category.id)
+
+            names, cursor = [], None
+            while True:
+                page, cursor = ProductService.get_products_page(
+                    limit=2, after=cursor, max_price=300, max_stock=9,
+                    sort='-price'
+                )
+                names.extend(p.name for p in page)
+                if not cursor:
+                    break
+            # Mismo precio: desempate por ID en el mismo sentido
+            assert names == ["Monitor", "Cable", "Mouse"]
+
+            page, _ = ProductService.get_products_page(name="o", sort='name')
+            assert [p.name for p in page] == ["Laptop", "Monitor", "Mouse",
+                                              "Teclado"]
+
+    def test_get_products_page_invalid_sort(self, app):
+        """Prueba ordenar por una columna no permitida"""
+        with app.app_context():
+            with pytest.raises(ValueError, match="Solo se puede ordenar"):
+                ProductService.get_products_page(sort='description')
+
+    def test_get_products_page_cursor_from_other_sort(self, app):
+        """Prueba reutilizar un cursor con otro orden"""
+        with app.app_context():
+            category = CategoryService.create_category("Electrónica")
+            for name in ["Laptop", "Mouse"]:
+                ProductService.create_product(name, 10, 1, category.id)
+
+            _, cursor = ProductService.get_products_page(limit=1,
+                                                         sort='price')
+            with pytest.raises(ValueError,
+                               match="Cursor de paginación inválido"):
+                ProductService.get_products_page(after=cursor, sort='name')
+
+    def test_search_products(self, app):
+        """Prueba buscar por prefijo, sin tildes y ordenado por relevancia"""
+        with app.app_context():
+            category = CategoryService.create_category("Electrónica")
+            ProductService.create_product("Cable HDMI", 10, 1, category.id,
+                                          description="Para monitor")
+            ProductService.create_product("Monitor Curvo", 10, 1, category.id,
+                                          description="Monitor de 27")
+            ProductService.create_product("Cámara Web", 10, 1, category.id)
+
+            products, _ = ProductService.search_products("monit")
+            assert [p.name for p in products] == ["Monitor Curvo",
+                                                  "Cable HDMI"]
+
+            products, _ = ProductService.search_products("camara")
+            assert [p.name for p in products] == ["Cámara Web"]
+
+            products, _ = ProductService.search_products('"cable" OR web')
+            assert products == []
+
+    def test_search_products_page(self, app):
+        """Prueba paginar los resultados de búsqueda"""
+        with app.app_context():
+            category = CategoryService.create_category("Electrónica")
+            for i in range(5):
+                ProductService.create_product(f"Laptop {i}", 10, 1,
+                                              category.id)
+
+            names = []
+            products, cursor = ProductService.search_products("laptop",
+                                                              limit=2)
+            names.extend(p.name for p in products)
+            while cursor:
+                products, cursor = ProductService.search_products(
+                    "laptop", limit=2, after=cursor
+                )
+                names.extend(p.name for p in products)
+
+            assert names == [f"Laptop {i}" for i in range(5)]
+
+    def test_search_index_follows_writes(self, app):
+        """Prueba que el índice refleje actualizaciones y eliminaciones"""
+        with app.app_context():
+            category = CategoryService.create_category("Electrónica")
+            product = ProductService.create_product("Laptop", 10, 1,
+                                                    category.id)
+
+            ProductService.update_product(product.id, name="Tablet")
+            assert ProductService.search_products("laptop")[0] == []
+            assert len(ProductService.search_products("tablet")[0]) == 1
+
+            ProductService.delete_product(product.id)
+            assert ProductService.search_products("tablet")[0] == []
+
+    def test_search_products_empty_query(self, app):
+        """Prueba buscar sin texto"""
+        with app.app_context():
+            with pytest.raises(ValueError,
+                               match="El texto de búsqueda es requerido"):
+                ProductService.search_products("  *  ")
+
     def test_get_product_by_id_success(self, app):
         """Prueba obtener producto por ID exitosamente"""
         with app.app_context():
@@ -118,6 +239,18 @@ class TestProductService:
             assert updated.price == 2000
             assert updated.stock == 5
 
+    def test_adjust_stock(self, app):
+        """Prueba ajustar el stock con un UPDATE condicional"""
+        with app.app_context():
+            category = CategoryService.create_category("Electrónica")
+            product = ProductService.create_product("Laptop", 1500, 10,
+                                                    category.id)
+
+            assert ProductService.adjust_stock(product.id, -4) == 6
+            assert ProductService.adjust_stock(product.id, "2") == 8
+            with pytest.raises(ValueError, match="Stock insuficiente"):
+                ProductService.adjust_stock(product.id, -9)
+
     def test_delete_product_success(self, app):
         """Prueba eliminar producto exitosamente"""
         with app.app_context():
@@ -126,4 +259,63 @@ class TestProductService:
             result = ProductService.delete_product(product.id)
             assert result is True
             with pytest.raises(ValueError):
-                ProductService.get_product_by_id(product.id)
\ No newline at end of file
+                ProductService.get_product_by_id(product.id)
+
+    def test_create_product_uses_category_cache(self, app):
+        """Prueba que validar la categoría no consulte la base de datos"""
+        with app.app_context():
+            category = CategoryService.create_category("Electrónica")
+            statements = []
+
+            def before_cursor_execute(conn, cursor, statement, *args):
+                statements.append(statement)
+
+            event.listen(db.engine, 'before_cursor_execute',
+                         before_cursor_execute)
+            try:
+                product = ProductService.create_product("Laptop", 1500, 10,
+                                                        category.id)
+            finally:
+                event.remove(db.engine, 'before_cursor_execute',
+                             before_cursor_execute)
+
+            assert not any('FROM categories' in s for s in statements)
+            assert product.to_dict()['category_name'] == "Electrónica"
+
+    def test_category_cache_invalidated_on_rename(self, app):
+        """Prueba que renombrar una categoría actualice category_name"""
+        with app.app_context():
+            category = CategoryService.create_category("Electrónica")
+            product = ProductService.create_product("Laptop", 1500, 10,
+                                                    category.id)
+            CategoryService.update_category(category.id, "Tecnología")
+            found = ProductService.get_product_by_id(product.id)
+            assert found.to_dict()['category_name'] == "Tecnología"
+
+    def test_stale_category_cache_in_other_worker(self, app):
+        """Prueba que otro proceso con la caché vencida no cree huérfanos"""
+        with app.app_context():
+            kept = CategoryService.create_category("Hogar")
+            deleted = CategoryService.create_category("Electrónica")
+            product = ProductService.create_product("Lámpara", 30, 1,
+                                                    kept.id)
+            product_id, kept_id, deleted_id = product.id, kept.id, deleted.id
+
+        # Otro worker con su propia caché sobre la misma base
+        other = create_app('testing')
+        with other.app_context():
+            CategoryService.ensure_category_exists(deleted_id)
+            ProductService.get_product_fields(product_id)
+
+        with app.app_context():
+            CategoryService.delete_category(deleted_id)
+            CategoryService.update_category(kept_id, "Casa")
+
+        with other.app_context():
+            with pytest.raises(ValueError, match="Categoría no encontrada"):
+                ProductService.create_product("Laptop", 1500, 1, deleted_id)
+            assert ProductService.get_product_fields(product_id) \
+                .category_name == "Casa"
+            assert ProductService.get_product_by_id(product_id) \
+                .to_dict()['category_name'] == "Casa"
+            db.session.remove()
@@ -0,0 +1,118 @@
+import pytest
+from backend.app import create_app
+from backend.models.category import db
+from backend.models.schema import create_missing_indexes, upgrade_schema
+
+
+@pytest.fixture
+def app():
+    """Crea una aplicación de prueba"""
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def query_plan(sql):
+    """Retorna el plan de ejecución de SQLite como texto"""
+    rows = db.session.execute(db.text(f"EXPLAIN QUERY PLAN {sql}")).all()
+    return ' | '.join(row[-1] for row in rows)
+
+
+class TestSchema:
+    """Pruebas unitarias para los índices del esquema"""
+
+    def test_category_filter_uses_index(self, app):
+        """Prueba que el filtro por categoría no recorra toda la tabla"""
+        with app.app_context():
+            plan = query_plan(
+                "SELECT * FROM products WHERE category_id = 1 AND id > 0 "
+                "ORDER BY id LIMIT 10"
+            )
+            assert 'USING INDEX ix_products_category_' in plan
+
+    def test_category_price_sort_uses_index(self, app):
+        """Prueba que filtrar por categoría y ordenar por precio use índice"""
+        with app.app_context():
+            plan = query_plan(
+                "SELECT * FROM products WHERE category_id = 1 "
+                "AND price <= 100 ORDER BY price DESC, id DESC LIMIT 10"
+            )
+            assert 'ix_products_category_price' in plan
+            assert 'TEMP B-TREE' not in plan
+
+    def test_category_name_lookup_uses_index(self, app):
+        """Prueba que la búsqueda por nombre sea una consulta al índice"""
+        with app.app_context():
+            plan = query_plan(
+                "SELECT id FROM categories WHERE name_key = 'x'"
+            )
+            assert 'ux_categories_name_key' in plan
+
+    def test_create_missing_indexes(self, app):
+        """Prueba crear índices faltantes sobre una base existente"""
+        with app.app_context():
+            db.session.execute(db.text("DROP INDEX ix_products_stock"))
+            db.session.commit()
+
+            assert create_missing_indexes(db.engine) == ['ix_products_stock']
+            assert create_missing_indexes(db.engine) == []
+
+    def test_upgrade_builds_search_index(self, app):
+        """Prueba crear e indexar la búsqueda en una base existente"""
+        with app.app_context():
+            db.session.execute(db.text(
+                "INSERT INTO categories (name, name_key) "
+                "VALUES ('Electrónica', 'electronica')"
+            ))
+            for operation in ('insert', 'update', 'delete'):
+                db.session.execute(db.text(
+                    f"DROP TRIGGER trg_products_fts_{operation}"
+                ))
+            db.session.execute(db.text("DROP TABLE products_fts"))
+            db.session.execute(db.text(
+                "INSERT INTO products (name, price, stock, category_id) "
+                "VALUES ('Laptop', 10, 1, 1)"
+            ))
+            db.session.commit()
+
+            upgrade_schema(db.engine)
+
+            found = db.session.scalar(db.text(
+                "SELECT rowid FROM products_fts "
+                "WHERE products_fts MATCH 'lap*'"
+            ))
+            assert found == 1
+
+    def test_upgrade_adds_category_name_key(self, app):
+        """Prueba agregar y calcular name_key en una base existente y
+        quitar los índices reemplazados"""
+        with app.app_context():
+            db.session.execute(db.text("DROP INDEX ux_categories_name_key"))
+            db.session.execute(db.text(
+                "ALTER TABLE categories DROP COLUMN name_key"
+            ))
+            db.session.execute(db.text(
+                "CREATE UNIQUE INDEX ux_categories_name_nocase "
+                "ON categories (name COLLATE NOCASE)"
+            ))
+            db.session.execute(db.text(
+                "CREATE INDEX ix_products_category_id ON products (category_id)"
+            ))
+            db.session.execute(db.text(
+                "INSERT INTO categories (name) VALUES ('Electrónica')"
+            ))
+            db.session.commit()
+
+            assert 'ux_categories_name_key' in upgrade_schema(db.engine)
+
+            assert db.session.scalar(db.text(
+                "SELECT name_key FROM categories"
+            )) == 'electronica'
+            indexes = set(db.session.scalars(db.text(
+                "SELECT name FROM sqlite_master WHERE type = 'index'"
+            )))
+            assert 'ux_categories_name_nocase' not in indexes
+            assert 'ix_products_category_id' not in indexes
@@ -0,0 +1,59 @@
+import pytest
+from flask.json.provider import DefaultJSONProvider
+from backend import serialization
+from backend.app import create_app
+from backend.models.category import db
+from backend.serialization import OrjsonProvider, rows_to_dicts
+
+
+@pytest.fixture
+def app():
+    """Crea una aplicación de prueba"""
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+class TestSerialization:
+    """Pruebas unitarias para el proveedor JSON y las filas de columnas"""
+
+    def test_orjson_provider(self, app):
+        """Prueba usar orjson cuando está instalado"""
+        pytest.importorskip('orjson')
+        assert isinstance(app.json, OrjsonProvider)
+        assert app.json.loads(app.json.dumps({1: 'á'})) == {'1': 'á'}
+
+    def test_std_fallback(self, monkeypatch):
+        """Prueba volver al codificador estándar sin orjson"""
+        monkeypatch.setattr(serialization, 'orjson', None)
+        app = create_app('testing')
+        assert type(app.json) is DefaultJSONProvider
+
+    def test_invalid_backend(self):
+        """Prueba rechazar un JSON_BACKEND desconocido"""
+        app = create_app('testing')
+        app.config['JSON_BACKEND'] = 'ujson'
+        with pytest.raises(ValueError, match="JSON_BACKEND no soportado"):
+            serialization.init_json(app)
+
+    def test_rows_to_dicts(self, app):
+        """Prueba convertir filas de columnas en diccionarios"""
+        with app.app_context():
+            rows = db.session.execute(
+                db.text("SELECT 1 AS id, 'Laptop' AS name")
+            ).all()
+            assert rows_to_dicts(rows) == [{'id': 1, 'name': 'Laptop'}]
+            assert rows_to_dicts([]) == []
+
+    def test_rows_to_dicts_fields(self, app):
+        """Prueba incluir solo los campos pedidos, en su orden"""
+        with app.app_context():
+            rows = db.session.execute(
+                db.text("SELECT 1 AS id, 'Laptop' AS name, 5 AS stock")
+            ).all()
+            assert rows_to_dicts(rows, ('name', 'stock')) == [
+                {'name': 'Laptop', 'stock': 5}
+            ]
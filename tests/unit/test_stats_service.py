@@ -0,0 +1,63 @@
+import pytest
+from backend.app import create_app
+from backend.models.category import db
+from backend.services.category_service import CategoryService
+from backend.services.product_service import ProductService
+from backend.services.stats_service import StatsService
+
+
+@pytest.fixture
+def app():
+    """Crea una aplicación de prueba"""
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+class TestStatsService:
+    """Pruebas unitarias para StatsService"""
+
+    def test_stats_empty_database(self, app):
+        """Prueba las estadísticas sin datos"""
+        with app.app_context():
+            stats = StatsService.get_dashboard_stats(5, 20, 5)
+            assert stats['total_categories'] == 0
+            assert stats['total_products'] == 0
+            assert stats['stock'] == {'low': 0, 'medium': 0, 'normal': 0}
+            assert stats['recent_products'] == []
+
+    def test_stats_stock_levels(self, app):
+        """Prueba la clasificación de stock por umbrales"""
+        with app.app_context():
+            category = CategoryService.create_category("Electrónica")
+            ProductService.create_product("Cable", 5, 2, category.id)
+            ProductService.create_product("Mouse", 25, 10, category.id)
+            ProductService.create_product("Teclado", 40, 20, category.id)
+            ProductService.create_product("Monitor", 300, 50, category.id)
+
+            stats = StatsService.get_dashboard_stats(5, 20, 5)
+            assert stats['total_categories'] == 1
+            assert stats['total_products'] == 4
+            assert stats['stock'] == {'low': 1, 'medium': 1, 'normal': 2}
+
+    def test_stats_recent_products(self, app):
+        """Prueba que los recientes se limitan y ordenan del más nuevo"""
+        with app.app_context():
+            category = CategoryService.create_category("Electrónica")
+            for i in range(7):
+                ProductService.create_product(f"Producto {i}", 10, 10,
+                                              category.id)
+
+            stats = StatsService.get_dashboard_stats(5, 20, 3)
+            names = [p['name'] for p in stats['recent_products']]
+            assert names == ["Producto 6", "Producto 5", "Producto 4"]
+            assert stats['recent_products'][0]['category_name'] == "Electrónica"
+
+    def test_stats_invalid_thresholds(self, app):
+        """Prueba umbrales inválidos"""
+        with app.app_context():
+            with pytest.raises(ValueError, match="umbral medio"):
+                StatsService.get_dashboard_stats(20, 5, 5)
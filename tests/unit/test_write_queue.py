@@ -0,0 +1,104 @@
+import threading
+
+import pytest
+from backend.app import create_app
+from backend.models.category import db
+from backend.models.product import Product
+from backend.services.category_service import CategoryService
+from backend.services.product_service import ProductService
+
+
+@pytest.fixture
+def app():
+    """Crea una aplicación de prueba con la cola de escrituras activa"""
+    app = create_app('testing', {
+        'WRITE_QUEUE_ENABLED': True,
+        'WRITE_QUEUE_MAX_BATCH': 8,
+        'WRITE_QUEUE_MAX_DELAY_MS': 200,
+    })
+    with app.app_context():
+        db.create_all()
+        yield app
+        app.extensions['write_queue'].close()
+        db.session.remove()
+        db.drop_all()
+
+
+def run_concurrently(app, calls):
+    """Ejecuta cada llamada en su propio hilo y retorna resultado o error"""
+    results = [None] * len(calls)
+
+    def worker(index, call):
+        with app.app_context():
+            try:
+                results[index] = call()
+            except ValueError as e:
+                results[index] = e
+
+    threads = [threading.Thread(target=worker, args=(index, call))
+               for index, call in enumerate(calls)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class TestWriteQueue:
+    """Pruebas unitarias para la cola de escrituras con commit agrupado"""
+
+    def test_concurrent_writes_share_transactions(self, app):
+        """Prueba agrupar escrituras concurrentes en pocos COMMIT"""
+        with app.app_context():
+            category = CategoryService.create_category("Electrónica")
+            queue = app.extensions['write_queue']
+            batches = queue.batches
+
+            results = run_concurrently(app, [
+                lambda i=i: ProductService.create_product(
+                    f"Producto {i}", 10, 1, category.id
+                ).id
+                for i in range(16)
+            ])
+
+            assert sorted(results) == list(range(1, 17))
+            assert queue.batches - batches <= 4
+            # Las escrituras se hicieron desde otras sesiones
+            db.session.expire_all()
+            assert Product.query.count() == 16
+            assert category.product_count == 16
+
+    def test_failed_operation_only_reverts_itself(self, app):
+        """Prueba que un error en el lote no afecte a las demás escrituras"""
+        with app.app_context():
+            category = CategoryService.create_category("Electrónica")
+            product = ProductService.create_product("Laptop", 1500, 3,
+                                                    category.id)
+
+            results = run_concurrently(app, [
+                lambda: ProductService.adjust_stock(product.id, -2),
+                lambda: ProductService.adjust_stock(product.id, -2),
+                lambda: ProductService.create_product("Mouse", 25, 1,
+                                                      category.id).name,
+            ])
+
+            errors = [r for r in results if isinstance(r, ValueError)]
+            assert len(errors) == 1
+            assert str(errors[0]) == "Stock insuficiente"
+            assert "Mouse" in results
+            db.session.expire_all()
+            assert ProductService.get_product_by_id(product.id).stock == 1
+
+    def test_results_usable_by_caller(self, app):
+        """Prueba usar en la petición los objetos creados por el escritor"""
+        with app.app_context():
+            category = CategoryService.create_category("Electrónica")
+            product = ProductService.create_product("Laptop", 1500, 3,
+                                                    category.id)
+            assert product.to_dict()['category_name'] == "Electrónica"
+            assert product.category.name == "Electrónica"
+
+            ProductService.delete_product(product.id)
+            assert product.name == "Laptop"
+            with pytest.raises(ValueError, match="Producto no encontrado"):
+                ProductService.get_product_by_id(product.id)
@@ -0,0 +1,36 @@
+import os
+import runpy
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', '..',
+                           'gunicorn.conf.py')
+
+
+class TestGunicornConfig:
+    """Pruebas unitarias para la configuración de gunicorn"""
+
+    def test_defaults(self, monkeypatch):
+        """Prueba los valores por defecto de producción"""
+        for name in ('WEB_WORKERS', 'WEB_THREADS', 'WEB_BIND', 'METRICS_DIR'):
+            monkeypatch.delenv(name, raising=False)
+        settings = runpy.run_path(CONFIG_PATH)
+        assert settings['workers'] == os.cpu_count() + 1
+        assert settings['threads'] == 4
+        assert settings['worker_class'] == 'gthread'
+        assert settings['preload_app'] is True
+        assert settings['bind'] == '0.0.0.0:5000'
+        # Las métricas de los workers se suman en un directorio compartido
+        assert os.environ['METRICS_DIR'] == settings['metrics_dir']
+        assert settings['metrics_dir'].endswith(
+            os.path.join('instance', 'metrics'))
+
+    def test_environment_overrides(self, monkeypatch):
+        """Prueba ajustar procesos, hilos y keep-alive por entorno"""
+        monkeypatch.setenv('WEB_WORKERS', '3')
+        monkeypatch.setenv('WEB_THREADS', '16')
+        monkeypatch.setenv('WEB_KEEPALIVE', '30')
+        monkeypatch.setenv('METRICS_DIR', '/tmp/metricas')
+        settings = runpy.run_path(CONFIG_PATH)
+        assert settings['workers'] == 3
+        assert settings['threads'] == 16
+        assert settings['keepalive'] == 30
+        assert settings['metrics_dir'] == '/tmp/metricas'